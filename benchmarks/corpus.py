@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Synthetic corpus generator
+Writes reproducible text files for benchmarking: the same arguments and seed
+always give byte-identical output, so runs on different machines compare.
+
+    python benchmarks/corpus.py OUT --size 1G [--line-length 20:200]
+                                [--charset ascii|utf8] [--newline lf|crlf] [--seed 1]
+
+Output is assembled from a pool of pre-generated blocks written in a seeded
+order, so tens of GB are produced at disk speed rather than at the speed of
+the random generator.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+BLOCK_SIZE = 4 * 1024 * 1024      # Upper bound on the size of one pooled block
+POOL_BLOCKS = 16
+
+ASCII_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ,.;:-_"
+# Two-, three- and four-byte UTF-8 sequences mixed with ASCII
+UTF8_CHARS = ASCII_CHARS + "äöüßéèñçøåЖЯжяλπΩ€→✓中文字日本語한국어🙂🚀"
+
+NEWLINES = {"lf": b"\n", "crlf": b"\r\n"}
+UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(text):
+    """'512M', '10G', '1000' to a byte count"""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in UNITS else ""
+    try:
+        value = float(text[:len(text) - len(unit)])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a size: {text}")
+    return int(value * UNITS[unit])
+
+
+def parse_line_length(text):
+    """'80' or 'MIN:MAX' characters per line, excluding the newline"""
+    low, sep, high = text.partition(":")
+    try:
+        low = int(low)
+        high = int(high) if sep else low
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or MIN:MAX, got: {text}")
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"not a valid length range: {text}")
+    return low, high
+
+
+def make_block(rnd, block_size, line_length, charset, newline):
+    """About block_size bytes of whole lines"""
+    chars = UTF8_CHARS if charset == "utf8" else ASCII_CHARS
+    lines = []
+    size = 0
+    while size < block_size:
+        line = "".join(rnd.choices(chars, k=rnd.randint(*line_length))).encode("utf-8")
+        lines.append(line)
+        size += len(line) + len(newline)
+    return newline.join(lines) + newline
+
+
+def generate(path, size, line_length=(20, 200), charset="ascii", newline="lf", seed=1):
+    """Write at least size bytes of whole lines to path; returns (bytes, lines)"""
+    rnd = random.Random(seed)
+    newline = NEWLINES[newline]
+    # Small corpora get smaller blocks so they don't overshoot size by much
+    block_size = max(64 * 1024, min(BLOCK_SIZE, size // POOL_BLOCKS))
+    pool = [make_block(rnd, block_size, line_length, charset, newline)
+            for _ in range(POOL_BLOCKS)]
+    counts = [block.count(b"\n") for block in pool]
+
+    written = lines = 0
+    with open(path, "wb") as f:
+        while written < size:
+            k = rnd.randrange(POOL_BLOCKS)
+            block = pool[k]
+            f.write(block)
+            written += len(block)
+            lines += counts[k]
+    return written, lines
+
+
+def corpus_name(size, line_length, charset, newline, seed):
+    """File name encoding every parameter, so a cached corpus is reused only if identical"""
+    return f"corpus_{size}_{line_length[0]}-{line_length[1]}_{charset}_{newline}_s{seed}.txt"
+
+
+def ensure_corpus(directory, size, line_length=(20, 200), charset="ascii", newline="lf",
+                  seed=1):
+    """Path of a matching corpus in directory, generating it if it isn't there yet"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / corpus_name(size, line_length, charset, newline, seed)
+    if not path.exists():
+        tmp = path.with_name(path.name + ".tmp")
+        generate(tmp, size, line_length, charset, newline, seed)
+        tmp.replace(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--size", type=parse_size, default=parse_size("256M"),
+                        help="minimum size, e.g. 512M or 10G (default: 256M)")
+    parser.add_argument("--line-length", type=parse_line_length, default=(20, 200),
+                        metavar="MIN:MAX", help="characters per line (default: 20:200)")
+    parser.add_argument("--charset", choices=("ascii", "utf8"), default="ascii")
+    parser.add_argument("--newline", choices=sorted(NEWLINES), default="lf")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    written, lines = generate(args.output, args.size, args.line_length, args.charset,
+                              args.newline, args.seed)
+    print(f"Wrote {written:,} bytes, {lines:,} lines to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
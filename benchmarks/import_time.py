@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark
+Compares importing the splitting core against importing the GUI module,
+each in a fresh interpreter so nothing is cached between runs.
+
+    python benchmarks/import_time.py [--runs 20] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Each probe imports one module and reports elapsed time and whether Tk came along
+PROBE = """
+import sys, time
+sys.path.insert(0, {repo!r})
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(elapsed, "tkinter" in sys.modules)
+"""
+
+MODULES = [
+    ("splitter_engine", "split core only"),
+    ("file_splitter", "launcher / library entry point"),
+    ("splitter_cli", "headless CLI"),
+    ("splitter_gui", "tkinter GUI (what every import used to cost)"),
+]
+
+
+def measure(module, runs):
+    timings = []
+    loads_tk = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(repo=str(REPO_DIR), module=module)],
+            capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(out[0]) * 1000)
+        loads_tk = out[1] == "True"
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "imports_tkinter": loads_tk,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="interpreters per module")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for module, label in MODULES:
+        try:
+            result = measure(module, args.runs)
+        except subprocess.CalledProcessError as e:
+            # e.g. splitter_gui on a host without Tk
+            result = {"module": module, "error": e.stderr.strip().splitlines()[-1]}
+        result["description"] = label
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for r in results:
+        if "error" in r:
+            print(f"{r['module']:<16} {'failed':>10}   {r['error']}")
+        else:
+            tk = "loads tkinter" if r["imports_tkinter"] else "no tkinter"
+            print(f"{r['module']:<16} {r['median_ms']:>7.2f} ms   {tk:<14} {r['description']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Split benchmark
+Runs every combination of corpus, split method, strategy and worker count,
+each in a fresh interpreter, and reports MB/s, lines/s, peak RSS and
+read/write syscall counts.
+
+    python benchmarks/split_bench.py [--size 256M] [--charset ascii utf8]
+                                     [--newline lf crlf] [--workers 1 4]
+                                     [--pipeline on off] [--json]
+
+Corpora are generated once into --corpus-dir and reused by later runs.
+Peak RSS needs the resource module (not on Windows) and syscall counts
+need /proc/self/io (Linux); both are reported as null where unavailable.
+"""
+
+import argparse
+import itertools
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from corpus import ensure_corpus, parse_line_length, parse_size
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Each probe performs one split and prints its own measurements as JSON
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {repo!r})
+
+def io_counters():
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["syscr"]), int(fields["syscw"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+from splitter_engine import SplitEngine
+engine = SplitEngine(strategy={strategy!r}, workers={workers!r}, use_index=False,
+                     pipeline={pipeline!r})
+reads, writes = io_counters()
+started = time.perf_counter()
+if {method!r} == "lines":
+    result = engine.split_file({input!r}, {output!r}, lines_per_file={limit!r})
+else:
+    result = engine.split_file({input!r}, {output!r}, max_size_bytes={limit!r})
+elapsed = time.perf_counter() - started
+reads_after, writes_after = io_counters()
+
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss = peak if sys.platform == "darwin" else peak * 1024
+except ImportError:
+    peak_rss = None
+
+print(json.dumps({{
+    "elapsed_seconds": elapsed,
+    "bytes": result.bytes,
+    "lines": result.lines,
+    "files": result.files,
+    "peak_rss_bytes": peak_rss,
+    "read_syscalls": None if reads is None else reads_after - reads,
+    "write_syscalls": None if writes is None else writes_after - writes,
+}}))
+"""
+
+METHODS = ("lines", "size")
+STRATEGIES = ("stream", "mmap")
+
+
+def run_case(input_file, output_dir, method, limit, strategy, workers, pipeline=True):
+    code = PROBE.format(repo=str(REPO_DIR), input=str(input_file), output=str(output_dir),
+                        method=method, limit=limit, strategy=strategy, workers=workers,
+                        pipeline=pipeline)
+    try:
+        out = subprocess.run([sys.executable, "-c", code],
+                             capture_output=True, text=True, check=True).stdout
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    stats = json.loads(out)
+
+    elapsed = stats["elapsed_seconds"]
+    stats["mb_per_second"] = round(stats["bytes"] / (1024 * 1024) / elapsed, 2) if elapsed else None
+    # Lines aren't counted when size parts are planned without scanning
+    if stats["lines"] is not None and elapsed:
+        stats["lines_per_second"] = round(stats["lines"] / elapsed)
+    else:
+        stats["lines_per_second"] = None
+    stats["elapsed_seconds"] = round(elapsed, 6)
+    return stats
+
+
+def print_result(r):
+    case = (f"{r['corpus']:<44} {r['method']:<5} {r['strategy']:<6} w={r['workers']:<2} "
+            f"{'pipe' if r['pipeline'] else 'sync':<4}")
+    if "error" in r:
+        print(f"{case} failed: {r['error']}")
+        return
+    lines = "-" if r["lines_per_second"] is None else f"{r['lines_per_second']:,}"
+    rss = "-" if r["peak_rss_bytes"] is None else f"{r['peak_rss_bytes'] / (1024 * 1024):,.0f}"
+    syscalls = ("-" if r["read_syscalls"] is None
+                else f"{r['read_syscalls']:,}r/{r['write_syscalls']:,}w")
+    print(f"{case} {r['mb_per_second']:>9,.1f} MB/s {lines:>13} lines/s "
+          f"{rss:>6} MB RSS  {syscalls} syscalls")
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=parse_size, nargs="+", default=[parse_size("256M")],
+                        help="corpus sizes, e.g. 256M 10G (default: 256M)")
+    parser.add_argument("--line-length", type=parse_line_length, nargs="+",
+                        default=[(20, 200)], metavar="MIN:MAX",
+                        help="line length ranges (default: 20:200)")
+    parser.add_argument("--charset", choices=("ascii", "utf8"), nargs="+", default=["ascii"])
+    parser.add_argument("--newline", choices=("lf", "crlf"), nargs="+", default=["lf"])
+    parser.add_argument("--method", choices=METHODS, nargs="+", default=list(METHODS))
+    parser.add_argument("--strategy", choices=STRATEGIES, nargs="+", default=list(STRATEGIES))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--pipeline", choices=("on", "off"), nargs="+", default=["on"],
+                        help="stream with reader/writer threads, or all on one thread")
+    parser.add_argument("--lines-per-file", type=int, default=1_000_000)
+    parser.add_argument("--part-size", type=parse_size, default=parse_size("64M"))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--corpus-dir", default=Path(tempfile.gettempdir()) / "splitter-bench",
+                        help="where generated corpora are kept between runs")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    corpora = itertools.product(args.size, args.line_length, args.charset, args.newline)
+    for size, line_length, charset, newline in corpora:
+        input_file = ensure_corpus(args.corpus_dir, size, line_length, charset, newline,
+                                   args.seed)
+        output_dir = Path(args.corpus_dir) / "out"
+        cases = itertools.product(args.method, args.strategy, args.workers, args.pipeline)
+        for method, strategy, workers, pipeline in cases:
+            # One worker per part is all the stream strategy can use, and
+            # only streaming has a pipeline to turn off
+            if strategy == "stream" and workers > 1:
+                continue
+            if strategy == "mmap" and pipeline == "off":
+                continue
+            pipeline = pipeline == "on"
+            limit = args.lines_per_file if method == "lines" else args.part_size
+            result = {
+                "corpus": input_file.name,
+                "size": size,
+                "line_length": list(line_length),
+                "charset": charset,
+                "newline": newline,
+                "method": method,
+                "limit": limit,
+                "strategy": strategy,
+                "workers": workers,
+                "pipeline": pipeline,
+            }
+            try:
+                result.update(run_case(input_file, output_dir, method, limit, strategy,
+                                       workers, pipeline))
+            except subprocess.CalledProcessError as e:
+                result["error"] = e.stderr.strip().splitlines()[-1]
+            results.append(result)
+            if not args.json:
+                print_result(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
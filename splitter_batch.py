@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Batch
+Splits many files with a bounded number running at once
+"""
+
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from splitter_engine import SplitEngine, SplitProgress, default_output_dir
+from splitter_join import PART_NAME
+from splitter_manifest import MANIFEST_SUFFIX
+
+
+def _splittable(path):
+    """False for hidden files and what earlier splits left next to their inputs"""
+    name = path.name
+    return not (name.startswith(".") or name.endswith((".tmp", ".lineidx", MANIFEST_SUFFIX))
+                or PART_NAME.match(name))
+
+
+def expand_inputs(sources):
+    """Sorted, de-duplicated files named by sources: files, folders (not recursed) or globs
+
+    ValueError if a source names nothing to split.
+    """
+    found = {}
+    for source in sources:
+        source = str(source)
+        if any(c in source for c in "*?["):
+            paths = [Path(p) for p in glob.glob(source, recursive=True)]
+            paths = [p for p in paths if p.is_file() and _splittable(p)]
+        elif Path(source).is_dir():
+            paths = [p for p in Path(source).iterdir() if p.is_file() and _splittable(p)]
+        else:
+            Path(source).stat()  # A missing file fails here
+            paths = [Path(source)]
+        if not paths:
+            raise ValueError(f"No files to split in {source}")
+        for path in paths:
+            found.setdefault(os.path.abspath(path), path)
+    return [found[key] for key in sorted(found)]
+
+
+class BatchJob:
+    """One file of a batch: where it goes, its own progress, and how it ended"""
+
+    def __init__(self, input_file, output_dir):
+        self.input_file = Path(input_file)
+        self.output_dir = Path(output_dir)
+        self.size = self.input_file.stat().st_size
+        self.progress = SplitProgress()
+        self.status = "pending"   # then running, done, failed or cancelled
+        self.result = None
+        self.error = None
+        self.elapsed = None
+
+    @property
+    def bytes_done(self):
+        # A finished split reports its output size, not how much input it read
+        if self.status in ("done", "failed"):
+            return self.size
+        return min(self.progress.bytes_done, self.size)
+
+    def to_dict(self):
+        stats = {
+            "input": str(self.input_file),
+            "output_dir": str(self.output_dir),
+            "status": self.status,
+            "error": self.error,
+            "elapsed_seconds": None if self.elapsed is None else round(self.elapsed, 6),
+        }
+        if self.result is not None:
+            stats.update({key: value for key, value in self.result.to_dict().items()
+                          if key != "output_dir"})
+        return stats
+
+
+class BatchProgress:
+    """Combined progress of the jobs of a batch; sampled like a SplitProgress"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, jobs=()):
+        self.jobs = list(jobs)
+        self.finished = False
+        self.started = time.perf_counter()
+
+    @property
+    def total_bytes(self):
+        return sum(job.size for job in self.jobs)
+
+    @property
+    def bytes_done(self):
+        return sum(job.bytes_done for job in self.jobs)
+
+    @property
+    def lines(self):
+        lines = [job.progress.lines for job in self.jobs if job.status != "pending"]
+        return None if None in lines else sum(lines)
+
+    @property
+    def files(self):
+        return sum(job.progress.files for job in self.jobs if job.status != "pending")
+
+    @property
+    def jobs_done(self):
+        return sum(job.status not in ("pending", "running") for job in self.jobs)
+
+    @property
+    def percent(self):
+        if self.finished:
+            return 100.0
+        if not self.total_bytes:
+            return None
+        return min(99.9, self.bytes_done / self.total_bytes * 100)
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+
+class BatchResult:
+    """Summary of a batch: every job in input order"""
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.cancelled = False
+        self.elapsed = None
+
+    @property
+    def failed(self):
+        return [job for job in self.jobs if job.status == "failed"]
+
+    def to_dict(self):
+        done = [job for job in self.jobs if job.status == "done"]
+        return {
+            "inputs": len(self.jobs),
+            "succeeded": len(done),
+            "failed": len(self.failed),
+            "cancelled": self.cancelled,
+            "files": sum(job.result.files for job in done),
+            "bytes": sum(job.result.bytes for job in done),
+            "elapsed_seconds": None if self.elapsed is None else round(self.elapsed, 6),
+            "jobs": [job.to_dict() for job in self.jobs],
+        }
+
+    def summary(self, limit=None):
+        """One line per job (the first limit of them), e.g. 'data.txt: 12 parts, 1,024.0 MB, 3.1s'"""
+        lines = []
+        for job in self.jobs[:limit]:
+            if job.status == "done":
+                lines.append(f"{job.input_file.name}: {job.result.files} parts, "
+                             f"{job.result.bytes / (1024 * 1024):,.1f} MB, {job.elapsed:.1f}s")
+            elif job.status == "failed":
+                lines.append(f"{job.input_file.name}: failed: {job.error}")
+            elif job.status == "running" and job.progress.percent is not None:
+                lines.append(f"{job.input_file.name}: running, {job.progress.percent:.0f}%")
+            else:
+                lines.append(f"{job.input_file.name}: {job.status}")
+        if limit is not None and len(self.jobs) > limit:
+            lines.append(f"... and {len(self.jobs) - limit} more")
+        return lines
+
+
+class BatchRunner:
+    """Splits a list of files, at most jobs of them at a time
+
+    jobs is the global limit on concurrent I/O: each running job reads one
+    input and writes its parts (with the engine's own workers on top in
+    zero-copy mode). Larger files are started first so the last one to
+    finish isn't a big file started late. Every file gets its own engine
+    built from engine_options and its own progress, which progress
+    (a BatchProgress) adds up; a file that fails doesn't stop the others.
+    """
+
+    def __init__(self, jobs=2, report=None, is_cancelled=None, progress=None,
+                 **engine_options):
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        self.jobs = jobs
+        self.report = report or (lambda msg: None)
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.progress = progress or BatchProgress()
+        self.engine_options = engine_options
+        self._interrupted = threading.Event()
+
+    def run(self, inputs, output_dir=None, **split_options):
+        """Split every file in inputs with split_file(**split_options); returns a BatchResult
+
+        With output_dir, each file's parts go to a folder of its own in it
+        named like the default one (<input name>_split).
+        """
+        jobs = []
+        for input_file in inputs:
+            folder = default_output_dir(input_file)
+            if output_dir:
+                folder = Path(output_dir) / folder.name
+            jobs.append(BatchJob(input_file, folder))
+        names = [job.output_dir for job in jobs]
+        if len(set(names)) < len(names):
+            raise ValueError("Two inputs would share an output folder; rename one of them")
+
+        result = BatchResult(jobs)
+        self.progress.reset(jobs)
+        self.report(("status", f"Splitting {len(jobs)} files, {self.jobs} at a time"))
+        started = time.perf_counter()
+        lock = threading.Lock()
+        self._interrupted.clear()
+
+        def is_cancelled():
+            return self._interrupted.is_set() or self.is_cancelled()
+
+        def run_job(job):
+            if is_cancelled():
+                job.status = "cancelled"
+                return
+            name = job.input_file.name
+
+            def report(msg):
+                self.report((msg[0], f"{name}: {msg[1]}"))
+
+            engine = SplitEngine(report=report, is_cancelled=is_cancelled,
+                                 progress=job.progress, **self.engine_options)
+            job.status = "running"
+            job_started = time.perf_counter()
+            try:
+                job.result = engine.split_file(job.input_file, job.output_dir, **split_options)
+                job.status = "cancelled" if job.result.cancelled else "done"
+            except (OSError, ValueError) as e:
+                job.status = "failed"
+                job.error = str(e)
+                report(("status", f"Failed: {e}"))
+            job.elapsed = time.perf_counter() - job_started
+            with lock:
+                self.report(("status", f"{self.progress.jobs_done} of {len(jobs)} files done"))
+
+        order = sorted(jobs, key=lambda job: job.size, reverse=True)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            try:
+                for future in [pool.submit(run_job, job) for job in order]:
+                    future.result()
+            except KeyboardInterrupt:
+                # Running splits drop their unfinished parts before the pool lets go
+                self._interrupted.set()
+                raise
+
+        result.elapsed = time.perf_counter() - started
+        result.cancelled = is_cancelled()
+        if not result.cancelled:
+            self.progress.finished = True
+        return result
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter CLI
+Headless front end over the splitting engine; never imports tkinter
+"""
+
+import argparse
+import contextlib
+import json
+import re
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+from splitter_batch import BatchRunner, expand_inputs
+from splitter_codecs import CODECS, split_name
+from splitter_engine import ProgressTicker, SplitEngine, SplitTimings, default_output_dir
+from splitter_index import get_line_index
+from splitter_join import JoinEngine
+from splitter_manifest import CHECKSUMS
+from splitter_text import ENCODINGS
+
+
+def _positive_int(text):
+    """argparse type accepting 1000000, 1,000,000 or 1_000_000"""
+    try:
+        value = int(text.replace(',', '').replace('_', ''))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number: {text}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number: {text}")
+    return value
+
+
+def _line_range(text):
+    """argparse type for --extract: 1-based inclusive 'A:B' to 0-based [start, end)"""
+    first, sep, last = text.partition(":")
+    try:
+        if not sep:
+            raise ValueError()
+        start = int(first.replace(',', '').replace('_', '')) - 1 if first else 0
+        end = int(last.replace(',', '').replace('_', '')) if last else sys.maxsize
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIRST:LAST line numbers, got: {text}")
+    if start < 0 or end <= start:
+        raise argparse.ArgumentTypeError(f"not a valid line range: {text}")
+    return start, end
+
+
+def _ratios(text):
+    """argparse type for --ratio: '80:10:10' to [80, 10, 10]"""
+    try:
+        ratios = [float(part.replace(',', '').replace('_', '')) for part in text.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ratios like 80:10:10, got: {text}")
+    if len(ratios) < 2 or any(ratio <= 0 for ratio in ratios):
+        raise argparse.ArgumentTypeError(f"need two or more positive ratios: {text}")
+    return [int(ratio) if ratio.is_integer() else ratio for ratio in ratios]
+
+
+def _sample_size(text):
+    """argparse type for --sample: '1000' to {"count": 1000}, '1%' to {"fraction": 0.01}"""
+    if text.endswith("%"):
+        try:
+            percent = float(text[:-1])
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"not a percentage: {text}")
+        if not 0 < percent < 100:
+            raise argparse.ArgumentTypeError(f"must be between 0% and 100%: {text}")
+        return {"fraction": percent / 100}
+    return {"count": _positive_int(text)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="file_splitter.py",
+        description="Split a large text file into numbered parts, or join parts back "
+                    "together. Run without arguments to open the GUI instead.")
+    parser.add_argument("input", nargs="+",
+                        help="file to split, or - to read from stdin (e.g. zcat x.gz | ...); "
+                             "several files, folders or quoted globs ('logs/*.log') are split "
+                             "as a batch; with --join, a part, a manifest or the parts' folder")
+
+    method = parser.add_mutually_exclusive_group(required=True)
+    method.add_argument("--lines", type=_positive_int, metavar="N",
+                        help="lines per part")
+    method.add_argument("--size-mb", type=_positive_int, metavar="MB",
+                        help="maximum part size in MB (lines are never cut)")
+    method.add_argument("--parts", type=_positive_int, metavar="N",
+                        help="exactly N parts of equal size (fewer only if lines are "
+                             "longer than a part); boundaries are probed, not scanned")
+    method.add_argument("--buckets", type=_positive_int, metavar="N",
+                        help="hash-partition lines by key into N parts; lines with the "
+                             "same key always land in the same part")
+    method.add_argument("--ratio", type=_ratios, metavar="A:B[:C...]",
+                        help="deal lines into one part per ratio, e.g. 80:10:10 for "
+                             "train/validation/test, by a seeded hash of each line; the "
+                             "same --seed always gives the same parts")
+    method.add_argument("--window", metavar="SPEC",
+                        help="one part per time window (e.g. 15m, 1h, 1d, 1mo) of a file "
+                             "sorted by time; boundaries are found by binary search")
+    method.add_argument("--sample", type=_sample_size, metavar="N|P%",
+                        help="copy a random sample of exactly N lines (reservoir sampling) "
+                             "or of about P percent of the lines to one file, in one pass")
+    method.add_argument("--count-lines", action="store_true",
+                        help="only count lines exactly and cache the line-offset index")
+    method.add_argument("--extract", type=_line_range, metavar="FIRST:LAST",
+                        help="copy lines FIRST..LAST (1-based, inclusive; either may be "
+                             "omitted) to one file, seeking via the line index")
+    method.add_argument("--join", action="store_true",
+                        help="reassemble the parts of a split (found by their _part_NNNN "
+                             "names or a manifest) into one file")
+
+    parser.add_argument("--verify", action="store_true",
+                        help="with --join: check every part against the manifest's "
+                             "checksums while copying; nothing is written on a mismatch")
+
+    parser.add_argument("--header-lines", type=int, metavar="N",
+                        help="with --lines/--size-mb: repeat the first N lines at the top "
+                             "of every part (default: 1 with --csv, else 0)")
+    parser.add_argument("--csv", action="store_true",
+                        help="treat the input as CSV/TSV: never cut a record inside a "
+                             "double-quoted field, count records instead of lines, and "
+                             "repeat a header line")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="auto",
+                        help="how lines end: bytes (UTF-8, ASCII, Latin-1...) at each LF "
+                             "byte, utf-16-le/utf-16-be at each LF code unit; auto picks "
+                             "UTF-16 by its BOM (default: auto)")
+    parser.add_argument("--lone-cr", action="store_true",
+                        help="with --lines/--size-mb: also end lines at a CR without an LF, "
+                             "as in old Mac or mixed files")
+    parser.add_argument("--no-repeat-bom", dest="repeat_bom", action="store_false",
+                        help="keep a BOM only in the first part instead of starting every "
+                             "part with it")
+    parser.add_argument("--key-field", type=_positive_int, default=1, metavar="N",
+                        help="with --buckets: 1-based field holding the key (default: 1)")
+    parser.add_argument("--key-delimiter", default=",", metavar="SEP",
+                        help="with --buckets: field separator, \\t for tab (default: ,)")
+    parser.add_argument("--key-regex", metavar="REGEX",
+                        help="with --buckets: take the key from the regex's first capture "
+                             "group (or whole match) instead of a field")
+    parser.add_argument("--time-field", type=_positive_int, metavar="N",
+                        help="with --window: 1-based field holding the timestamp (default: "
+                             "the first ISO 8601 date and time on the line)")
+    parser.add_argument("--time-delimiter", default=",", metavar="SEP",
+                        help="with --time-field: field separator, \\t for tab (default: ,)")
+    parser.add_argument("--time-regex", metavar="REGEX",
+                        help="with --window: take the timestamp from the regex's first "
+                             "capture group (or whole match)")
+    parser.add_argument("--time-format", metavar="FORMAT",
+                        help="with --window: strptime format of the timestamp, e.g. "
+                             "%%d/%%b/%%Y:%%H:%%M:%%S, or epoch for Unix seconds (default: ISO "
+                             "8601)")
+    parser.add_argument("--name-by-window", action="store_true",
+                        help="with --window: name parts after their window, e.g. "
+                             "app_2024-05-01T13.log, instead of numbering them")
+    parser.add_argument("--seed", type=int, default=0, metavar="N",
+                        help="with --ratio/--sample: seed of the hash or random choice "
+                             "(default: 0)")
+    parser.add_argument("--by-line-number", action="store_true",
+                        help="with --ratio or --sample P%%: hash each line's number instead "
+                             "of its contents, so equal lines don't always go together")
+    parser.add_argument("--include", action="append", metavar="REGEX",
+                        help="split only lines matching REGEX (repeatable: any of them); "
+                             "^ and $ anchor to the line")
+    parser.add_argument("--exclude", action="append", metavar="REGEX",
+                        help="leave out lines matching REGEX (repeatable)")
+    parser.add_argument("-i", "--ignore-case", action="store_true",
+                        help="match --include/--exclude ignoring ASCII case")
+    parser.add_argument("-F", "--fixed-strings", action="store_true",
+                        help="treat --include/--exclude as plain text, not regexes")
+    parser.add_argument("--out", metavar="DIR",
+                        help="output directory (default: <script dir>/<input name>_split); "
+                             "with --extract or --sample, the output file; with --join, the "
+                             "output file or folder (default: <name>_joined<ext> beside the "
+                             "parts)")
+    parser.add_argument("--name", metavar="NAME", default="stdin",
+                        help="file name the parts are named after when reading stdin, "
+                             "e.g. access.log gives access_part_0001.log (default: stdin)")
+    parser.add_argument("--workers", type=_positive_int, default=1, metavar="N",
+                        help="parts written concurrently (default: 1)")
+    parser.add_argument("--jobs", type=_positive_int, default=2, metavar="N",
+                        help="with several inputs: files split at once, i.e. the limit on "
+                             "concurrent reads and writes across the batch (default: 2); "
+                             "each file goes to <out>/<input name>_split")
+    parser.add_argument("--compress", choices=sorted(CODECS), metavar="CODEC",
+                        help="compress every part: gzip, bz2, xz or zstd (needs the "
+                             "zstandard package); blocks are compressed on all cores, "
+                             "or on --workers threads if given. Compressed inputs are "
+                             "always decompressed on the fly")
+    parser.add_argument("--compress-level", type=int, metavar="N",
+                        help="codec compression level (default: the codec's own)")
+    parser.add_argument("--manifest", nargs="?", const="crc32", choices=CHECKSUMS,
+                        help="write <input name>.manifest.json next to the parts with each "
+                             "part's byte range, line count and CRC32, plus SHA-256 if "
+                             "given 'sha256'; checksums are computed while writing")
+    parser.add_argument("--resume", action="store_true",
+                        help="journal finished parts in the output directory, and if a "
+                             "journal of the same split is there, keep its verified parts "
+                             "and continue after them (only with --lines, --size-mb, --parts "
+                             "or --window, not stdin or a filter)")
+    parser.add_argument("--no-mmap", action="store_true",
+                        help="stream the input instead of memory-mapping it")
+    parser.add_argument("--no-pipeline", action="store_true",
+                        help="when streaming, read, scan and write on one thread instead "
+                             "of overlapping them with reader and writer threads")
+    parser.add_argument("--chunk-mb", type=_positive_int, default=8, metavar="MB",
+                        help="read chunk size when streaming; four are in use at once "
+                             "(default: 8)")
+    parser.add_argument("--write-buffer-kb", type=_positive_int, default=1024, metavar="KB",
+                        help="write buffer of each streamed part file; larger writes bypass "
+                             "it (default: 1024)")
+    parser.add_argument("--no-preallocate", action="store_true",
+                        help="don't reserve each memory-mapped part's blocks before copying it")
+    parser.add_argument("--drop-cache", action="store_true",
+                        help="keep the split out of the page cache: drop input pages once "
+                             "read, and sync and drop every part once written (slower, but "
+                             "a huge split doesn't evict everything else)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="neither use nor write the cached line-offset index")
+    parser.add_argument("--stats-json", metavar="PATH",
+                        help="write run statistics as JSON to PATH ('-' for stdout)")
+    parser.add_argument("--timings", metavar="PATH",
+                        help="write the time spent reading, scanning, writing, checksumming, "
+                             "compressing and reporting, and per part, as JSON to PATH "
+                             "('-' for a summary on stderr)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run under cProfile and write the stats to PATH for pstats or "
+                             "snakeviz ('-' for the top functions on stderr); only the main "
+                             "thread is profiled, add --no-pipeline to see everything")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print errors")
+    return parser
+
+
+class ConsoleReporter:
+    """Prints engine status messages to stderr, redrawing one progress line on a terminal
+
+    The progress line is drawn by sampling engine.progress a few times a
+    second (PROGRESS_INTERVAL), not once per chunk.
+    """
+
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, stream=sys.stderr, quiet=False):
+        self.stream = stream
+        self.quiet = quiet
+        self.interactive = stream.isatty()
+        self.lock = threading.Lock()
+
+    def __call__(self, msg):
+        if self.quiet or msg[0] != "status":
+            return
+        with self.lock:
+            if self.interactive:
+                self.stream.write("\r\033[K")
+            self.stream.write(f"{msg[1]}\n")
+            self.stream.flush()
+
+    def draw(self, progress):
+        lines = "?" if progress.lines is None else f"{progress.lines:,}"
+        if progress.percent is None:
+            # Pipes have no size to measure percent against
+            done = f"{progress.bytes_done / (1024 * 1024):,.1f} MB"
+        else:
+            done = f"{progress.percent:5.1f}%"
+        with self.lock:
+            self.stream.write(f"\r{done}  {progress.rate / (1024 * 1024):,.1f} MB/s"
+                              f"  lines: {lines}  files: {progress.files}  ")
+            self.stream.flush()
+
+    @contextlib.contextmanager
+    def watch(self, progress):
+        """Draw the progress line while the body runs, then clear it"""
+        if self.quiet or not self.interactive:
+            yield
+            return
+        try:
+            with ProgressTicker(progress, self.draw, self.PROGRESS_INTERVAL):
+                yield
+        finally:
+            with self.lock:
+                self.stream.write("\r\033[K")
+                self.stream.flush()
+
+
+def write_stats(path, stats):
+    text = json.dumps(stats, indent=2)
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def write_timings(path, timings):
+    if path == "-":
+        print(timings.summary(), file=sys.stderr)
+    else:
+        write_stats(path, timings.to_dict())
+
+
+def write_profile(path, profiler):
+    if path == "-":
+        import pstats
+
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    else:
+        profiler.dump_stats(path)
+
+
+def count_lines(args):
+    started = time.perf_counter()
+    try:
+        index = get_line_index(args.input, use_cache=not args.no_index)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.stats_json != "-":
+        print(index.line_count)
+    if args.stats_json:
+        write_stats(args.stats_json, {
+            "input": args.input,
+            "lines": index.line_count,
+            "bytes": index.size,
+            "index_entries": len(index.offsets),
+            "elapsed_seconds": round(elapsed, 6),
+        })
+    return 0
+
+
+def key_options(args):
+    """split_file/split_stream keyword arguments for --buckets"""
+    return {
+        "buckets": args.buckets,
+        "key_field": args.key_field - 1,
+        "key_delimiter": args.key_delimiter.replace("\\t", "\t"),
+        "key_pattern": args.key_regex,
+    }
+
+
+def record_options(args):
+    """split_file/split_stream keyword arguments for --header-lines and --csv"""
+    header_lines = args.header_lines
+    if header_lines is None:
+        header_lines = 1 if args.csv else 0
+    return {"header_lines": header_lines, "quoted": args.csv}
+
+
+def text_options(args):
+    """split_file/split_stream keyword arguments for --encoding, --lone-cr and --no-repeat-bom"""
+    return {"encoding": args.encoding, "lone_cr": args.lone_cr, "repeat_bom": args.repeat_bom}
+
+
+def filter_options(args):
+    """split_file/split_stream keyword arguments for --include and --exclude"""
+    include, exclude = args.include or [], args.exclude or []
+    if args.fixed_strings:
+        include = [re.escape(p) for p in include]
+        exclude = [re.escape(p) for p in exclude]
+    return {"include": include, "exclude": exclude, "ignore_case": args.ignore_case}
+
+
+def ratio_options(args):
+    """split_file/split_stream keyword arguments for --ratio"""
+    return {"ratios": args.ratio, "seed": args.seed, "by_number": args.by_line_number}
+
+
+def time_options(args):
+    """split_file keyword arguments for --window"""
+    return {
+        "window": args.window,
+        "time_field": None if args.time_field is None else args.time_field - 1,
+        "time_delimiter": args.time_delimiter.replace("\\t", "\t"),
+        "time_pattern": args.time_regex,
+        "time_format": args.time_format,
+        "name_by_window": args.name_by_window,
+    }
+
+
+def split_stdin(engine, args):
+    name = Path(args.name)
+    output_dir = args.out or default_output_dir(name)
+    if args.buckets is not None:
+        return engine.split_stream(sys.stdin.buffer, output_dir, name.stem, name.suffix,
+                                   **key_options(args), **filter_options(args),
+                                   **text_options(args))
+    if args.ratio is not None:
+        return engine.split_stream(sys.stdin.buffer, output_dir, name.stem, name.suffix,
+                                   **ratio_options(args), **filter_options(args),
+                                   **text_options(args))
+    if args.lines is not None:
+        return engine.split_stream(sys.stdin.buffer, output_dir, name.stem, name.suffix,
+                                   lines_per_file=args.lines, **record_options(args),
+                                   **filter_options(args), **text_options(args))
+    return engine.split_stream(sys.stdin.buffer, output_dir, name.stem, name.suffix,
+                               max_size_bytes=args.size_mb * 1024 * 1024,
+                               **record_options(args), **filter_options(args),
+                               **text_options(args))
+
+
+def extract(engine, args):
+    start, end = args.extract
+    input_path = Path(args.input)
+    input_path.stat()  # Fail on a missing input before creating anything
+
+    if args.out:
+        output_file = Path(args.out)
+    else:
+        last = "end" if end == sys.maxsize else end
+        base_name, file_ext = split_name(input_path)
+        output_file = (default_output_dir(input_path)
+                       / f"{base_name}_lines_{start + 1}-{last}{file_ext}")
+    engine.report(("status", f"Extracting to: {output_file}"))
+    return engine.extract_lines(input_path, start, end, output_file)
+
+
+def sample(engine, args):
+    input_path = Path(args.input)
+    input_path.stat()  # Fail on a missing input before creating anything
+
+    if args.out:
+        output_file = Path(args.out)
+    else:
+        if "count" in args.sample:
+            size = args.sample["count"]
+        else:
+            size = f"{args.sample['fraction'] * 100:g}pct"
+        base_name, file_ext = split_name(input_path)
+        output_file = default_output_dir(input_path) / f"{base_name}_sample_{size}{file_ext}"
+    engine.report(("status", f"Sampling to: {output_file}"))
+    return engine.sample_lines(input_path, output_file, seed=args.seed,
+                               by_number=args.by_line_number, **args.sample,
+                               **filter_options(args))
+
+
+def join(engine, args):
+    joiner = JoinEngine(report=engine.report, is_cancelled=engine.is_cancelled,
+                        progress=engine.progress, workers=args.workers)
+    return joiner.join(args.input, args.out, verify=args.verify)
+
+
+def split_options(args):
+    """split_file keyword arguments for the method and options of a file split"""
+    if args.parts is not None:
+        return {"parts": args.parts, **text_options(args)}
+    if args.window is not None:
+        return {**time_options(args), **text_options(args)}
+    if args.buckets is not None:
+        return {**key_options(args), **filter_options(args), **text_options(args)}
+    if args.ratio is not None:
+        return {**ratio_options(args), **filter_options(args), **text_options(args)}
+    if args.lines is not None:
+        return {"lines_per_file": args.lines, **record_options(args), **filter_options(args),
+                **text_options(args)}
+    return {"max_size_bytes": args.size_mb * 1024 * 1024, **record_options(args),
+            **filter_options(args), **text_options(args)}
+
+
+def engine_options(args):
+    """SplitEngine keyword arguments shared by single and batch splits"""
+    return {
+        "strategy": "stream" if args.no_mmap else "auto",
+        "workers": args.workers,
+        "use_index": not args.no_index,
+        "compress": args.compress,
+        "compress_level": args.compress_level,
+        "resume": args.resume,
+        "manifest": args.manifest,
+        "pipeline": not args.no_pipeline,
+        "chunk_size": args.chunk_mb * 1024 * 1024,
+        "write_buffer": args.write_buffer_kb * 1024,
+        "preallocate": not args.no_preallocate,
+        "drop_cache": args.drop_cache,
+    }
+
+
+def run_batch(inputs, args, reporter):
+    try:
+        runner = BatchRunner(jobs=args.jobs, report=reporter, **engine_options(args))
+        with reporter.watch(runner.progress):
+            result = runner.run(inputs, args.out, **split_options(args))
+    except KeyboardInterrupt:
+        print("\nCancelled.", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        for line in result.summary():
+            print(line, file=sys.stderr)
+    if args.stats_json:
+        stats = result.to_dict()
+        stats.update({
+            "jobs_at_once": args.jobs,
+            "workers": args.workers,
+            "compress": args.compress,
+        })
+        write_stats(args.stats_json, stats)
+    return 1 if result.failed else 0
+
+
+def run_split(engine, args):
+    """Dispatch to the requested operation; returns (method, limit, result)"""
+    if args.join:
+        return "join", None, join(engine, args)
+    if args.parts is not None:
+        return "parts", args.parts, engine.split_file(args.input, args.out, parts=args.parts,
+                                                      **text_options(args))
+    if args.window is not None:
+        return "time", args.window, engine.split_file(args.input, args.out,
+                                                      **time_options(args),
+                                                      **text_options(args))
+    if args.buckets is not None:
+        if args.input == "-":
+            return "key", args.buckets, split_stdin(engine, args)
+        return "key", args.buckets, engine.split_file(args.input, args.out,
+                                                      **key_options(args),
+                                                      **filter_options(args),
+                                                      **text_options(args))
+    if args.ratio is not None:
+        limit = {"ratios": args.ratio, "seed": args.seed,
+                 "hash": "number" if args.by_line_number else "line"}
+        if args.input == "-":
+            return "ratio", limit, split_stdin(engine, args)
+        return "ratio", limit, engine.split_file(args.input, args.out, **ratio_options(args),
+                                                 **filter_options(args), **text_options(args))
+    if args.sample is not None:
+        return "sample", dict(args.sample, seed=args.seed), sample(engine, args)
+    if args.input == "-":
+        method = "lines" if args.lines is not None else "size"
+        limit = args.lines if args.lines is not None else args.size_mb * 1024 * 1024
+        return method, limit, split_stdin(engine, args)
+    if args.lines is not None:
+        return "lines", args.lines, engine.split_file(args.input, args.out,
+                                                      lines_per_file=args.lines,
+                                                      **record_options(args),
+                                                      **filter_options(args),
+                                                      **text_options(args))
+    if args.extract is not None:
+        last = None if args.extract[1] == sys.maxsize else args.extract[1]
+        return "extract", [args.extract[0] + 1, last], extract(engine, args)
+    limit = args.size_mb * 1024 * 1024
+    return "size", limit, engine.split_file(args.input, args.out, max_size_bytes=limit,
+                                            **record_options(args), **filter_options(args),
+                                            **text_options(args))
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    inputs, args.input = args.input, args.input[0]
+    # Several inputs, a folder or a glob make a batch, except a folder of parts to join
+    batch = len(inputs) > 1 or (not args.join and args.input != "-" and (
+        Path(args.input).is_dir() or any(c in args.input for c in "*?[")))
+
+    reporter = ConsoleReporter(quiet=args.quiet)
+    timings = SplitTimings() if args.timings else None
+    try:
+        engine = SplitEngine(report=reporter, timings=timings, **engine_options(args))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if batch:
+        if ("-" in inputs or args.join or args.count_lines or args.extract is not None
+                or args.sample is not None):
+            print("Error: several inputs only work for splitting files, "
+                  "not with stdin, --join, --count-lines, --extract or --sample",
+                  file=sys.stderr)
+            return 2
+        if args.timings or args.profile:
+            print("Error: --timings and --profile time a single split", file=sys.stderr)
+            return 2
+
+    if args.input == "-" and (args.count_lines or args.extract is not None
+                              or args.parts is not None or args.join
+                              or args.sample is not None or args.window is not None):
+        print("Error: --count-lines, --extract, --parts, --window, --sample and --join need "
+              "a regular file, not stdin", file=sys.stderr)
+        return 2
+    if args.resume and (args.input == "-" or args.lines is None and args.size_mb is None
+                        and args.parts is None and args.window is None):
+        print("Error: --resume only works when splitting a file with --lines, --size-mb, "
+              "--parts or --window, not stdin", file=sys.stderr)
+        return 2
+    if args.resume and (args.include or args.exclude):
+        print("Error: --resume can't be combined with --include or --exclude",
+              file=sys.stderr)
+        return 2
+    if args.verify and not args.join:
+        print("Error: --verify only works with --join", file=sys.stderr)
+        return 2
+    if (args.csv or args.header_lines) and args.lines is None and args.size_mb is None:
+        print("Error: --csv and --header-lines only work with --lines or --size-mb",
+              file=sys.stderr)
+        return 2
+    if args.lone_cr and args.lines is None and args.size_mb is None:
+        print("Error: --lone-cr only works with --lines or --size-mb", file=sys.stderr)
+        return 2
+    if (args.include or args.exclude) and (args.lines is None and args.size_mb is None
+                                           and args.buckets is None and args.ratio is None
+                                           and args.sample is None):
+        print("Error: --include and --exclude only work with --lines, --size-mb, --buckets, "
+              "--ratio or --sample", file=sys.stderr)
+        return 2
+    if args.count_lines:
+        return count_lines(args)
+    if batch:
+        try:
+            inputs = expand_inputs(inputs)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return run_batch(inputs, args, reporter)
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        with reporter.watch(engine.progress):
+            if profiler is None:
+                method, limit, result = run_split(engine, args)
+            else:
+                method, limit, result = profiler.runcall(run_split, engine, args)
+    except KeyboardInterrupt:
+        print("\nCancelled.", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if profiler is not None:
+        write_profile(args.profile, profiler)
+    if timings is not None:
+        write_timings(args.timings, timings)
+    if args.stats_json:
+        stats = result.to_dict()
+        stats.update({
+            "input": args.input,
+            "method": method,
+            "limit": limit,
+            "workers": args.workers,
+            "compress": args.compress,
+            "filter": filter_options(args) if args.include or args.exclude else None,
+            "elapsed_seconds": round(elapsed, 6),
+            "mb_per_second": round(result.bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+        })
+        write_stats(args.stats_json, stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Codecs
+Transparent decompression of inputs and block-wise compression of parts
+
+The codec modules are imported on first use so that importing the engine
+stays cheap. zstd needs the optional 'zstandard' package.
+"""
+
+import os
+from pathlib import Path
+
+
+class Codec:
+    """One compression format: how to recognise, read and write it"""
+
+    def __init__(self, name, suffixes, magic, module):
+        self.name = name
+        self.suffixes = suffixes      # First one is used for output names
+        self.magic = magic
+        self.module = module
+
+    @property
+    def suffix(self):
+        return self.suffixes[0]
+
+    def available(self):
+        try:
+            __import__(self.module)
+        except ImportError:
+            return False
+        return True
+
+    def open_reader(self, raw):
+        """Binary stream of the decompressed contents of raw"""
+        if self.name == "gzip":
+            import gzip
+            return gzip.GzipFile(fileobj=raw, mode="rb")
+        if self.name == "bz2":
+            import bz2
+            return bz2.BZ2File(raw, mode="rb")
+        if self.name == "xz":
+            import lzma
+            return lzma.LZMAFile(raw, mode="rb")
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+
+    def compress(self, data, level=None):
+        """One self-contained compressed member/stream/frame for data
+
+        All four formats decode a concatenation of these as the concatenated
+        data, so blocks can be compressed independently and in parallel.
+        The compressors release the GIL while they work.
+        """
+        if self.name == "gzip":
+            import zlib
+            # wbits=31 writes a gzip header with a zero timestamp, so equal
+            # input gives byte-identical output
+            compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+            return compressor.compress(data) + compressor.flush()
+        if self.name == "bz2":
+            import bz2
+            return bz2.compress(data, 9 if level is None else level)
+        if self.name == "xz":
+            import lzma
+            return lzma.compress(data, preset=level)
+        import zstandard
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+CODECS = {
+    "gzip": Codec("gzip", (".gz", ".gzip"), b"\x1f\x8b", "zlib"),
+    "bz2": Codec("bz2", (".bz2",), b"BZh", "bz2"),
+    "xz": Codec("xz", (".xz", ".lzma"), b"\xfd7zXZ\x00", "lzma"),
+    "zstd": Codec("zstd", (".zst", ".zstd"), b"\x28\xb5\x2f\xfd", "zstandard"),
+}
+
+
+def available_codecs():
+    return [name for name, codec in CODECS.items() if codec.available()]
+
+
+def get_codec(name):
+    """Codec by name; ValueError if unknown or its module isn't installed"""
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown compression: {name}")
+    if not codec.available():
+        raise ValueError(f"{name} support needs the '{codec.module}' package")
+    return codec
+
+
+def detect_codec(path):
+    """Codec of a compressed file, sniffed from its first bytes; None for plain files"""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    for codec in CODECS.values():
+        if head.startswith(codec.magic):
+            return codec
+    return None
+
+
+def split_name(path):
+    """(base_name, file_ext) for part names, ignoring a compression suffix
+
+    data.txt.gz gives ("data", ".txt"), like data.txt does.
+    """
+    path = Path(path)
+    for codec in CODECS.values():
+        if path.suffix.lower() in codec.suffixes:
+            path = Path(path.stem)
+            break
+    return path.stem, path.suffix
+
+
+class InputFile:
+    """Context manager opening a file for binary reading, decompressing on the fly
+
+    stream yields the (decompressed) contents; raw is the file on disk, whose
+    position is how many compressed bytes have been consumed so far.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.codec = detect_codec(path)
+        if self.codec is not None and not self.codec.available():
+            raise ValueError(f"{path} is {self.codec.name}-compressed; "
+                             f"reading it needs the '{self.codec.module}' package")
+        self.raw = None
+        self.stream = None
+
+    @property
+    def size(self):
+        return os.fstat(self.raw.fileno()).st_size
+
+    def __enter__(self):
+        self.raw = open(self.path, "rb", buffering=0)
+        self.stream = self.raw if self.codec is None else self.codec.open_reader(self.raw)
+        return self
+
+    def __exit__(self, *exc):
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
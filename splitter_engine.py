@@ -0,0 +1,2532 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Engine
+Byte-level splitting core shared by the GUI and headless callers
+"""
+
+import errno
+import hashlib
+import itertools
+import math
+import mmap
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict, deque, namedtuple
+from pathlib import Path
+
+from splitter_codecs import InputFile, detect_codec, get_codec, split_name
+from splitter_filter import LineFilter
+from splitter_manifest import (CHECKSUMS, MANIFEST_VERSION, manifest_path, part_record,
+                               write_manifest)
+from splitter_text import LineFormat, read_head
+
+
+CHUNK_SIZE = 8 * 1024 * 1024      # 8MB read chunks
+SCAN_WINDOW = 4 * 1024            # Below this, step with find() instead of bisecting
+PLAN_WINDOW = 16 * 1024 * 1024    # Window copied out of the map when counting lines
+COPY_SLICE = 64 * 1024 * 1024     # Largest single range copy between progress checks
+COMPRESS_BLOCK = 4 * 1024 * 1024  # Uncompressed bytes per independently compressed block
+BUCKET_MEMORY = 64 * 1024 * 1024  # Buffered lines across all buckets of a key split
+BUCKET_FILES = 128                # Bucket parts a key split keeps open at once
+PIPELINE_BUFFERS = 4              # Chunk buffers shared by the reader, scanner and writer
+WRITE_QUEUE = 256                 # File operations the writer thread may fall behind by
+WRITE_BUFFER = 1024 * 1024        # Buffer of each part file written on the stream path
+AHEAD_PART = 4 * 1024 * 1024      # Average mapped part size worth opening parts ahead for
+PROBE_WORKERS = 8                 # Threads reading part boundaries at once for a split into N parts
+
+STRATEGIES = ("auto", "stream", "mmap")
+
+# Byte range [start, end) of the input that becomes one output part;
+# lines is None when the plan was built without counting newlines, and
+# label, if given, names the part instead of its number
+PartRange = namedtuple("PartRange", "number start end lines label", defaults=(None,))
+
+
+def part_filename(base_name, file_number, file_ext, label=None):
+    """Output name of a part, e.g. data_part_0001.txt, or data_2024-05-01.txt with a label"""
+    if label is not None:
+        return f"{base_name}_{label}{file_ext}"
+    return f"{base_name}_part_{file_number:04d}{file_ext}"
+
+
+def _advise(fd, offset, length, advice):
+    """posix_fadvise(fd, ...) with POSIX_FADV_<advice>; a hint, so skipped where unsupported"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, "POSIX_FADV_" + advice))
+        except OSError:
+            pass
+
+
+def preallocate(fd, size):
+    """Reserve size bytes for a file whose size is known before copying into it
+
+    Where blocks can't be reserved the file is only extended to size, so
+    it has its final length either way and copies can land at any offset.
+    """
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass  # e.g. a filesystem without fallocate support
+    os.ftruncate(fd, size)
+
+
+def default_output_dir(input_file):
+    """Default output location: <script dir>/<input stem>_split"""
+    base_name, _ = split_name(input_file)
+    return Path(__file__).parent / f"{base_name}_split"
+
+
+def find_nth_newline(buf, start, end, n):
+    """Index of the n-th newline in buf[start:end]; the range must hold at least n"""
+    # Narrow the window with C-level count() so we never step line by line
+    # through more than SCAN_WINDOW bytes
+    while end - start > SCAN_WINDOW:
+        mid = (start + end) // 2
+        found = buf.count(b"\n", start, mid)
+        if found >= n:
+            end = mid
+        else:
+            n -= found
+            start = mid
+    pos = start - 1
+    for _ in range(n):
+        pos = buf.find(b"\n", pos + 1, end)
+    return pos
+
+
+def _past_newlines(buf, start, end, n):
+    """(offset just past the n-th newline in buf[start:end], 0), or (end, newlines still missing)
+
+    The window counted grows from a small one, so the cost follows the
+    distance covered rather than the size of the range.
+    """
+    window = 1024
+    while n and start < end:
+        stop = min(start + window, end)
+        found = buf.count(b"\n", start, stop)
+        if found >= n:
+            return find_nth_newline(buf, start, stop, n) + 1, 0
+        n -= found
+        start = stop
+        window = min(window * 2, 1024 * 1024)
+    return start, n
+
+
+def skip_lines(data, start, count, window_size=PLAN_WINDOW):
+    """Offset just past the count-th newline at or after start (len(data) if there are fewer)"""
+    size = len(data)
+    pos = start
+    while count and pos < size:
+        window = data[pos:pos + window_size]
+        found = window.count(b"\n")
+        if found >= count:
+            return pos + find_nth_newline(window, 0, len(window), count) + 1
+        count -= found
+        pos += len(window)
+    return pos
+
+
+def plan_by_size(mm, max_size_bytes):
+    """Part ranges of at most max_size_bytes, found by jumping ahead and snapping back to a newline"""
+    size = len(mm)
+    plan = []
+    start = 0
+    while start < size:
+        if size - start <= max_size_bytes:
+            end = size
+        else:
+            end = mm.rfind(b"\n", start, start + max_size_bytes) + 1
+            if not end:
+                # A single line larger than a part gets a part of its own
+                end = mm.find(b"\n", start + max_size_bytes) + 1 or size
+        plan.append(PartRange(len(plan) + 1, start, end, None))
+        start = end
+    return plan
+
+
+def plan_by_lines(mm, lines_per_file, window_size=PLAN_WINDOW, line_index=None):
+    """Part ranges of lines_per_file lines, found by counting newlines over large windows
+
+    With a line_index for this file, each boundary is looked up instead: seek
+    to the nearest recorded offset and skip at most one stride of lines.
+    """
+    size = len(mm)
+    if line_index is not None and line_index.size == size:
+        return _plan_by_lines_indexed(mm, lines_per_file, line_index)
+
+    plan = []
+    part_start = 0
+    remaining = lines_per_file
+
+    for window_start in range(0, size, window_size):
+        window = mm[window_start:window_start + window_size]
+        n = len(window)
+        pos = 0
+        while pos < n:
+            pos, missing = _past_newlines(window, pos, n, remaining)
+            if missing:
+                remaining = missing
+                break
+            plan.append(PartRange(len(plan) + 1, part_start, window_start + pos,
+                                  lines_per_file))
+            part_start = window_start + pos
+            remaining = lines_per_file
+
+    if part_start < size:
+        lines = lines_per_file - remaining
+        # A final line without a trailing newline still counts
+        if mm[size - 1] != 0x0A:
+            lines += 1
+        plan.append(PartRange(len(plan) + 1, part_start, size, lines))
+    return plan
+
+
+def _plan_by_lines_indexed(mm, lines_per_file, line_index):
+    plan = []
+    start = 0
+    for first_line in range(0, line_index.line_count, lines_per_file):
+        last_line = min(first_line + lines_per_file, line_index.line_count)
+        end = line_index.line_offset(mm, last_line)
+        plan.append(PartRange(len(plan) + 1, start, end, last_line - first_line))
+        start = end
+    return plan
+
+
+def partition_key(field=0, delimiter=",", pattern=None):
+    """Function returning the key bytes of a line (given without its newline)
+
+    The key is the 0-based field of a delimiter-separated line, or, if
+    pattern is given, the first capture group of the regex (the whole match
+    if it has none). Lines without the field or a match get an empty key.
+    """
+    if pattern is not None:
+        try:
+            regex = re.compile(pattern.encode("utf-8") if isinstance(pattern, str) else pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid key regex: {e}")
+        group = 1 if regex.groups else 0
+
+        def key_of(line):
+            match = regex.search(line)
+            return (match.group(group) or b"") if match else b""
+        return key_of
+
+    if isinstance(delimiter, str):
+        delimiter = delimiter.encode("utf-8")
+    if not delimiter:
+        raise ValueError("The key delimiter can't be empty")
+
+    def key_of(line):
+        fields = line.split(delimiter, field + 1)
+        # The last field of a CRLF line would otherwise carry the \r
+        return fields[field].rstrip(b"\r") if field < len(fields) else b""
+    return key_of
+
+
+def key_router(key_of, buckets):
+    """Function returning the bucket of a line: the CRC32 of its key modulo buckets
+
+    CRC32 is stable across runs and machines, unlike hash().
+    """
+    crc32 = zlib.crc32
+
+    def route(line):
+        return crc32(key_of(line)) % buckets
+    return route
+
+
+def _fmix32(h):
+    """MurmurHash3's finalizer: makes every bit of a 32-bit hash depend on every other"""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+def ratio_router(ratios, seed=0, by_number=False):
+    """Function sending each line to one of len(ratios) buckets in proportion to ratios
+
+    The bucket is a CRC32 of the line, started from a value derived from
+    seed and then mixed (CRC32 alone is linear, so a new seed wouldn't
+    change the split of lines of equal length), mapped onto the ratios'
+    shares of the 32-bit range; with by_number the line's 0-based number
+    is hashed instead of its bytes. So the same seed always gives the same
+    split, and each line's bucket is known without looking at any other
+    line. Equal lines share a bucket unless by_number is given.
+    """
+    ratios = list(ratios)
+    if len(ratios) < 2:
+        raise ValueError("Give at least two ratios")
+    if any(ratio <= 0 for ratio in ratios):
+        raise ValueError("Ratios must be positive")
+    total = sum(ratios)
+    bounds = []
+    running = 0
+    for ratio in ratios[:-1]:
+        running += ratio
+        bounds.append(int(running / total * 2 ** 32))
+    salt = zlib.crc32(str(seed).encode("ascii"))
+    crc32 = zlib.crc32
+
+    if by_number:
+        numbers = itertools.count()
+
+        def route(line):
+            return bisect_right(bounds, _fmix32(crc32(next(numbers).to_bytes(8, "little"), salt)))
+        return route
+
+    def route(line):
+        return bisect_right(bounds, _fmix32(crc32(line, salt)))
+    return route
+
+
+def plan_by_count(infile, size, parts, workers=PROBE_WORKERS):
+    """Exactly parts ranges of about size / parts bytes, without reading the file through
+
+    Each boundary is probed independently: read a little at k * size / parts
+    and snap forward to the next line start. Probes run on workers threads,
+    however many copy the parts: each is a short positional read, which
+    releases the GIL. Lines longer than a part merge
+    neighbouring boundaries, so such files get fewer parts.
+    """
+    if hasattr(os, "pread"):
+        def read_at(offset, length):
+            return os.pread(infile.fileno(), length, offset)
+    else:
+        lock = threading.Lock()
+
+        def read_at(offset, length):
+            with lock:
+                infile.seek(offset)
+                return infile.read(length)
+
+    def snap(target):
+        # First line start at or after target: just past the first newline from target - 1
+        pos = target - 1
+        while pos < size:
+            block = read_at(pos, SCAN_WINDOW)
+            if not block:
+                break
+            found = block.find(b"\n")
+            if found >= 0:
+                return pos + found + 1
+            pos += len(block)
+        return size
+
+    targets = [size * k // parts for k in range(1, parts) if size * k // parts > 0]
+    if workers > 1 and len(targets) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+            ends = list(pool.map(snap, targets))
+    else:
+        ends = [snap(target) for target in targets]
+
+    plan = []
+    start = 0
+    for end in ends + [size]:
+        if end > start:
+            plan.append(PartRange(len(plan) + 1, start, end, None))
+            start = end
+    return plan
+
+
+def _check_method(**limits):
+    given = [limit for limit in limits.values() if limit is not None]
+    if len(given) != 1:
+        raise ValueError(f"Give exactly one of {', '.join(limits)}")
+    if isinstance(given[0], int) and given[0] < 1:
+        raise ValueError("The split limit must be at least 1")
+
+
+def _line_filter(include, exclude, ignore_case, quoted, by_lines=True):
+    """LineFilter for the include/exclude patterns of a split, or None without any"""
+    if not include and not exclude:
+        return None
+    if quoted:
+        raise ValueError("Filters work on lines, so they can't be combined with quoted records")
+    if not by_lines:
+        raise ValueError("Splitting into equal parts or time windows can't be combined "
+                         "with a filter")
+    return LineFilter(include, exclude, ignore_case)
+
+
+def _line_format(head, encoding="auto", lone_cr=False, repeat_bom=True, chunk_size=CHUNK_SIZE,
+                 quoted=False, line_filter=None, by_lines_or_size=True):
+    """LineFormat of an input starting with head; ValueError if the split can't follow it"""
+    line_format = LineFormat(encoding, lone_cr, repeat_bom).detect(head)
+    if line_format.plain:
+        return line_format
+    if not by_lines_or_size:
+        raise ValueError("UTF-16 input and lone CR line ends apply to splitting by lines or size")
+    if quoted or line_filter is not None:
+        raise ValueError("UTF-16 input and lone CR line ends can't be combined with quoted "
+                         "records or filters")
+    if chunk_size % line_format.unit:
+        raise ValueError("UTF-16 input is read in chunks of an even number of bytes")
+    return line_format
+
+
+def _ratio_limit(ratios, seed, by_number):
+    """How a split by ratio is described in manifests and statistics"""
+    return {"ratios": list(ratios), "seed": seed, "hash": "number" if by_number else "line"}
+
+
+def _check_records(header_lines, quoted, by_lines_or_size):
+    if header_lines < 0:
+        raise ValueError("header_lines can't be negative")
+    if (header_lines or quoted) and not by_lines_or_size:
+        raise ValueError("Header lines and quoted records apply to splitting by lines or size")
+
+
+class RangeCopier:
+    """Copies byte ranges of a mapped input into output files, in the kernel where possible"""
+
+    # Errors meaning "this syscall can't do this pair of files", not a real I/O failure
+    _UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF, errno.ENOTSOCK,
+                    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+                    getattr(errno, "ENOTSUP", errno.EINVAL)}
+
+    def __init__(self, src_fd, view):
+        self.src_fd = src_fd
+        self.view = view
+        self.use_copy_file_range = hasattr(os, "copy_file_range")
+        # Elsewhere (e.g. macOS) sendfile only writes to sockets
+        self.use_sendfile = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+    def copy(self, dst_fd, offset, length):
+        """Append length bytes of the input starting at offset to dst_fd"""
+        while length:
+            n = self._copy_once(dst_fd, offset, length)
+            if not n:
+                # Every method hit the end of the input: it shrank under the mapping
+                raise OSError(errno.EIO, "Input truncated during copy")
+            offset += n
+            length -= n
+
+    def _copy_once(self, dst_fd, offset, length):
+        if self.use_copy_file_range:
+            try:
+                n = os.copy_file_range(self.src_fd, dst_fd, length, offset)
+                if n:
+                    return n
+            except OSError as e:
+                if e.errno not in self._UNSUPPORTED:
+                    raise
+            self.use_copy_file_range = False
+
+        if self.use_sendfile:
+            try:
+                n = os.sendfile(dst_fd, self.src_fd, offset, length)
+                if n:
+                    return n
+            except OSError as e:
+                if e.errno not in self._UNSUPPORTED:
+                    raise
+            self.use_sendfile = False
+
+        # Portable fallback: write straight out of the mapped pages
+        return os.write(dst_fd, self.view[offset:offset + length])
+
+
+class SplitProgress:
+    """Latest state of a running split, written by the engine and sampled by front ends
+
+    The copy loops only assign a few attributes once per chunk or slice;
+    front ends poll at their own rate (see ProgressTicker) and always see
+    the newest state, however fast or slow the lines are.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, total_bytes=None):
+        # total_bytes is None when the input size is unknown (pipes)
+        self.total_bytes = total_bytes
+        self.bytes_done = 0
+        self.lines = 0
+        self.files = 0
+        self.finished = False
+        self.started = time.perf_counter()
+
+    def update(self, bytes_done, lines, files):
+        self.bytes_done = bytes_done
+        self.lines = lines
+        self.files = files
+
+    @property
+    def percent(self):
+        """0-100, held below 100 until the split finishes; None if the size is unknown"""
+        if self.finished:
+            return 100.0
+        if not self.total_bytes:
+            return None
+        return min(99.9, (self.bytes_done / self.total_bytes) * 100)
+
+    @property
+    def rate(self):
+        """Bytes per second since the split started"""
+        elapsed = time.perf_counter() - self.started
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+
+class SplitTimings:
+    """Where a split spends its time, for finding out why one is slow
+
+    Pass one to SplitEngine(timings=...) to have the engine record, per
+    phase, the seconds, bytes and calls spent on it, plus every part's
+    duration from open to commit. Phases run on several threads when the
+    input is streamed in a pipeline or parts are copied by workers, so
+    their sum may exceed the elapsed time. scan is the time the splitting
+    thread spends on a chunk outside the other phases.
+    """
+
+    PHASES = ("read", "scan", "filter", "open", "write", "checksum", "compress", "close",
+              "progress")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.bytes = dict.fromkeys(self.PHASES, 0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.parts = []           # {"part", "bytes", "lines", "seconds"} per committed part
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def add(self, phase, seconds, nbytes=0):
+        with self._lock:
+            self.seconds[phase] += seconds
+            self.bytes[phase] += nbytes
+            self.calls[phase] += 1
+        self._local.busy = self.busy() + seconds
+
+    def busy(self):
+        """Seconds this thread has spent in recorded phases"""
+        return getattr(self._local, "busy", 0.0)
+
+    def timed(self, phase, fn, *args, nbytes=0):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.add(phase, time.perf_counter() - started, nbytes)
+
+    def part_done(self, number, nbytes, lines, seconds):
+        with self._lock:
+            self.parts.append({"part": number, "bytes": nbytes, "lines": lines,
+                               "seconds": round(seconds, 6)})
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def to_dict(self):
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        with self._lock:
+            phases = {phase: {"seconds": round(self.seconds[phase], 6),
+                              "bytes": self.bytes[phase],
+                              "calls": self.calls[phase]}
+                      for phase in self.PHASES if self.calls[phase]}
+            parts = sorted(self.parts, key=lambda part: part["part"])
+        return {"elapsed_seconds": round(elapsed, 6), "phases": phases, "parts": parts}
+
+    def summary(self):
+        """A few lines of text: time, share and rate of each phase, and the slowest part"""
+        stats = self.to_dict()
+        elapsed = stats["elapsed_seconds"] or 1e-9
+        lines = []
+        for phase, s in stats["phases"].items():
+            line = f"{phase:<9}{s['seconds']:9.3f}s {s['seconds'] / elapsed:6.1%}"
+            if s["bytes"] and s["seconds"]:
+                line += f" {s['bytes'] / (1024 * 1024) / s['seconds']:10,.1f} MB/s"
+            lines.append(line)
+        if stats["parts"]:
+            slowest = max(stats["parts"], key=lambda part: part["seconds"])
+            lines.append(f"{len(stats['parts'])} parts, slowest #{slowest['part']} "
+                         f"{slowest['seconds']:.3f}s")
+        return "\n".join(lines)
+
+
+class ProgressTicker:
+    """Calls callback(progress) every interval seconds on a background thread
+
+    Use as a context manager around a split; the callback also runs once
+    more on exit so the final state is always shown.
+    """
+
+    def __init__(self, progress, callback, interval=0.2):
+        self.progress = progress
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.callback(self.progress)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.callback(self.progress)
+
+
+class SplitResult:
+    """Summary of a finished or cancelled split"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.files = 0
+        self.lines = 0
+        self.bytes = 0
+        self.cancelled = False
+        self.resumed = 0          # Parts kept from an interrupted earlier run
+        self.parts = []           # Entry of every finished part (see _OpenPart.commit)
+        self.manifest = None      # Path of the manifest, if one was written
+        self.matched = None       # Lines kept and left out by a filter, if there was one
+        self.dropped = None
+
+    def to_dict(self):
+        return {
+            "output_dir": str(self.output_dir),
+            "files": self.files,
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "cancelled": self.cancelled,
+            "resumed": self.resumed,
+            "manifest": None if self.manifest is None else str(self.manifest),
+            "matched": self.matched,
+            "dropped": self.dropped,
+        }
+
+
+class _QuoteScanner:
+    """Hides newlines inside double-quoted CSV fields from the record-boundary scans
+
+    scan() returns the chunk itself when no quoted field in it spans a
+    line, so the usual case stays on the bulk count/find path; otherwise a
+    copy with those newlines blanked out. Doubled quotes ("") inside a
+    field toggle the state twice and need no special handling.
+    """
+
+    def __init__(self):
+        self.in_quote = False
+
+    def scan(self, buf, n):
+        masked = None
+        in_quote = self.in_quote
+        pos = 0
+        while True:
+            quote = buf.find(b'"', pos, n)
+            if in_quote:
+                end = n if quote < 0 else quote
+                if buf.find(b"\n", pos, end) >= 0:
+                    if masked is None:
+                        masked = bytearray(buf[:n])
+                    masked[pos:end] = masked[pos:end].replace(b"\n", b" ")
+            if quote < 0:
+                break
+            in_quote = not in_quote
+            pos = quote + 1
+        self.in_quote = in_quote
+        return buf if masked is None else masked
+
+
+class _OpenPart:
+    """One output part being written under a temporary name until it is complete
+
+    checksums is None, "crc32" or "sha256" (CRC32 and SHA-256), for the
+    journal and manifest; without either nothing is checksummed. buffering
+    is the file's write buffer size. With drop_cache, the part is synced
+    when it is committed and its pages dropped from the page cache.
+    """
+
+    def __init__(self, path, number, start, first_line, header_bytes=0, checksums=None,
+                 timings=None, buffering=-1, drop_cache=False):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.number = number
+        self.start = start            # Input offset of its first data byte
+        self.end = None
+        self.first_line = first_line
+        self.lines = None
+        self.header_bytes = header_bytes  # Length of the repeated header it starts with
+        self.checksummed = checksums is not None
+        self.crc = 0                  # Checksums of the bytes written to the file
+        self.digest = hashlib.sha256() if checksums == "sha256" else None
+        self.size = 0
+        self.file = None
+        self.timings = timings        # SplitTimings, if the split is being timed
+        self.buffering = buffering
+        self.drop_cache = drop_cache
+        self.opened = None
+
+    def open(self, size=None):
+        """Create the temporary file; size, if known, is preallocated"""
+        self.opened = time.perf_counter()
+        self.file = open(self.tmp_path, "wb", buffering=self.buffering)
+        if size:
+            preallocate(self.file.fileno(), size)
+        if self.timings is not None:
+            self.timings.add("open", time.perf_counter() - self.opened)
+        return self
+
+    def suspend(self):
+        """Close the temporary file to free its descriptor; the next write reopens it"""
+        self.file.close()
+        self.file = None
+
+    def _reopen(self):
+        started = time.perf_counter()
+        self.file = open(self.tmp_path, "ab", buffering=self.buffering)
+        if self.timings is not None:
+            self.timings.add("open", time.perf_counter() - started)
+
+    def write(self, data):
+        if self.file is None:
+            self._reopen()
+        if self.timings is None:
+            self.file.write(data)
+        else:
+            self.timings.timed("write", self.file.write, data, nbytes=len(data))
+        if not self.checksummed:
+            self.size += len(data)
+        elif self.timings is None:
+            self.update(data)
+        else:
+            self.timings.timed("checksum", self.update, data, nbytes=len(data))
+
+    def update(self, data):
+        """Account for data written to self.file directly"""
+        self.crc = zlib.crc32(data, self.crc)
+        if self.digest is not None:
+            self.digest.update(data)
+        self.size += len(data)
+
+    def commit(self):
+        """Move the finished part into place; returns its journal/manifest entry"""
+        if self.timings is None:
+            self._close()
+        else:
+            self.timings.timed("close", self._close)
+            self.timings.part_done(self.number, self.size, self.lines,
+                                   time.perf_counter() - self.opened)
+        entry = {"part": self.number, "name": self.path.name, "start": self.start,
+                 "end": self.end, "lines": self.lines, "bytes": self.size,
+                 "header_bytes": self.header_bytes,
+                 "crc32": self.crc if self.checksummed else None}
+        if self.digest is not None:
+            entry["sha256"] = self.digest.hexdigest()
+        return entry
+
+    def _close(self):
+        if self.file is None:
+            self._reopen()
+        if self.drop_cache and hasattr(os, "posix_fadvise"):
+            # Dirty pages can't be dropped, so write them out first
+            self.file.flush()
+            os.fdatasync(self.file.fileno())
+            _advise(self.file.fileno(), 0, 0, "DONTNEED")
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+        try:
+            self.tmp_path.unlink()
+        except OSError:
+            pass
+
+
+class _WriteBehind:
+    """Background thread running file operations in submission order
+
+    The queue is bounded, so a producer that gets ahead of the disk blocks
+    instead of buffering without limit. After an operation fails the rest
+    are skipped, except those submitted with always=True (buffer returns
+    that other threads wait for), and the error is raised to the producer
+    on its next submit or on close.
+    """
+
+    def __init__(self, depth=WRITE_QUEUE):
+        self.queue = queue.Queue(depth)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            fn, args, always = item
+            if self.error is None or always:
+                try:
+                    fn(*args)
+                except BaseException as e:
+                    self.error = self.error or e
+
+    def submit(self, fn, *args, always=False):
+        if self.error is not None and not always:
+            raise self.error
+        self.queue.put((fn, args, always))
+
+    def close(self):
+        """Wait for every submitted operation; re-raises the first failure"""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class _PartWriter:
+    """Opens numbered output parts lazily and appends raw byte ranges to them
+
+    Parts are written to a temporary name and renamed when they are closed,
+    so a part under its real name is always complete; on_part receives the
+    entry of each one (see _OpenPart.commit). first_number and input_offset
+    let a resumed split carry on numbering and offsets.
+
+    With write_behind, opening, writing, checksumming and committing parts
+    happen on a _WriteBehind thread while the caller scans on; the caller
+    hands chunk buffers back through release() so they are only reused once
+    written. buffering and drop_cache are passed on to every _OpenPart.
+    """
+
+    def __init__(self, output_dir, base_name, file_ext, report, on_part=None,
+                 first_number=0, input_offset=0, checksums=None, write_behind=False,
+                 timings=None, buffering=-1, drop_cache=False):
+        self.output_dir = Path(output_dir)
+        self.base_name = base_name
+        self.file_ext = file_ext
+        self.report = report
+        self.on_part = on_part or (lambda entry: None)
+        self.checksums = checksums
+        self.file_number = first_number
+        self.input_offset = input_offset
+        self.part_bytes = 0
+        self.total_bytes = 0
+        self.lines = 0
+        self.current = None
+        # Repeated at the top of every part; counted in part_bytes from the start
+        self.header = b""
+        self.io = _WriteBehind() if write_behind else None
+        self.timings = timings
+        self.unfinished = {}      # Part number -> opened but not yet committed part
+        self.labels = {}          # Part number -> label naming it (see part_filename)
+        self.buffering = buffering
+        self.drop_cache = drop_cache
+
+    def _do(self, fn, *args):
+        if self.io is None:
+            fn(*args)
+        else:
+            self.io.submit(fn, *args)
+
+    def release(self, fn):
+        """Call fn once everything written so far is on its way to disk"""
+        if self.io is None:
+            fn()
+        else:
+            self.io.submit(fn, always=True)
+
+    def set_header(self, header):
+        self.header = header
+        if self.current is None:
+            self.part_bytes = len(header)
+
+    def _open_part(self):
+        self.file_number += 1
+        output_filename = self.output_dir / part_filename(
+            self.base_name, self.file_number, self.file_ext, self.labels.get(self.file_number))
+        self.current = _OpenPart(output_filename, self.file_number, self.input_offset,
+                                 self.lines, len(self.header), self.checksums, self.timings,
+                                 self.buffering, self.drop_cache)
+        self.unfinished[self.file_number] = self.current
+        self._do(self.current.open)
+        self.part_bytes = 0
+        self.report(("status", f"Creating: {output_filename}"))
+
+    def write(self, data):
+        if self.current is None:
+            self._open_part()
+            if self.header:
+                self._emit(self.header)
+        self._emit(data)
+        self.input_offset += len(data)
+
+    def _emit(self, data):
+        self._do(self.current.write, data)
+        self.part_bytes += len(data)
+        self.total_bytes += len(data)
+
+    def _end_part(self):
+        part = self.current
+        part.end = self.input_offset
+        part.lines = self.lines - part.first_line
+        self.current = None
+        return part
+
+    def close_part(self):
+        if self.current is not None:
+            self._do(self._commit, self._end_part())
+        self.part_bytes = len(self.header)
+
+    def _commit(self, part):
+        entry = part.commit()
+        del self.unfinished[part.number]
+        self.on_part(entry)
+
+    def close(self):
+        try:
+            self.close_part()
+            if self.io is not None:
+                self.io.close()
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Stop without committing the unfinished part (cancel or error)"""
+        self.current = None
+        if self.io is not None:
+            # Parts queued as complete still get committed
+            try:
+                self.io.close()
+            except BaseException:
+                pass
+        for part in self.unfinished.values():
+            part.discard()
+        self.unfinished.clear()
+
+
+class _CompressingPartWriter(_PartWriter):
+    """Part writer that compresses blocks on a thread pool and writes them back in order
+
+    Byte and size accounting (part_bytes, total_bytes) stays in uncompressed
+    bytes, so size limits apply to the data, not to the compressed file.
+    """
+
+    def __init__(self, output_dir, base_name, file_ext, report, codec, level, threads,
+                 on_part=None, first_number=0, input_offset=0, checksums=None,
+                 timings=None, buffering=-1, drop_cache=False):
+        super().__init__(output_dir, base_name, file_ext + codec.suffix, report,
+                         on_part, first_number, input_offset, checksums, timings=timings,
+                         buffering=buffering, drop_cache=drop_cache)
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.codec = codec
+        self.level = level
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        # Enough blocks in flight to keep every thread busy, few enough to bound memory
+        self.max_pending = 2 * threads
+        self.block = bytearray()
+        # (future, part) in write order; a None future means "part is complete"
+        self.pending = deque()
+
+    def _emit(self, data):
+        self.block += data
+        self.part_bytes += len(data)
+        self.total_bytes += len(data)
+        if len(self.block) >= COMPRESS_BLOCK:
+            self._submit_block()
+
+    def _submit_block(self):
+        if self.block:
+            future = self.pool.submit(self.codec.compress, self.block, self.level)
+            self.pending.append((future, self.current))
+            self.block = bytearray()
+        self._drain(self.max_pending)
+
+    def _drain(self, keep, skip=None):
+        while len(self.pending) > keep:
+            future, part = self.pending.popleft()
+            if part is skip:
+                continue
+            if future is None:
+                self._commit(part)
+            elif self.timings is None:
+                part.write(future.result())
+            else:
+                # Time spent waiting for the pool, i.e. compression not hidden by scanning
+                part.write(self.timings.timed("compress", future.result))
+
+    def close_part(self):
+        if self.current is not None:
+            self._submit_block()
+            self.pending.append((None, self._end_part()))
+        self.part_bytes = len(self.header)
+
+    def close(self):
+        try:
+            self.close_part()
+            self._drain(0)
+        finally:
+            # Only non-empty after an error: don't leak the open parts
+            for _, part in self.pending:
+                part.discard()
+            self.pool.shutdown()
+
+    def abort(self):
+        aborted = self.current
+        self.current = None
+        self.block = bytearray()
+        try:
+            # Parts completed before the unfinished one are still committed
+            self._drain(0, skip=aborted)
+        finally:
+            for _, part in self.pending:
+                part.discard()
+            if aborted is not None:
+                aborted.discard()
+            self.pool.shutdown()
+
+
+class _BucketWriter:
+    """Buffers lines per bucket and writes each bucket's buffer to its part in one call
+
+    Buckets are numbered parts opened on their first flush, so a bucket that
+    gets no lines leaves no file. At most BUCKET_FILES of them are open at a
+    time: the least recently written one is closed and reopened for
+    appending when it is next flushed. With a codec, every flushed buffer
+    is compressed as its own block; the blocks concatenate to one stream.
+    """
+
+    def __init__(self, output_dir, base_name, file_ext, report, buckets,
+                 codec=None, level=None, on_part=None, checksums=None, timings=None,
+                 buffering=-1, drop_cache=False):
+        self.output_dir = Path(output_dir)
+        self.base_name = base_name
+        self.file_ext = file_ext + (codec.suffix if codec is not None else "")
+        self.report = report
+        self.codec = codec
+        self.level = level
+        self.on_part = on_part or (lambda entry: None)
+        self.checksums = checksums
+        self.timings = timings
+        self.buffering = buffering
+        self.drop_cache = drop_cache
+        self.buckets = buckets
+        self.files = [None] * buckets
+        self.open_files = OrderedDict()  # Buckets whose part is open, least recent first
+        self.part_lines = [0] * buckets
+        self.pending = [[] for _ in range(buckets)]
+        self.pending_bytes = [0] * buckets
+        # A bucket is flushed at its share of BUCKET_MEMORY, but no less than
+        # 64 KB so writes stay large; with that many buckets the total is
+        # bounded by flushing all of them once it reaches BUCKET_MEMORY
+        self.flush_at = max(64 * 1024, BUCKET_MEMORY // buckets)
+        self.tail = None
+        self.file_number = 0
+        self.total_bytes = 0
+        self.lines = 0
+
+    def add(self, lines, route):
+        """Send newline-terminated lines (given without their newlines) to route's buckets"""
+        pending = self.pending
+        pending_bytes = self.pending_bytes
+        flush_at = self.flush_at
+        for line in lines:
+            bucket = route(line)
+            pending[bucket].append(line)
+            pending_bytes[bucket] += len(line) + 1
+            if pending_bytes[bucket] >= flush_at:
+                self._flush(bucket)
+        self.lines += len(lines)
+        if sum(pending_bytes) >= BUCKET_MEMORY:
+            for bucket in range(self.buckets):
+                self._flush(bucket)
+
+    def add_last(self, line, route):
+        """The input's final line when it has no trailing newline; written as is"""
+        self.tail = (route(line), line)
+        self.lines += 1
+
+    def release(self, fn):
+        fn()  # Lines are copied out of the chunk as they are routed
+
+    def _write(self, bucket, data):
+        outfile = self.files[bucket]
+        if outfile is None:
+            output_filename = self.output_dir / part_filename(
+                self.base_name, bucket + 1, self.file_ext)
+            # Lines come from all over the input, so a bucket has no byte range
+            outfile = self.files[bucket] = _OpenPart(output_filename, bucket + 1, None, 0,
+                                                     checksums=self.checksums,
+                                                     timings=self.timings,
+                                                     buffering=self.buffering,
+                                                     drop_cache=self.drop_cache).open()
+            self.file_number += 1
+            self.report(("status", f"Creating: {output_filename}"))
+        self.open_files[bucket] = True
+        self.open_files.move_to_end(bucket)
+        if len(self.open_files) > BUCKET_FILES:
+            self.files[self.open_files.popitem(last=False)[0]].suspend()
+        self.total_bytes += len(data)
+        if self.codec is None:
+            pass
+        elif self.timings is None:
+            data = self.codec.compress(data, self.level)
+        else:
+            data = self.timings.timed("compress", self.codec.compress, data, self.level,
+                                      nbytes=len(data))
+        outfile.write(data)
+
+    def _flush(self, bucket):
+        lines = self.pending[bucket]
+        if lines:
+            self.part_lines[bucket] += len(lines)
+            lines.append(b"")
+            self._write(bucket, b"\n".join(lines))
+            self.pending[bucket] = []
+            self.pending_bytes[bucket] = 0
+
+    def close(self):
+        try:
+            for bucket in range(self.buckets):
+                self._flush(bucket)
+            if self.tail is not None:
+                self.part_lines[self.tail[0]] += 1
+                self._write(*self.tail)
+                self.tail = None
+        except BaseException:
+            for part in self.files:
+                if part is not None:
+                    part.discard()
+            raise
+        for part in self.files:
+            if part is not None:
+                part.lines = self.part_lines[part.number - 1]
+                self.on_part(part.commit())
+
+
+class _Reservoir:
+    """Uniform random sample of count lines taken in one pass (Li's Algorithm L)
+
+    Once the sample is full, the number of lines to pass over before the
+    next one that enters it is drawn directly, so the lines in between are
+    only counted, never copied. Only the sampled lines are held in memory.
+    """
+
+    def __init__(self, count, seed=0):
+        self.count = count
+        self.rng = random.Random(seed)
+        self.sample = []        # (line number, line without its newline)
+        self.lines = 0          # Lines offered so far
+        self.weight = 1.0
+        self.next = count - 1   # Number of the next line to take once the sample is full
+        self.last = None        # Number of a final line that had no newline
+
+    def _draw(self):
+        random_ = self.rng.random
+        # 1 - random() is never 0, so the logs are always defined
+        self.weight *= math.exp(math.log(1.0 - random_()) / self.count)
+        gap = 0
+        if self.weight < 1.0:
+            gap = math.floor(math.log(1.0 - random_()) / math.log1p(-self.weight))
+        self.next += gap + 1
+
+    def offer(self, buf, start, end):
+        """Offer the lines of buf[start:end]; it has to end with a newline"""
+        need = self.count - len(self.sample)
+        if need and start < end:
+            total = buf.count(b"\n", start, end)
+            cut = end if total <= need else find_nth_newline(buf, start, end, need) + 1
+            lines = bytes(buf[start:cut - 1]).split(b"\n")
+            self.sample.extend(zip(range(self.lines, self.lines + len(lines)), lines))
+            self.lines += len(lines)
+            start = cut
+            if len(self.sample) < self.count:
+                return
+            self._draw()
+
+        while start < end:
+            line_start, missing = _past_newlines(buf, start, end, self.next - self.lines)
+            if missing or line_start == end:
+                # The next line to take is in a later block
+                self.lines = self.next - missing
+                return
+            line_end = buf.find(b"\n", line_start, end)
+            line = bytes(buf[line_start:line_end])
+            self.sample[self.rng.randrange(self.count)] = (self.next, line)
+            self.lines = self.next + 1
+            start = line_end + 1
+            self._draw()
+
+    def offer_last(self, line):
+        """The input's final line when it has no trailing newline"""
+        self.last = self.lines
+        self.offer(line + b"\n", 0, len(line) + 1)
+
+    def data(self):
+        """The sampled lines in input order, as they are to be written"""
+        self.sample.sort()
+        if not self.sample:
+            return b""
+        lines = [line for _, line in self.sample]
+        if self.sample[-1][0] != self.last:
+            lines.append(b"")
+        return b"\n".join(lines)
+
+
+class _SampleWriter:
+    """Writes a sample to output_file through a .tmp file renamed once it is complete"""
+
+    def __init__(self, output_file):
+        self.path = Path(output_file)
+        self.tmp = self.path.with_name(self.path.name + ".tmp")
+        self.file = None
+        self.file_number = 1
+        self.lines = 0          # Lines read, for progress
+        self.sampled = 0
+        self.total_bytes = 0
+
+    def open(self):
+        self.file = open(self.tmp, "wb")
+        return self
+
+    def release(self, fn):
+        fn()  # Lines are copied out of the chunk as they are sampled
+
+    def write(self, data, lines):
+        self.file.write(data)
+        self.total_bytes += len(data)
+        self.sampled += lines
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.tmp, self.path)
+
+    def discard(self):
+        self.file.close()
+        try:
+            self.tmp.unlink()
+        except OSError:
+            pass
+
+
+class SplitEngine:
+    """Splits files on raw bytes, copying input to output without transcoding"""
+
+    def __init__(self, report=None, is_cancelled=None, progress=None, chunk_size=CHUNK_SIZE,
+                 strategy="auto", workers=1, use_index=True, compress=None,
+                 compress_level=None, resume=False, manifest=None, pipeline=True,
+                 timings=None, write_buffer=WRITE_BUFFER, preallocate=True,
+                 drop_cache=False):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if chunk_size < 1 or write_buffer < 1:
+            raise ValueError("Buffer sizes must be at least 1 byte")
+        if manifest is not None and manifest not in CHECKSUMS:
+            raise ValueError(f"Unknown checksum: {manifest}")
+        # report receives ("status", text) messages; counters go to progress
+        self.report = report or (lambda msg: None)
+        # Record time per phase and per part (see SplitTimings); None costs nothing
+        self.timings = timings
+        if timings is not None:
+            report = self.report
+            self.report = lambda msg: timings.timed("progress", report, msg)
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.progress = progress or SplitProgress()
+        self.chunk_size = chunk_size
+        self.strategy = strategy
+        # Parallel part writing needs known boundaries, so it only applies to
+        # the mmap strategy; the stream path always writes sequentially
+        self.workers = workers
+        # Reuse (or build and cache) a line-offset index when splitting by lines
+        self.use_index = use_index
+        # Compress every part with this codec (see splitter_codecs), block by
+        # block across all cores unless workers caps it
+        self.compress = get_codec(compress) if compress else None
+        self.compress_level = compress_level
+        # Journal finished parts of file splits (see splitter_journal) and
+        # pick up after the last verified part of an interrupted run
+        self.resume = resume
+        # Write a manifest of the parts next to them (see splitter_manifest),
+        # with CRC32s, plus SHA-256s if this is "sha256"
+        self.manifest = manifest
+        # Stream with a reader thread filling a pool of reused chunk buffers
+        # and a writer thread doing the part file I/O, so reads, scans and
+        # writes overlap; False does all three on the calling thread
+        self.pipeline = pipeline
+        # Write buffer of each streamed part file; whole chunk ranges larger
+        # than it go straight to the file without being copied into it
+        self.write_buffer = write_buffer
+        # Reserve the blocks of each mapped part, whose size is known, before
+        # copying it, so the filesystem can lay it out in one extent
+        self.preallocate = preallocate
+        # Read and write around the page cache: input pages are dropped once
+        # read and every part is synced and dropped once written, so a huge
+        # split doesn't push everything else out of memory
+        self.drop_cache = drop_cache
+
+    def split_file(self, input_file, output_dir=None, lines_per_file=None,
+                   max_size_bytes=None, line_index=None, buckets=None, key_field=0,
+                   key_delimiter=",", key_pattern=None, parts=None, header_lines=0,
+                   quoted=False, include=None, exclude=None, ignore_case=False,
+                   ratios=None, seed=0, by_number=False, window=None, time_field=None,
+                   time_delimiter=",", time_pattern=None, time_format=None,
+                   name_by_window=False, encoding="auto", lone_cr=False, repeat_bom=True):
+        """Split input_file by line count, size, key, part count, ratio or time into output_dir
+
+        output_dir is created if needed. line_index (see splitter_index) lets
+        split-by-lines look its boundaries up instead of counting through the
+        whole file. buckets hash-partitions lines by key instead (see
+        split_by_key), parts cuts the file into that many equal parts, and
+        ratios (e.g. (80, 10, 10)) deals lines into one part per ratio by a
+        seeded hash (see split_by_ratio). window (e.g. "1h") cuts a
+        time-sorted file into one part per time window (see split_by_time).
+
+        For CSV/TSV splits by lines or size, header_lines repeats the first
+        records at the top of every part, and quoted keeps records whose
+        double-quoted fields contain newlines in one piece (lines_per_file
+        then counts records).
+
+        include and exclude (regexes, see LineFilter) split only the lines
+        matching an include pattern and no exclude pattern; the header
+        lines are kept whatever they hold.
+
+        encoding, lone_cr and repeat_bom say where lines end and what
+        happens to a BOM (see LineFormat); still no byte is decoded. UTF-16
+        input and lone CR line ends work with splitting by lines or size;
+        splits by key and ratio leave a BOM on the line it starts.
+        """
+        _check_method(lines_per_file=lines_per_file, max_size_bytes=max_size_bytes,
+                      buckets=buckets, parts=parts, ratios=ratios, window=window)
+        _check_records(header_lines, quoted,
+                       lines_per_file is not None or max_size_bytes is not None)
+        line_filter = _line_filter(include, exclude, ignore_case, quoted,
+                                   parts is None and window is None)
+
+        input_path = Path(input_file)
+        input_path.stat()  # Fail on a missing input before creating anything
+        line_format = _line_format(read_head(input_path), encoding, lone_cr, repeat_bom,
+                                   self.chunk_size, quoted, line_filter,
+                                   lines_per_file is not None or max_size_bytes is not None)
+        if buckets is not None:
+            partition_key(key_field, key_delimiter, key_pattern)  # Same for a bad key spec
+        if ratios is not None:
+            ratio_router(ratios)  # And for bad ratios
+        if parts is not None and detect_codec(input_path) is not None:
+            raise ValueError("Splitting into equal parts needs an uncompressed input; "
+                             "split by size or lines instead")
+        if window is not None:
+            import splitter_time
+
+            # Same for a bad window or timestamp spec
+            splitter_time.TimeWindow(window)
+            splitter_time.timestamp_key(time_field, time_delimiter, time_pattern, time_format)
+            if detect_codec(input_path) is not None:
+                raise ValueError("Splitting by time searches the input, so it needs an "
+                                 "uncompressed file")
+
+        if output_dir is None or str(output_dir).strip() == "":
+            output_dir = default_output_dir(input_path)
+        output_dir = Path(output_dir)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.report(("status", f"Output directory: {output_dir}"))
+
+        # data.txt.gz is split into data_part_0001.txt like data.txt would be
+        base_name, file_ext = split_name(input_path)
+        if parts is not None:
+            return self.split_into_parts(input_path, parts, output_dir, base_name, file_ext,
+                                         line_format)
+        if window is not None:
+            return self.split_by_time(input_path, window, output_dir, base_name, file_ext,
+                                      time_field, time_delimiter, time_pattern, time_format,
+                                      name_by_window, line_format)
+        if buckets is not None:
+            return self.split_by_key(input_path, buckets, output_dir, base_name, file_ext,
+                                     key_field, key_delimiter, key_pattern, line_filter)
+        if ratios is not None:
+            return self.split_by_ratio(input_path, ratios, output_dir, base_name, file_ext,
+                                       seed, by_number, line_filter)
+        if lines_per_file is not None:
+            return self.split_by_lines(input_path, lines_per_file, output_dir,
+                                       base_name, file_ext, line_index=line_index,
+                                       header_lines=header_lines, quoted=quoted,
+                                       line_filter=line_filter, line_format=line_format)
+        return self.split_by_size(input_path, max_size_bytes, output_dir,
+                                  base_name, file_ext, header_lines, quoted, line_filter,
+                                  line_format)
+
+    def split_stream(self, infile, output_dir, base_name, file_ext,
+                     lines_per_file=None, max_size_bytes=None, buckets=None,
+                     key_field=0, key_delimiter=",", key_pattern=None, header_lines=0,
+                     quoted=False, include=None, exclude=None, ignore_case=False,
+                     ratios=None, seed=0, by_number=False, encoding="auto", lone_cr=False,
+                     repeat_bom=True):
+        """Split a binary stream of unknown size (stdin, a pipe) on the fly
+
+        progress.total_bytes stays None, so front ends show bytes and rate
+        (progress.rate) instead of a percentage. The data never needs to land
+        on disk first. A BOM is looked for in what infile.peek() has
+        buffered; without peek, only an encoding given is known.
+        """
+        _check_method(lines_per_file=lines_per_file, max_size_bytes=max_size_bytes,
+                      buckets=buckets, ratios=ratios)
+        _check_records(header_lines, quoted, buckets is None and ratios is None)
+        line_filter = _line_filter(include, exclude, ignore_case, quoted)
+        head = infile.peek(4)[:4] if hasattr(infile, "peek") else b""
+        line_format = _line_format(head, encoding, lone_cr, repeat_bom, self.chunk_size,
+                                   quoted, line_filter, buckets is None and ratios is None)
+        if ratios is not None:
+            route = ratio_router(ratios, seed, by_number)
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.report(("status", f"Output directory: {output_dir}"))
+
+        result = SplitResult(output_dir)
+        self.progress.reset()
+        if buckets is not None:
+            route = key_router(partition_key(key_field, key_delimiter, key_pattern), buckets)
+            self._run_keyed(route, buckets, infile, output_dir, base_name, file_ext,
+                            result, line_filter=line_filter)
+        elif ratios is not None:
+            self._run_keyed(route, len(ratios), infile, output_dir, base_name, file_ext,
+                            result, line_filter=line_filter)
+        elif lines_per_file is not None:
+            self._run(self._copy_lines, lines_per_file, infile, None,
+                      output_dir, base_name, file_ext, result,
+                      header_lines=header_lines, quoted=quoted, line_filter=line_filter,
+                      line_format=line_format)
+        else:
+            self._run(self._copy_sized, max_size_bytes, infile, None,
+                      output_dir, base_name, file_ext, result,
+                      header_lines=header_lines, quoted=quoted, line_filter=line_filter,
+                      line_format=line_format)
+        self._finish(result)
+        if buckets is not None:
+            method, limit = "key", buckets
+        elif ratios is not None:
+            method, limit = "ratio", _ratio_limit(ratios, seed, by_number)
+        elif lines_per_file is not None:
+            method, limit = "lines", lines_per_file
+        else:
+            method, limit = "size", max_size_bytes
+        if buckets is not None or ratios is not None:
+            line_format = None    # A BOM is just data to these, as in split_file
+        self._write_manifest(result, None, method, limit, base_name, file_ext, header_lines,
+                             line_filter, line_format)
+        return result
+
+    def split_by_lines(self, input_file, lines_per_file, output_dir,
+                       base_name, file_ext, line_index=None, header_lines=0, quoted=False,
+                       line_filter=None, line_format=None):
+        indexer = None
+        bom = line_format.header if line_format is not None else b""
+        # Offsets into compressed data can't be seeked to, so don't index
+        # those; records with quoted newlines aren't lines the index counts,
+        # nor are UTF-16 or lone CR ones, and a filter counts only the lines
+        # it keeps
+        if (quoted or header_lines or line_filter is not None
+                or (line_format is not None and not line_format.plain)):
+            line_index = None
+        elif line_index is None and self.use_index and detect_codec(input_file) is None:
+            # Imported here: splitter_index builds on the scan helpers above
+            import splitter_index
+            line_index = splitter_index.load_line_index(input_file)
+            if line_index is None:
+                # First pass over this file: record line offsets on the way so
+                # later re-splits and extracts can seek instead of rescanning
+                indexer = splitter_index.LineIndexBuilder(os.stat(input_file).st_mtime_ns)
+
+        def planner(mm, limit):
+            index = line_index
+            if indexer is not None:
+                self.report(("status", "Indexing lines..."))
+                for start in range(0, len(mm), PLAN_WINDOW):
+                    window = mm[start:start + PLAN_WINDOW]
+                    indexer.feed(window, len(window))
+                index = indexer.finish()
+            return plan_by_lines(mm, limit, line_index=index)
+
+        def copier(chunks, limit, writer, scanner=None):
+            nonlocal indexer
+            if indexer is not None:
+                if bom:
+                    # The stream past the BOM doesn't start at offset 0 as the index does
+                    indexer = None
+                else:
+                    chunks = indexer.tap(chunks)
+            self._copy_lines(chunks, limit, writer, scanner)
+
+        result = self._split(planner, copier, "lines", lines_per_file,
+                             input_file, output_dir, base_name, file_ext,
+                             header_lines, quoted, line_filter, line_format)
+        # A resumed stream pass didn't see the whole file
+        if indexer is not None and not result.cancelled and not result.resumed:
+            splitter_index.save_line_index(indexer.finish(), input_file)
+        return result
+
+    def extract_lines(self, input_file, start_line, end_line, output_file,
+                      line_index=None):
+        """Copy 0-based lines [start_line, end_line) of input_file to output_file
+
+        With a line index (loaded from cache, or built once and cached) this
+        is a seek plus one bulk range copy.
+        """
+        import splitter_index
+
+        if detect_codec(input_file) is not None:
+            raise ValueError("Extracting lines needs an uncompressed input file")
+
+        result = SplitResult(Path(output_file).parent)
+        result.files = 1
+        result.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(input_file, "rb") as infile, open(output_file, "wb") as outfile:
+            st = os.fstat(infile.fileno())
+            if st.st_size == 0:
+                result.lines = 0
+                return result
+
+            if line_index is not None and line_index.size != st.st_size:
+                line_index = None
+            if line_index is None and self.use_index:
+                line_index = splitter_index.load_line_index(input_file)
+
+            mm = self._map(infile)
+            with mm, memoryview(mm) as view:
+                if line_index is None:
+                    self.report(("status", "Indexing lines..."))
+                    line_index = splitter_index.index_mapped(mm, st.st_mtime_ns)
+                    if self.use_index:
+                        splitter_index.save_line_index(line_index, input_file)
+
+                end_line = min(end_line, line_index.line_count)
+                start_line = min(start_line, end_line)
+                start = line_index.line_offset(mm, start_line)
+                end = line_index.line_offset(mm, end_line)
+                self.progress.reset(end - start)
+
+                copier = RangeCopier(infile.fileno(), view)
+                for offset in range(start, end, COPY_SLICE):
+                    if self.is_cancelled():
+                        break
+                    length = min(COPY_SLICE, end - offset)
+                    copier.copy(outfile.fileno(), offset, length)
+                    result.bytes += length
+                    self.progress.update(result.bytes, None, 1)
+
+        result.lines = end_line - start_line
+        result.cancelled = self.is_cancelled()
+        if not result.cancelled:
+            self.progress.update(result.bytes, result.lines, 1)
+            self.progress.finished = True
+            self.report(("status", f"Extracted {result.lines:,} lines to {output_file}"))
+        return result
+
+    def sample_lines(self, input_file, output_file, count=None, fraction=None, seed=0,
+                     by_number=False, include=None, exclude=None, ignore_case=False):
+        """Copy a reproducible random sample of input_file's lines to output_file
+
+        count takes exactly that many lines (all of them if there are fewer),
+        chosen uniformly by reservoir sampling with only the sample held in
+        memory. fraction instead keeps each line with that probability,
+        decided by ratio_router's hash of the line (or of its number with
+        by_number), and writes as it goes. Either way it is one pass over the
+        input, sampled lines keep their input order, and the same seed gives
+        the same sample. include and exclude filter the lines sampled from.
+        """
+        if (count is None) == (fraction is None):
+            raise ValueError("Give exactly one of count, fraction")
+        if count is not None and count < 1:
+            raise ValueError("The sample size must be at least 1")
+        if fraction is not None and not 0 < fraction < 1:
+            raise ValueError("The sample fraction must be between 0 and 1")
+        line_filter = _line_filter(include, exclude, ignore_case, False)
+
+        input_path = Path(input_file)
+        size = input_path.stat().st_size
+        _line_format(read_head(input_path), by_lines_or_size=False)
+        writer = _SampleWriter(output_file)
+        result = SplitResult(writer.path.parent)
+        result.output_dir.mkdir(parents=True, exist_ok=True)
+        self.progress.reset(size)
+
+        with InputFile(input_path) as source:
+            if source.codec is not None:
+                self.report(("status", f"Decompressing {source.codec.name} input..."))
+            writer.open()
+            try:
+                chunks = self._read_chunks(source.stream, writer, size, source.raw.tell,
+                                           source_fd=source.raw.fileno())
+                if line_filter is not None:
+                    chunks = self._filter_chunks(chunks, line_filter)
+                if count is not None:
+                    reservoir = _Reservoir(count, seed)
+                    self._copy_reservoir(chunks, reservoir, writer)
+                    writer.write(reservoir.data(), len(reservoir.sample))
+                else:
+                    route = ratio_router([fraction, 1 - fraction], seed, by_number)
+                    self._copy_sampled(chunks, route, writer)
+                if self.is_cancelled():
+                    writer.discard()
+                else:
+                    writer.commit()
+            except BaseException:
+                writer.discard()
+                raise
+
+        result.files = 1
+        result.lines = writer.sampled
+        result.bytes = writer.total_bytes
+        self._filtered(result, line_filter)
+        result.cancelled = self.is_cancelled()
+        if not result.cancelled:
+            self.progress.update(size, writer.lines, 1)
+            self.progress.finished = True
+            self.report(("status", f"Sampled {writer.sampled:,} of {writer.lines:,} lines "
+                                   f"to {writer.path}"))
+        return result
+
+    def split_by_size(self, input_file, max_size_bytes, output_dir,
+                      base_name, file_ext, header_lines=0, quoted=False, line_filter=None,
+                      line_format=None):
+        bom = line_format.header if line_format is not None else b""
+
+        def planner(mm, limit):
+            # Parts after the first get the BOM on top of their range
+            return plan_by_size(mm, max(limit - len(bom), 1))
+
+        return self._split(planner, self._copy_sized, "size", max_size_bytes,
+                           input_file, output_dir, base_name, file_ext,
+                           header_lines, quoted, line_filter, line_format)
+
+    def split_into_parts(self, input_file, parts, output_dir, base_name, file_ext,
+                         line_format=None):
+        """Cut the file into parts pieces of about equal size, never splitting a line
+
+        The boundaries are probed up front (see plan_by_count), so both the
+        mmap and the stream path copy along the same plan.
+        """
+        with open(input_file, "rb", buffering=0) as infile:
+            plan = plan_by_count(infile, os.fstat(infile.fileno()).st_size, parts)
+
+        def copier(chunks, limit, writer, scanner=None):
+            self._copy_planned(chunks, plan, writer)
+
+        return self._split(lambda mm, limit: plan, copier, "parts", parts,
+                           input_file, output_dir, base_name, file_ext,
+                           line_format=line_format)
+
+    def split_by_time(self, input_file, window, output_dir, base_name, file_ext,
+                      time_field=None, time_delimiter=",", time_pattern=None, time_format=None,
+                      name_by_window=False, line_format=None):
+        """Cut a time-sorted file into one part per time window, e.g. "1h" or "1d"
+
+        See timestamp_key (splitter_time) for how timestamps are read from
+        lines. Every window boundary is found by binary search over byte
+        offsets, parsing O(log n) lines instead of every line, and the parts
+        are then copied as whole ranges like any other planned split. Parts
+        are numbered, or named after their window with name_by_window
+        (e.g. access_2024-05-01T13.log). Windows without lines get no part.
+        """
+        import splitter_time
+
+        stamp_of = splitter_time.timestamp_key(time_field, time_delimiter, time_pattern,
+                                               time_format)
+        time_window = splitter_time.TimeWindow(window)
+        self.report(("status", f"Finding the {time_window.spec} windows..."))
+        with open(input_file, "rb") as infile:
+            size = os.fstat(infile.fileno()).st_size
+            plan = []
+            if size:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    plan = splitter_time.plan_by_time(mm, stamp_of, time_window,
+                                                      labels=name_by_window)
+        labels = {part.number: part.label for part in plan}
+
+        def copier(chunks, limit, writer, scanner=None):
+            writer.labels = labels
+            self._copy_planned(chunks, plan, writer)
+
+        limit = {"window": time_window.spec, "field": time_field, "delimiter": time_delimiter,
+                 "pattern": time_pattern, "format": time_format, "names": name_by_window}
+        return self._split(lambda mm, limit: plan, copier, "time", limit,
+                           input_file, output_dir, base_name, file_ext,
+                           line_format=line_format)
+
+    def split_by_key(self, input_file, buckets, output_dir, base_name, file_ext,
+                     key_field=0, key_delimiter=",", key_pattern=None, line_filter=None):
+        """Hash-partition lines into parts 1..buckets so equal keys share a part
+
+        See partition_key for how keys are taken from lines. Lines keep their
+        input order within each part. Every line has to be looked at, so this
+        always streams the input whatever the strategy.
+        """
+        route = key_router(partition_key(key_field, key_delimiter, key_pattern), buckets)
+        return self._split_routed(route, buckets, "key", buckets, input_file, output_dir,
+                                  base_name, file_ext, line_filter)
+
+    def split_by_ratio(self, input_file, ratios, output_dir, base_name, file_ext,
+                       seed=0, by_number=False, line_filter=None):
+        """Deal lines into parts 1..len(ratios) in proportion to ratios, e.g. (80, 10, 10)
+
+        See ratio_router for how lines are assigned: the same seed gives the
+        same parts on every run. As with split_by_key, lines keep their input
+        order within each part and the input is always streamed.
+        """
+        route = ratio_router(ratios, seed, by_number)
+        return self._split_routed(route, len(ratios), "ratio",
+                                  _ratio_limit(ratios, seed, by_number), input_file,
+                                  output_dir, base_name, file_ext, line_filter)
+
+    def _split_routed(self, route, buckets, method, limit, input_file, output_dir,
+                      base_name, file_ext, line_filter=None):
+        result = SplitResult(output_dir)
+        self.progress.reset(Path(input_file).stat().st_size)
+
+        with InputFile(input_file) as source:
+            if source.codec is not None:
+                self.report(("status", f"Decompressing {source.codec.name} input..."))
+            self._run_keyed(route, buckets, source.stream, output_dir, base_name,
+                            file_ext, result, position=source.raw.tell,
+                            line_filter=line_filter, source_fd=source.raw.fileno())
+        self._finish(result)
+        self._write_manifest(result, input_file, method, limit, base_name, file_ext,
+                             line_filter=line_filter)
+        return result
+
+    def _split(self, planner, copier, method, limit, input_file, output_dir,
+               base_name, file_ext, header_lines=0, quoted=False, line_filter=None,
+               line_format=None):
+        journal = None
+        if self.resume and line_filter is not None:
+            # Parts of a filtered split don't map back onto input offsets to resume from
+            raise ValueError("Filtered splits can't be resumed")
+        if self.resume:
+            journal = self._open_journal(method, limit, input_file, output_dir,
+                                         base_name, file_ext, header_lines, quoted,
+                                         line_format)
+        try:
+            result = self._split_file(planner, copier, limit, input_file, output_dir,
+                                      base_name, file_ext, header_lines, quoted, journal,
+                                      line_filter, line_format)
+        finally:
+            if journal is not None:
+                journal.close()
+        if journal is not None and not result.cancelled:
+            journal.finish()
+        self._write_manifest(result, input_file, method, limit, base_name, file_ext,
+                             header_lines, line_filter, line_format)
+        return result
+
+    def _write_manifest(self, result, input_file, method, limit, base_name, file_ext,
+                        header_lines=0, line_filter=None, line_format=None):
+        """Write the manifest of a completed split; a stale one is removed either way"""
+        path = manifest_path(result.output_dir, base_name, file_ext)
+        if self.manifest is None or result.cancelled:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return
+        write_manifest(path, {
+            "version": MANIFEST_VERSION,
+            "input": None if input_file is None else Path(input_file).name,
+            "input_bytes": None if input_file is None else Path(input_file).stat().st_size,
+            "base_name": base_name,
+            "file_ext": file_ext,
+            "method": method,
+            "limit": limit,
+            "header_lines": header_lines,
+            "filter": None if line_filter is None else line_filter.to_dict(),
+            "line_format": None if line_format is None else line_format.to_dict(),
+            "compress": None if self.compress is None else self.compress.name,
+            "checksums": list(CHECKSUMS[:CHECKSUMS.index(self.manifest) + 1]),
+            "files": result.files,
+            "lines": result.lines,
+            "bytes": result.bytes,
+            "parts": [part_record(entry)
+                      for entry in sorted(result.parts, key=lambda entry: entry["part"])],
+        })
+        result.manifest = path
+        self.report(("status", f"Manifest: {path}"))
+
+    def _checksums(self, journal):
+        """What new parts are checksummed with: the journal needs CRC32s, the manifest its own"""
+        return self.manifest or ("crc32" if journal is not None else None)
+
+    @staticmethod
+    def _recorder(result, journal, lock=None):
+        """on_part callback keeping each part's entry for the manifest and journal"""
+        lock = lock or threading.Lock()
+
+        def on_part(entry):
+            with lock:
+                result.parts.append(entry)
+                if journal is not None:
+                    journal.record(entry)
+        return on_part
+
+    def _open_journal(self, method, limit, input_file, output_dir, base_name, file_ext,
+                      header_lines, quoted, line_format=None):
+        from splitter_journal import JOURNAL_VERSION, SplitJournal
+
+        # Everything that decides where parts start and what they contain
+        st = Path(input_file).stat()
+        job = {
+            "version": JOURNAL_VERSION,
+            "input": str(Path(input_file).resolve()),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "method": method,
+            "limit": limit,
+            "header_lines": header_lines,
+            "quoted": quoted,
+            "line_format": line_format.to_dict() if line_format is not None else None,
+            "compress": self.compress.name if self.compress is not None else None,
+            "compress_level": self.compress_level,
+            "manifest": self.manifest,
+        }
+        journal = SplitJournal.open(output_dir, base_name, file_ext, job)
+        if journal.parts:
+            self.report(("status", f"Found {len(journal.parts)} verified parts "
+                                   f"from an interrupted run"))
+        return journal
+
+    def _split_file(self, planner, copier, limit, input_file, output_dir,
+                    base_name, file_ext, header_lines, quoted, journal, line_filter=None,
+                    line_format=None):
+        result = SplitResult(output_dir)
+        self.progress.reset(Path(input_file).stat().st_size)
+        bom = line_format.header if line_format is not None else b""
+
+        # Compressed data has to pass through the stream path in either
+        # direction, and so do parts that get a header, need quote tracking
+        # or UTF-16 or lone CR line ends, or hold only some of the lines
+        streamed = (detect_codec(input_file) is not None or self.compress is not None
+                    or header_lines or quoted or line_filter is not None
+                    or (line_format is not None and not line_format.plain))
+        if streamed and self.strategy == "mmap":
+            raise ValueError("The mmap strategy can't handle compressed data, header lines, "
+                             "quoted records, filters, UTF-16 or lone CR line ends")
+
+        # An empty file can't be mapped; the stream path handles it trivially
+        if not streamed and self.strategy != "stream" and Path(input_file).stat().st_size > 0:
+            with open(input_file, "rb") as infile:
+                mm = self._map(infile)
+                if mm is not None:
+                    with mm, memoryview(mm) as view:
+                        self.report(("status", "Scanning part boundaries..."))
+                        if self.timings is None:
+                            plan = planner(mm, limit)
+                        else:
+                            plan = self.timings.timed("scan", planner, mm, limit)
+                        if bom and plan:
+                            # Part 1 gets the BOM like the others, so its range starts after it
+                            plan[0] = plan[0]._replace(start=max(plan[0].start, len(bom)))
+                        self._write_plan(plan, RangeCopier(infile.fileno(), view),
+                                         output_dir, base_name, file_ext,
+                                         len(mm), result, journal, bom)
+                    return self._finish(result)
+
+        with InputFile(input_file) as source:
+            if source.codec is not None:
+                self.report(("status", f"Decompressing {source.codec.name} input..."))
+            # Progress follows the bytes consumed from disk, compressed or not
+            self._run(copier, limit, source.stream, source.size, output_dir,
+                      base_name, file_ext, result, position=source.raw.tell,
+                      header_lines=header_lines, quoted=quoted, journal=journal,
+                      line_filter=line_filter, source_fd=source.raw.fileno(),
+                      line_format=line_format)
+        return self._finish(result)
+
+    def _map(self, infile):
+        try:
+            return mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, OverflowError, ValueError):
+            # e.g. a file too large for a 32-bit address space
+            if self.strategy == "mmap":
+                raise
+            return None
+
+    def _finish(self, result):
+        if self.timings is not None:
+            self.timings.finish()
+        result.cancelled = self.is_cancelled()
+        if not result.cancelled:
+            self.progress.update(result.bytes, result.lines, result.files)
+            self.progress.finished = True
+            self.report(("status", f"Created {result.files} files in {result.output_dir}"))
+        return result
+
+    def _write_plan(self, plan, copier, output_dir, base_name, file_ext,
+                    file_size, result, journal=None, header=b""):
+        """Copy each planned part as one contiguous range, fanning parts out to workers
+
+        Every part starts with header (the input's BOM), if given, ahead of
+        its range. With a journal, parts it holds for the same range are
+        kept. With a journal or manifest, each new part is checksummed from
+        the map as it is copied. Every part's size is known, so it is
+        preallocated; with one worker and large parts (or drop_cache, whose
+        sync makes every commit slow) the next part is opened, and the last
+        one committed, on a helper thread while a part is copied.
+        """
+        counted = all(part.lines is not None for part in plan)
+        result.lines = 0 if counted else None
+        lock = threading.Lock()
+        on_part = self._recorder(result, journal, lock)
+        checksums = self._checksums(journal)
+        timings = self.timings
+        if self.workers == 1:
+            _advise(copier.src_fd, 0, 0, "SEQUENTIAL")
+
+        def copied(length, part=None):
+            # Called from worker threads after each slice and once per finished part
+            with lock:
+                result.bytes += length
+                if part is not None:
+                    result.files += 1
+                    if counted:
+                        result.lines += part.lines
+                self.progress.update(result.bytes, result.lines, result.files)
+
+        def new_part(part):
+            """The unopened _OpenPart for part; None if the journal already holds it"""
+            output_filename = Path(output_dir) / part_filename(base_name, part.number,
+                                                              file_ext, part.label)
+            done = journal.parts.get(part.number) if journal is not None else None
+            if (done is not None and done["name"] == output_filename.name
+                    and (done["start"], done["end"]) == (part.start, part.end)):
+                with lock:
+                    result.resumed += 1
+                    result.parts.append(done)
+                copied(part.end - part.start + len(header), part)
+                return None
+            # Only the descriptor is used, so the file needs no buffer
+            return _OpenPart(output_filename, part.number, part.start, 0, len(header),
+                             checksums=checksums, timings=timings, buffering=0,
+                             drop_cache=self.drop_cache)
+
+        def open_part(out, part):
+            out.open(part.end - part.start + len(header) if self.preallocate else None)
+
+        def copy_part(part, out):
+            """Copy part into the open out; False if cancelled, which discards it"""
+            self.report(("status", f"Creating: {out.path}"))
+            try:
+                if header:
+                    out.write(header)
+                    copied(len(header))
+                for offset in range(part.start, part.end, COPY_SLICE):
+                    if self.is_cancelled():
+                        out.discard()
+                        return False
+                    length = min(COPY_SLICE, part.end - offset)
+                    if timings is None:
+                        copier.copy(out.file.fileno(), offset, length)
+                    else:
+                        timings.timed("write", copier.copy, out.file.fileno(), offset, length,
+                                      nbytes=length)
+                    if checksums is None:
+                        out.size += length
+                    elif timings is None:
+                        out.update(copier.view[offset:offset + length])
+                    else:
+                        timings.timed("checksum", out.update, copier.view[offset:offset + length],
+                                      nbytes=length)
+                    if offset + length < part.end:
+                        copied(length)
+                    else:
+                        copied(length, part)
+            except BaseException:
+                out.discard()
+                raise
+            out.end = part.end
+            out.lines = part.lines
+            if self.drop_cache:
+                _advise(copier.src_fd, part.start, part.end - part.start, "DONTNEED")
+            return True
+
+        def write_part(part):
+            if self.is_cancelled():
+                return
+            out = new_part(part)
+            if out is None:
+                return
+            open_part(out, part)
+            if copy_part(part, out):
+                on_part(out.commit())
+
+        if self.workers == 1:
+            # Small parts copy faster than a hand-off between threads takes
+            if len(plan) > 1 and (self.drop_cache or file_size >= AHEAD_PART * len(plan)):
+                self._write_ahead(plan, new_part, open_part, copy_part, on_part)
+            else:
+                for part in plan:
+                    write_part(part)
+            return
+
+        # Imported here: concurrent.futures pulls in logging, which would
+        # roughly double the import time of the engine for every caller
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Each part is an independent (offset, length) copy on its own output
+        # descriptor, and the copy syscalls release the GIL, so threads suffice
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for future in [pool.submit(write_part, part) for part in plan]:
+                future.result()
+
+    def _write_ahead(self, plan, new_part, open_part, copy_part, on_part):
+        """Copy the parts of plan in order while a _WriteBehind thread opens and commits them
+
+        The next part's file is created while the current one is copied and
+        each finished one is closed and renamed after it, so with many small
+        parts the copy loop doesn't wait on open, close and rename. Parts
+        opened but not committed are discarded if the split stops early.
+        """
+        io = _WriteBehind()
+        unfinished = {}     # Part number -> part opened (or being opened) but not committed
+
+        def open_ahead(out, part, ready):
+            try:
+                open_part(out, part)
+            finally:
+                ready.set()
+
+        def commit(out):
+            on_part(out.commit())
+            del unfinished[out.number]
+
+        def next_part(parts):
+            for part in parts:
+                out = new_part(part)
+                if out is not None:
+                    ready = threading.Event()
+                    unfinished[part.number] = out
+                    # always: whoever waits on ready must be woken even after a failure
+                    io.submit(open_ahead, out, part, ready, always=True)
+                    return part, out, ready
+            return None
+
+        parts = iter(plan)
+        completed = False
+        try:
+            ahead = None if self.is_cancelled() else next_part(parts)
+            while ahead is not None:
+                part, out, ready = ahead
+                ahead = None if self.is_cancelled() else next_part(parts)
+                ready.wait()
+                if io.error is not None:
+                    raise io.error
+                if not copy_part(part, out):
+                    break
+                io.submit(commit, out)
+            completed = True
+        finally:
+            try:
+                io.close()
+            except BaseException:
+                if completed:
+                    raise
+            finally:
+                for out in unfinished.values():
+                    out.discard()
+
+    def _run(self, copier, limit, infile, file_size, output_dir, base_name,
+             file_ext, result, position=None, header_lines=0, quoted=False, journal=None,
+             line_filter=None, source_fd=None, line_format=None):
+        """Stream the input through a reused chunk buffer; file_size is None if unknown
+
+        With a journal, the verified parts at its start are kept and the
+        input is read on from where the last of them ended.
+        """
+        resumed = []
+        if journal is not None:
+            done, _ = journal.resume_point()
+            resumed = [journal.parts[number] for number in range(1, done + 1)]
+        result.parts.extend(resumed)
+        on_part = self._recorder(result, journal)
+        checksums = self._checksums(journal)
+        first_number = len(resumed)
+        input_offset = resumed[-1]["end"] if resumed else 0
+
+        if self.compress is not None:
+            threads = self.workers if self.workers > 1 else (os.cpu_count() or 1)
+            writer = _CompressingPartWriter(output_dir, base_name, file_ext, self.report,
+                                            self.compress, self.compress_level, threads,
+                                            on_part, first_number, input_offset, checksums,
+                                            timings=self.timings, buffering=self.write_buffer,
+                                            drop_cache=self.drop_cache)
+        else:
+            writer = _PartWriter(output_dir, base_name, file_ext, self.report,
+                                 on_part, first_number, input_offset, checksums,
+                                 write_behind=self._pipelined(file_size),
+                                 timings=self.timings, buffering=self.write_buffer,
+                                 drop_cache=self.drop_cache)
+
+        bom = line_format.header if line_format is not None else b""
+
+        def new_scanner():
+            if quoted:
+                return _QuoteScanner()
+            return line_format.scanner() if line_format is not None else None
+
+        completed = False
+        try:
+            skip = input_offset
+            if resumed:
+                self.report(("status", f"Resuming after part {first_number}..."))
+                if header_lines or bom:
+                    # Part 1's data starts right after the header
+                    header = bytearray(resumed[0]["start"])
+                    with memoryview(header) as view:
+                        self._fill(infile, view)
+                    writer.set_header(bytes(header))
+                    skip -= len(header)
+                infile.seek(skip, os.SEEK_CUR)
+
+            chunks = self._read_chunks(infile, writer, file_size, position, input_offset,
+                                       source_fd)
+            if line_format is not None:
+                chunks = line_format.hold_cr(chunks)
+            if (header_lines or bom) and not resumed:
+                chunks = self._take_header(chunks, header_lines, writer, new_scanner(), bom)
+            if line_filter is not None:
+                chunks = self._filter_chunks(chunks, line_filter)
+            copier(chunks, limit, writer, new_scanner())
+            # A header-only input still gives one part holding the header
+            if writer.header and not writer.file_number and not self.is_cancelled():
+                writer.write(b"")
+            completed = not self.is_cancelled()
+        finally:
+            # An unfinished part is dropped rather than left looking complete
+            if completed:
+                writer.close()
+            else:
+                writer.abort()
+
+        result.files = writer.file_number
+        result.resumed = first_number
+        lines = [entry["lines"] for entry in resumed]
+        result.lines = None if None in lines else writer.lines + sum(lines)
+        result.bytes = writer.total_bytes + sum(entry["end"] - entry["start"] + entry["header_bytes"]
+                                                for entry in resumed)
+        self._filtered(result, line_filter)
+
+    def _run_keyed(self, route, buckets, infile, output_dir, base_name, file_ext,
+                   result, position=None, line_filter=None, source_fd=None):
+        writer = _BucketWriter(output_dir, base_name, file_ext, self.report, buckets,
+                               self.compress, self.compress_level,
+                               self._recorder(result, None), self.manifest, self.timings,
+                               self.write_buffer, self.drop_cache)
+        try:
+            chunks = self._read_chunks(infile, writer, None, position, source_fd=source_fd)
+            if line_filter is not None:
+                chunks = self._filter_chunks(chunks, line_filter)
+            self._copy_keyed(chunks, route, writer)
+        finally:
+            writer.close()
+
+        result.files = writer.file_number
+        result.lines = writer.lines
+        result.bytes = writer.total_bytes
+        self._filtered(result, line_filter)
+
+    def _filtered(self, result, line_filter):
+        if line_filter is None:
+            return
+        result.matched = line_filter.matched
+        result.dropped = line_filter.dropped
+        self.report(("status", f"Filter kept {line_filter.matched:,} lines, "
+                               f"dropped {line_filter.dropped:,}"))
+
+    def _take_header(self, chunks, header_lines, writer, scanner=None, bom=b""):
+        """Pass chunks through after moving bom and header_lines records into writer.header"""
+        header = bytearray()
+        remaining = header_lines
+        taking = True
+
+        for buf, n in chunks:
+            if not taking:
+                yield buf, n
+                continue
+            start = 0
+            if len(header) < len(bom):
+                start = min(len(bom) - len(header), n)
+                header += buf[:start]
+            cut = start
+            if remaining:
+                scan = buf if scanner is None else scanner.scan(buf, n)
+                cut, remaining = _past_newlines(scan, start, n, remaining)
+            header += buf[start:cut]
+            if remaining or len(header) < len(bom):
+                continue
+            taking = False
+            writer.set_header(bytes(header))
+            writer.input_offset += len(header)
+            # A record boundary, so the copier's scanner starts outside quotes
+            if cut < n:
+                rest = buf[cut:n]
+                yield rest, len(rest)
+
+        if taking and header:
+            # The input ended inside the header
+            writer.set_header(bytes(header))
+            writer.input_offset += len(header)
+
+    def _filter_chunks(self, chunks, line_filter):
+        """Pass on only the lines line_filter keeps, each chunk's worth as a new buffer"""
+        # Bytes of a line that started in an earlier chunk and is not finished yet
+        carry = bytearray()
+        timings = self.timings
+
+        def keep(out, buf, start, end):
+            if timings is None:
+                spans = line_filter.spans(buf, start, end)
+            else:
+                spans = timings.timed("filter", line_filter.spans, buf, start, end,
+                                      nbytes=end - start)
+            with memoryview(buf) as view:
+                for s, e in spans:
+                    out += view[s:e]
+
+        for buf, n in chunks:
+            last_newline = buf.rfind(b"\n", 0, n)
+            if last_newline < 0:
+                carry += buf[:n]
+                continue
+            # A fresh buffer each time: the writer may still hold views of the last one
+            out = bytearray()
+            start = 0
+            if carry:
+                start = buf.find(b"\n", 0, n) + 1
+                carry += buf[:start]
+                keep(out, carry, 0, len(carry))
+                carry = bytearray()
+            keep(out, buf, start, last_newline + 1)
+            carry += buf[last_newline + 1:n]
+            if out:
+                yield out, len(out)
+
+        if carry:
+            out = bytearray()
+            keep(out, carry, 0, len(carry))
+            if out:
+                yield out, len(out)
+
+    def _read_chunks(self, infile, writer, file_size, position=None, skipped=0,
+                     source_fd=None):
+        """Yield (buffer, length) pairs; buffers are reused between chunks
+
+        A buffer is only valid until the next chunk is asked for. position,
+        if given, returns how far through file_size the reader is (for
+        compressed input, bytes read from disk rather than decompressed);
+        otherwise it is counted from skipped, the bytes already passed over.
+        source_fd is the descriptor of the file on disk, if there is one,
+        for read-ahead hints and, with drop_cache, dropping pages once read.
+        """
+        if source_fd is not None:
+            _advise(source_fd, 0, 0, "SEQUENTIAL")
+        drop_behind = self.drop_cache and source_fd is not None and position is not None
+        if self._pipelined(file_size):
+            reads = self._read_ahead(infile, writer)
+        else:
+            reads = self._read_inline(infile)
+        bytes_read = skipped
+        timings = self.timings
+
+        for buf, n in reads:
+            if self.is_cancelled():
+                break
+            bytes_read += n
+            if timings is None:
+                yield buf, n
+            else:
+                started, busy = time.perf_counter(), timings.busy()
+                yield buf, n
+                # Whatever the consumer did with the chunk besides timed I/O
+                timings.add("scan", time.perf_counter() - started - (timings.busy() - busy), n)
+
+            done = position() if position is not None else bytes_read
+            if drop_behind:
+                # Every byte before the reader's position is already in a chunk buffer
+                _advise(source_fd, 0, done, "DONTNEED")
+            if timings is None:
+                self.progress.update(done, writer.lines, writer.file_number)
+            else:
+                timings.timed("progress", self.progress.update, done, writer.lines,
+                              writer.file_number)
+
+    def _pipelined(self, file_size):
+        # An input that fits in one chunk has nothing to overlap
+        return self.pipeline and (file_size is None or file_size > self.chunk_size)
+
+    def _read_inline(self, infile):
+        buf = bytearray(self.chunk_size)
+        with memoryview(buf) as view:
+            while True:
+                n = self._timed_fill(infile, view)
+                if not n:
+                    return
+                yield buf, n
+
+    def _read_ahead(self, infile, writer):
+        """Chunks filled by a reader thread from a pool of PIPELINE_BUFFERS buffers
+
+        Once the consumer moves on, its buffer goes back to the pool through
+        writer.release, i.e. only after the writes taken from it are done.
+        """
+        free = queue.Queue()
+        filled = queue.Queue()  # Never holds more than the pool
+        stop = threading.Event()
+
+        def reader():
+            created = 0
+            try:
+                while True:
+                    # Buffers are allocated as needed, so a small input gets one
+                    try:
+                        buf = free.get_nowait()
+                    except queue.Empty:
+                        if created < PIPELINE_BUFFERS:
+                            buf = bytearray(self.chunk_size)
+                            created += 1
+                        else:
+                            buf = free.get()
+                    if buf is None or stop.is_set():
+                        return
+                    with memoryview(buf) as view:
+                        n = self._timed_fill(infile, view)
+                    filled.put((buf, n, None))
+                    if not n:
+                        return
+            except BaseException as e:
+                filled.put((None, 0, e))
+
+        # A daemon, and not joined: a read blocked on a pipe must not hang a cancel
+        threading.Thread(target=reader, daemon=True).start()
+        try:
+            while True:
+                buf, n, error = filled.get()
+                if error is not None:
+                    raise error
+                if not n:
+                    return
+                yield buf, n
+                writer.release(lambda buf=buf: free.put(buf))
+        finally:
+            stop.set()
+            free.put(None)
+
+    def _timed_fill(self, infile, view):
+        if self.timings is None:
+            return self._fill(infile, view)
+        started = time.perf_counter()
+        n = self._fill(infile, view)
+        self.timings.add("read", time.perf_counter() - started, n)
+        return n
+
+    @staticmethod
+    def _fill(infile, view):
+        """Read until view is full or the input ends; a pipe returns at most its buffer per read"""
+        total = 0
+        while total < len(view):
+            n = infile.readinto(view[total:])
+            if not n:
+                break
+            total += n
+        return total
+
+    def _copy_lines(self, chunks, lines_per_file, writer, scanner=None):
+        remaining = lines_per_file
+        open_line = False
+
+        for buf, n in chunks:
+            # Boundaries are looked for in scan, data is copied from buf
+            scan = buf if scanner is None else scanner.scan(buf, n)
+            with memoryview(buf) as view:
+                pos = 0
+                while pos < n:
+                    # Counting only as far as the next boundary keeps small parts linear
+                    cut, missing = _past_newlines(scan, pos, n, remaining)
+                    if missing:
+                        writer.write(view[pos:n])
+                        writer.lines += remaining - missing
+                        remaining = missing
+                        break
+
+                    writer.write(view[pos:cut])
+                    writer.lines += remaining
+                    writer.close_part()
+                    remaining = lines_per_file
+                    pos = cut
+            open_line = scan[n - 1] != 0x0A
+
+        # A final line without a trailing newline still counts
+        if open_line:
+            writer.lines += 1
+
+    def _copy_sized(self, chunks, max_size_bytes, writer, scanner=None):
+        # Bytes of a line that started in an earlier chunk and is not finished
+        # yet, and the same bytes as seen by the boundary scans
+        carry = bytearray()
+        carry_scan = bytearray()
+
+        for buf, n in chunks:
+            scan = buf if scanner is None else scanner.scan(buf, n)
+            last_newline = scan.rfind(b"\n", 0, n)
+            if last_newline < 0:
+                carry += buf[:n]
+                carry_scan += scan[:n]
+                continue
+
+            start = 0
+            if carry:
+                start = scan.find(b"\n", 0, n) + 1
+                carry += buf[:start]
+                carry_scan += scan[:start]
+                self._emit_sized(carry, 0, len(carry), max_size_bytes, writer, carry_scan)
+                carry = bytearray()
+                carry_scan = bytearray()
+
+            self._emit_sized(buf, start, last_newline + 1, max_size_bytes, writer, scan)
+            carry += buf[last_newline + 1:n]
+            carry_scan += scan[last_newline + 1:n]
+
+        if carry:
+            self._emit_sized(carry, 0, len(carry), max_size_bytes, writer, carry_scan)
+            writer.lines += 1
+
+    def _copy_planned(self, chunks, plan, writer):
+        """Write the stream out along precomputed part boundaries"""
+        ends = deque(part.end for part in plan)
+        offset = None
+        last_byte = 0x0A
+
+        for buf, n in chunks:
+            if offset is None:
+                # Where the stream starts: past a header taken off, or a resumed part
+                offset = writer.input_offset
+                while ends and ends[0] <= offset:
+                    ends.popleft()
+            with memoryview(buf) as view:
+                pos = 0
+                while ends and ends[0] <= offset + n:
+                    cut = ends.popleft() - offset
+                    writer.write(view[pos:cut])
+                    writer.lines += buf.count(b"\n", pos, cut)
+                    writer.close_part()
+                    pos = cut
+                if pos < n:
+                    writer.write(view[pos:n])
+                    writer.lines += buf.count(b"\n", pos, n)
+            offset += n
+            last_byte = buf[n - 1]
+
+        # A final line without a trailing newline still counts
+        if last_byte != 0x0A:
+            writer.lines += 1
+
+    def _copy_keyed(self, chunks, route, writer):
+        # Bytes of a line that started in an earlier chunk and is not finished yet
+        carry = b""
+
+        for buf, n in chunks:
+            last_newline = buf.rfind(b"\n", 0, n)
+            if last_newline < 0:
+                carry += buf[:n]
+                continue
+            # One split per chunk; the bucket writer joins each bucket's lines back up
+            writer.add((carry + buf[:last_newline]).split(b"\n"), route)
+            carry = bytes(buf[last_newline + 1:n])
+
+        if carry:
+            writer.add_last(carry, route)
+
+    def _copy_reservoir(self, chunks, reservoir, writer):
+        # Bytes of a line that started in an earlier chunk and is not finished yet
+        carry = b""
+
+        for buf, n in chunks:
+            last_newline = buf.rfind(b"\n", 0, n)
+            if last_newline < 0:
+                carry += buf[:n]
+                continue
+            start = 0
+            if carry:
+                # The line the last chunk left unfinished is offered on its own
+                start = buf.find(b"\n", 0, n) + 1
+                carry += buf[:start]
+                reservoir.offer(carry, 0, len(carry))
+            reservoir.offer(buf, start, last_newline + 1)
+            carry = bytes(buf[last_newline + 1:n])
+            writer.lines = reservoir.lines
+
+        if carry:
+            reservoir.offer_last(carry)
+            writer.lines = reservoir.lines
+
+    def _copy_sampled(self, chunks, route, writer):
+        # Bytes of a line that started in an earlier chunk and is not finished yet
+        carry = b""
+
+        for buf, n in chunks:
+            last_newline = buf.rfind(b"\n", 0, n)
+            if last_newline < 0:
+                carry += buf[:n]
+                continue
+            lines = (carry + buf[:last_newline]).split(b"\n")
+            kept = [line for line in lines if not route(line)]
+            if kept:
+                kept.append(b"")
+                writer.write(b"\n".join(kept), len(kept) - 1)
+            writer.lines += len(lines)
+            carry = bytes(buf[last_newline + 1:n])
+
+        if carry:
+            writer.lines += 1
+            if not route(carry):
+                writer.write(carry, 1)
+
+    def _emit_sized(self, buf, start, end, max_size_bytes, writer, scan=None):
+        """Write complete lines from buf[start:end], never splitting a line across parts
+
+        Lines are counted per written piece, so every part's count is exact
+        by the time it is closed.
+        """
+        scan = buf if scan is None else scan
+        with memoryview(buf) as view:
+            pos = start
+            while pos < end:
+                room = max_size_bytes - writer.part_bytes
+                if end - pos <= room:
+                    writer.write(view[pos:end])
+                    writer.lines += scan.count(b"\n", pos, end)
+                    return
+
+                cut = scan.rfind(b"\n", pos, pos + max(room, 0)) + 1
+                if not cut and writer.part_bytes <= len(writer.header):
+                    # A single line larger than a part gets a part of its own
+                    cut = scan.find(b"\n", pos, end) + 1 or end
+                if cut:
+                    writer.write(view[pos:cut])
+                    writer.lines += scan.count(b"\n", pos, cut)
+                    writer.close_part()
+                    pos = cut
+                else:
+                    writer.close_part()
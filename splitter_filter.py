@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Filter
+Keeps only the lines matching include/exclude patterns, scanning whole chunks
+"""
+
+import re
+
+try:
+    from re import _parser as sre_parse   # Python 3.11+
+except ImportError:
+    import sre_parse
+
+
+def required_literal(pattern, flags=0):
+    """Longest run of plain bytes every match of the bytes regex pattern contains
+
+    Only the top level of the pattern is looked at, so alternations and
+    repeats contribute nothing; b"" means there is no usable literal.
+    """
+    best = run = b""
+    parsed = list(sre_parse.parse(pattern, flags))
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            run += bytes([arg])
+            if len(run) > len(best):
+                best = run
+        else:
+            run = b""
+    if b"\n" in best:
+        return b"", False
+    return best, len(best) == len(parsed)
+
+
+class _Pattern:
+    """One compiled pattern plus the literal used to find candidate lines for it"""
+
+    def __init__(self, pattern, ignore_case):
+        self.text = pattern if isinstance(pattern, str) else pattern.decode("utf-8", "replace")
+        if isinstance(pattern, str):
+            pattern = pattern.encode("utf-8")
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            self.regex = re.compile(pattern, flags)
+        except re.error as e:
+            raise ValueError(f"Invalid filter regex {self.text!r}: {e}")
+        self.literal, self.literal_only = required_literal(pattern, flags)
+        # An inline (?i) folds case like ignore_case does
+        self.ignore_case = bool(self.regex.flags & re.IGNORECASE)
+        if self.ignore_case:
+            self.literal = self.literal.lower()
+
+    def find(self, buf, scan, start, end):
+        """Offset of the first possible match in [start, end), -1 if there is none
+
+        scan is buf lowercased (or buf itself if no pattern ignores case).
+        """
+        if self.literal:
+            return (scan if self.ignore_case else buf).find(self.literal, start, end)
+        match = self.regex.search(buf, start, end)
+        # An empty match just past the last newline isn't on any line
+        return match.start() if match and match.start() < end else -1
+
+    def matches(self, line):
+        if self.literal_only:
+            return self.literal in (line.lower() if self.ignore_case else line)
+        return self.regex.search(line) is not None
+
+
+class LineFilter:
+    """Keeps lines matching any include pattern and no exclude pattern
+
+    Patterns are regexes over the raw bytes of a line without its newline
+    (str patterns are UTF-8 encoded); ^ and $ anchor to the line. Where a
+    pattern requires a literal, that literal is searched for through the
+    whole block with bytes.find and only the lines holding it are matched
+    against the regex, so blocks without candidates cost a single scan.
+    matched and dropped count the lines kept and left out so far.
+    """
+
+    def __init__(self, include=(), exclude=(), ignore_case=False):
+        if isinstance(include, (str, bytes)):
+            include = [include]
+        if isinstance(exclude, (str, bytes)):
+            exclude = [exclude]
+        self.include = [_Pattern(p, ignore_case) for p in include or ()]
+        self.exclude = [_Pattern(p, ignore_case) for p in exclude or ()]
+        if not self.include and not self.exclude:
+            raise ValueError("A filter needs at least one include or exclude pattern")
+        self.ignore_case = ignore_case
+        self.folds = any(p.ignore_case for p in self.include + self.exclude)
+        self.matched = 0
+        self.dropped = 0
+
+    def to_dict(self):
+        return {
+            "include": [p.text for p in self.include],
+            "exclude": [p.text for p in self.exclude],
+            "ignore_case": self.ignore_case,
+        }
+
+    def spans(self, buf, start, end):
+        """[start, end) ranges of buf holding the kept lines of the lines in buf[start:end]
+
+        buf[start:end] has to consist of whole lines; only the last may
+        lack its newline. Adjacent kept lines come back as one range.
+        """
+        if start >= end:
+            return []
+        # bytes.lower() only folds ASCII, as IGNORECASE does for bytes, and keeps offsets
+        scan = buf[:end].lower() if self.folds else buf
+        total = buf.count(b"\n", start, end) + (buf[end - 1] != 0x0A)
+
+        kept = []
+        if self.include:
+            matched = 0
+            for line_start, line_end in self._matching(self.include, buf, scan, start, end):
+                if self.exclude and self._excluded(buf, line_start, line_end):
+                    continue
+                matched += 1
+                if kept and kept[-1][1] == line_start:
+                    kept[-1] = (kept[-1][0], line_end)
+                else:
+                    kept.append((line_start, line_end))
+            self.matched += matched
+            self.dropped += total - matched
+        else:
+            pos = start
+            excluded = 0
+            for line_start, line_end in self._matching(self.exclude, buf, scan, start, end):
+                excluded += 1
+                if line_start > pos:
+                    kept.append((pos, line_start))
+                pos = line_end
+            if pos < end:
+                kept.append((pos, end))
+            self.matched += total - excluded
+            self.dropped += excluded
+        return kept
+
+    def _excluded(self, buf, line_start, line_end):
+        line = bytes(buf[line_start:line_end]).rstrip(b"\n")
+        return any(p.matches(line) for p in self.exclude)
+
+    @staticmethod
+    def _matching(patterns, buf, scan, start, end):
+        """(start, end) of every line in buf[start:end] that one of patterns matches"""
+        candidates = [p.find(buf, scan, start, end) for p in patterns]
+        while True:
+            pos = min((c for c in candidates if c >= 0), default=-1)
+            if pos < 0:
+                return
+            line_start = buf.rfind(b"\n", start, pos) + 1 or start
+            line_end = buf.find(b"\n", pos, end) + 1 or end
+            line = None
+            hit = False
+            for i, p in enumerate(patterns):
+                if 0 <= candidates[i] < line_end:
+                    if not hit:
+                        if line is None:
+                            line = bytes(buf[line_start:line_end]).rstrip(b"\n")
+                        hit = p.matches(line)
+                    # Look for this pattern's next candidate past the line
+                    candidates[i] = p.find(buf, scan, line_end, end) if line_end < end else -1
+            if hit:
+                yield line_start, line_end
@@ -0,0 +1,1313 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter GUI - Modern Golden Theme Edition
+Tkinter front end over the splitting engine
+"""
+
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from pathlib import Path
+import queue
+import re
+import time
+
+from splitter_batch import BatchProgress, BatchResult, BatchRunner
+from splitter_codecs import available_codecs, split_name
+from splitter_engine import SplitEngine, SplitProgress, SplitTimings, default_output_dir
+from splitter_index import get_line_index
+from splitter_join import JoinEngine, find_parts
+from splitter_manifest import CHECKSUMS
+from splitter_text import ENCODINGS
+from splitter_time import TimeWindow
+
+
+class GoldenTheme:
+    """Golden color palette for modern UI"""
+    # Primary colors
+    GOLD_PRIMARY = "#D4AF37"      # Classic gold
+    GOLD_LIGHT = "#F4E4BA"        # Light gold
+    GOLD_DARK = "#B8960C"         # Dark gold
+    GOLD_ACCENT = "#FFD700"       # Bright gold
+    
+    # Background colors
+    BG_DARK = "#1A1A2E"           # Dark navy background
+    BG_MEDIUM = "#16213E"         # Medium dark background
+    BG_LIGHT = "#0F3460"          # Lighter accent background
+    BG_CARD = "#1F2940"           # Card background
+    
+    # Text colors
+    TEXT_PRIMARY = "#FFFFFF"       # White text
+    TEXT_SECONDARY = "#B8B8B8"     # Gray text
+    TEXT_GOLD = "#D4AF37"          # Gold text
+    
+    # Status colors
+    SUCCESS = "#4CAF50"            # Green
+    ERROR = "#F44336"              # Red
+    WARNING = "#FF9800"            # Orange
+    
+    # Button states
+    BTN_HOVER = "#E5C158"          # Lighter gold for hover
+    BTN_PRESSED = "#A38829"        # Darker gold for pressed
+
+
+class ModernButton(tk.Canvas):
+    """Custom modern button with golden styling"""
+    
+    def __init__(self, parent, text, command=None, width=200, height=45, **kwargs):
+        super().__init__(parent, width=width, height=height, 
+                        bg=GoldenTheme.BG_DARK, highlightthickness=0, **kwargs)
+        
+        self.command = command
+        self.text = text
+        self.width = width
+        self.height = height
+        self.enabled = True
+        
+        self._draw_button(GoldenTheme.GOLD_PRIMARY)
+        
+        self.bind("<Enter>", self._on_enter)
+        self.bind("<Leave>", self._on_leave)
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<ButtonRelease-1>", self._on_release)
+    
+    def _draw_button(self, color):
+        self.delete("all")
+        # Draw rounded rectangle
+        self._round_rectangle(5, 5, self.width-5, self.height-5, 
+                             radius=10, fill=color, outline="")
+        # Draw text
+        self.create_text(self.width//2, self.height//2, text=self.text,
+                        fill=GoldenTheme.BG_DARK, font=("Segoe UI", 11, "bold"))
+    
+    def _round_rectangle(self, x1, y1, x2, y2, radius=10, **kwargs):
+        points = [
+            x1+radius, y1, x2-radius, y1, x2, y1, x2, y1+radius,
+            x2, y2-radius, x2, y2, x2-radius, y2, x1+radius, y2,
+            x1, y2, x1, y2-radius, x1, y1+radius, x1, y1
+        ]
+        return self.create_polygon(points, smooth=True, **kwargs)
+    
+    def _on_enter(self, event):
+        if self.enabled:
+            self._draw_button(GoldenTheme.BTN_HOVER)
+            self.config(cursor="hand2")
+    
+    def _on_leave(self, event):
+        if self.enabled:
+            self._draw_button(GoldenTheme.GOLD_PRIMARY)
+    
+    def _on_click(self, event):
+        if self.enabled:
+            self._draw_button(GoldenTheme.BTN_PRESSED)
+    
+    def _on_release(self, event):
+        if self.enabled:
+            self._draw_button(GoldenTheme.BTN_HOVER)
+            if self.command:
+                self.command()
+    
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self._draw_button(GoldenTheme.GOLD_PRIMARY)
+        else:
+            self._draw_button(GoldenTheme.TEXT_SECONDARY)
+
+
+class ProgressCard(tk.Frame):
+    """Modern progress display card"""
+    
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, bg=GoldenTheme.BG_CARD, **kwargs)
+        
+        # Progress bar container
+        self.progress_frame = tk.Frame(self, bg=GoldenTheme.BG_CARD)
+        self.progress_frame.pack(fill="x", padx=20, pady=(15, 5))
+        
+        # Progress bar background
+        self.progress_bg = tk.Canvas(self.progress_frame, height=8, 
+                                     bg=GoldenTheme.BG_DARK, highlightthickness=0)
+        self.progress_bg.pack(fill="x")
+        # Last (percent, lines, files) drawn; cleared whenever the bar is
+        # mapped or resized, since a sample drawn at another width is stale
+        self.shown = None
+        self.progress_bg.bind("<Configure>", lambda e: self.redraw())
+        
+        # Status labels
+        self.status_frame = tk.Frame(self, bg=GoldenTheme.BG_CARD)
+        self.status_frame.pack(fill="x", padx=20, pady=(5, 15))
+        
+        self.status_label = tk.Label(self.status_frame, text="Ready to split", 
+                                     bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                                     font=("Segoe UI", 10))
+        self.status_label.pack(side="left")
+        
+        self.percent_label = tk.Label(self.status_frame, text="0%", 
+                                      bg=GoldenTheme.BG_CARD, fg=GoldenTheme.GOLD_PRIMARY,
+                                      font=("Segoe UI", 10, "bold"))
+        self.percent_label.pack(side="right")
+        
+        # Stats frame
+        self.stats_frame = tk.Frame(self, bg=GoldenTheme.BG_CARD)
+        self.stats_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        self.lines_label = tk.Label(self.stats_frame, text="Lines: 0", 
+                                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                                    font=("Segoe UI", 9))
+        self.lines_label.pack(side="left")
+        
+        self.files_label = tk.Label(self.stats_frame, text="Files: 0", 
+                                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                                    font=("Segoe UI", 9))
+        self.files_label.pack(side="right")
+        
+        # Per-phase timings of the split, hidden until asked for
+        self.details_toggle = tk.Label(self.stats_frame, text="▸ Details", cursor="hand2",
+                                       bg=GoldenTheme.BG_CARD, fg=GoldenTheme.GOLD_PRIMARY,
+                                       font=("Segoe UI", 9))
+        self.details_toggle.pack(side="right", padx=(0, 20))
+        self.details_toggle.bind("<Button-1>", lambda e: self.toggle_details())
+        self.details_label = tk.Label(self, text="", justify="left", anchor="w",
+                                      bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                                      font=("Consolas", 9))
+        self.details_shown = False
+    
+    def toggle_details(self):
+        self.details_shown = not self.details_shown
+        if self.details_shown:
+            self.details_toggle.config(text="▾ Details")
+            self.details_label.pack(fill="x", padx=20, pady=(0, 15))
+        else:
+            self.details_toggle.config(text="▸ Details")
+            self.details_label.pack_forget()
+        self.redraw()
+    
+    def redraw(self):
+        """Have the next progress sample drawn even if it shows nothing new"""
+        self.shown = None
+    
+    def set_details(self, text):
+        if self.details_shown:
+            self.details_label.config(text=text or "No timings yet")
+    
+    def update_progress(self, percent, status="", lines=0, files=0):
+        # Redrawing is the expensive part, so skip samples that show nothing new
+        shown = (round(percent, 1), lines, files)
+        if shown == self.shown and not status:
+            return
+        self.shown = shown
+        
+        # Update progress bar
+        self.progress_bg.delete("progress")
+        width = self.progress_bg.winfo_width()
+        if width > 1:
+            fill_width = int(width * percent / 100)
+            self.progress_bg.create_rectangle(0, 0, fill_width, 8, 
+                                              fill=GoldenTheme.GOLD_PRIMARY, 
+                                              outline="", tags="progress")
+        
+        # Update labels
+        self.percent_label.config(text=f"{percent:.1f}%")
+        if status:
+            self.status_label.config(text=status)
+        # Lines are unknown when parts were planned without counting newlines
+        self.lines_label.config(text="Lines: —" if lines is None else f"Lines: {lines:,}")
+        self.files_label.config(text=f"Files: {files}")
+    
+    def set_status(self, status):
+        self.status_label.config(text=status)
+    
+    def reset(self):
+        self.shown = None
+        self.progress_bg.delete("progress")
+        self.percent_label.config(text="0%")
+        self.status_label.config(text="Ready to split")
+        self.lines_label.config(text="Lines: 0")
+        self.files_label.config(text="Files: 0")
+        self.details_label.config(text="")
+
+
+class TextSplitterGUI:
+    """Main GUI Application"""
+    
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("✨ Text File Splitter - Golden Edition")
+        self.root.geometry("700x650")
+        self.root.minsize(600, 600)
+        self.root.configure(bg=GoldenTheme.BG_DARK)
+        
+        # Start maximized/fullscreen
+        self.root.state('zoomed')  # Windows maximized state
+        
+        # Set icon if available
+        try:
+            self.root.iconbitmap("icon.ico")
+        except:
+            pass
+        
+        # Variables
+        self.input_file = tk.StringVar()
+        self.batch_files = []     # Files picked together in _browse_input
+        self.batch_jobs = tk.StringVar(value="2")
+        self.exact_count = tk.BooleanVar(value=True)
+        self.output_dir = tk.StringVar()
+        self.split_method = tk.StringVar(value="lines")
+        self.lines_per_file = tk.StringVar(value="1000000")
+        self.size_mb = tk.StringVar(value="100")
+        self.part_count = tk.StringVar(value="8")
+        self.verify_join = tk.BooleanVar(value=True)
+        self.buckets = tk.StringVar(value="16")
+        self.key_field = tk.StringVar(value="1")
+        self.key_delimiter = tk.StringVar(value=",")
+        self.key_pattern = tk.StringVar()
+        self.ratios = tk.StringVar(value="80:10:10")
+        self.ratio_seed = tk.StringVar(value="0")
+        self.ratio_by_number = tk.BooleanVar(value=False)
+        self.time_window = tk.StringVar(value="1h")
+        self.time_field = tk.StringVar()
+        self.time_delimiter = tk.StringVar(value=",")
+        self.time_format = tk.StringVar()
+        self.name_by_window = tk.BooleanVar(value=True)
+        self.header_lines = tk.StringVar(value="0")
+        self.csv_quoted = tk.BooleanVar(value=False)
+        self.encoding = tk.StringVar(value="auto")
+        self.lone_cr = tk.BooleanVar(value=False)
+        self.repeat_bom = tk.BooleanVar(value=True)
+        self.include_pattern = tk.StringVar()
+        self.exclude_pattern = tk.StringVar()
+        self.filter_ignore_case = tk.BooleanVar(value=False)
+        self.zero_copy = tk.BooleanVar(value=True)
+        self.workers = tk.StringVar(value="1")
+        self.compress = tk.StringVar(value="none")
+        self.resume = tk.BooleanVar(value=False)
+        self.drop_cache = tk.BooleanVar(value=False)
+        self.manifest = tk.StringVar(value="none")
+        
+        # Queue for thread communication; progress counters are shared
+        # directly and sampled by the queue handler instead
+        self.progress_queue = queue.Queue()
+        self.split_progress = SplitProgress()
+        self.split_timings = SplitTimings()
+        self.timing_split = False     # Timings cost a little, so only taken with Details open
+        self.batch_progress = BatchProgress()
+        self.batch_running = False
+        self.output_location = None
+        self.is_processing = False
+        self.cancel_requested = False
+        
+        # Exact line count / line-offset index of the selected file
+        self.line_index = None
+        self.line_index_path = None
+        
+        self._create_ui()
+        self._start_queue_handler()
+    
+    def _create_ui(self):
+        # Main container with padding
+        main_container = tk.Frame(self.root, bg=GoldenTheme.BG_DARK)
+        main_container.pack(fill="both", expand=True, padx=30, pady=20)
+        
+        # Header
+        self._create_header(main_container)
+        
+        # File selection card
+        self._create_file_card(main_container)
+        
+        # Split options card
+        self._create_options_card(main_container)
+        
+        # Progress card
+        self._create_progress_card(main_container)
+        
+        # Action buttons
+        self._create_action_buttons(main_container)
+        
+        # Footer
+        self._create_footer(main_container)
+    
+    def _create_header(self, parent):
+        header_frame = tk.Frame(parent, bg=GoldenTheme.BG_DARK)
+        header_frame.pack(fill="x", pady=(0, 20))
+        
+        # Title with gold styling
+        title_label = tk.Label(header_frame, text="✨ Text File Splitter", 
+                              bg=GoldenTheme.BG_DARK, fg=GoldenTheme.GOLD_PRIMARY,
+                              font=("Segoe UI", 24, "bold"))
+        title_label.pack()
+        
+        subtitle_label = tk.Label(header_frame, 
+                                  text="Handle 100M+ lines with ease • Golden Edition", 
+                                  bg=GoldenTheme.BG_DARK, fg=GoldenTheme.TEXT_SECONDARY,
+                                  font=("Segoe UI", 10))
+        subtitle_label.pack(pady=(5, 0))
+    
+    def _create_file_card(self, parent):
+        # Card frame
+        card = tk.Frame(parent, bg=GoldenTheme.BG_CARD)
+        card.pack(fill="x", pady=(0, 15))
+        
+        # Card header
+        header = tk.Label(card, text="📁 File Selection", 
+                         bg=GoldenTheme.BG_CARD, fg=GoldenTheme.GOLD_PRIMARY,
+                         font=("Segoe UI", 12, "bold"))
+        header.pack(anchor="w", padx=20, pady=(15, 10))
+        
+        # Input file row
+        input_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        input_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        tk.Label(input_frame, text="Input File:", bg=GoldenTheme.BG_CARD, 
+                fg=GoldenTheme.TEXT_PRIMARY, font=("Segoe UI", 10)).pack(anchor="w")
+        
+        input_row = tk.Frame(input_frame, bg=GoldenTheme.BG_CARD)
+        input_row.pack(fill="x", pady=(5, 0))
+        
+        self.input_entry = tk.Entry(input_row, textvariable=self.input_file,
+                                    bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                    insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), relief="flat")
+        self.input_entry.pack(side="left", fill="x", expand=True, ipady=8, padx=(0, 10))
+        
+        browse_btn = tk.Button(input_row, text="Browse", command=self._browse_input,
+                              bg=GoldenTheme.GOLD_PRIMARY, fg=GoldenTheme.BG_DARK,
+                              font=("Segoe UI", 9, "bold"), relief="flat",
+                              activebackground=GoldenTheme.BTN_HOVER, cursor="hand2")
+        browse_btn.pack(side="right", ipadx=15, ipady=5)
+        
+        # Output directory row
+        output_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        output_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        tk.Label(output_frame, text="Output Directory (optional):", bg=GoldenTheme.BG_CARD, 
+                fg=GoldenTheme.TEXT_PRIMARY, font=("Segoe UI", 10)).pack(anchor="w")
+        
+        output_row = tk.Frame(output_frame, bg=GoldenTheme.BG_CARD)
+        output_row.pack(fill="x", pady=(5, 0))
+        
+        self.output_entry = tk.Entry(output_row, textvariable=self.output_dir,
+                                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                     font=("Segoe UI", 10), relief="flat")
+        self.output_entry.pack(side="left", fill="x", expand=True, ipady=8, padx=(0, 10))
+        
+        browse_out_btn = tk.Button(output_row, text="Browse", command=self._browse_output,
+                                   bg=GoldenTheme.GOLD_PRIMARY, fg=GoldenTheme.BG_DARK,
+                                   font=("Segoe UI", 9, "bold"), relief="flat",
+                                   activebackground=GoldenTheme.BTN_HOVER, cursor="hand2")
+        browse_out_btn.pack(side="right", ipadx=15, ipady=5)
+        
+        # Exact line count toggle
+        exact_count_check = tk.Checkbutton(card, text="Count lines exactly after selecting a file (cached for re-splits)",
+                                           variable=self.exact_count,
+                                           bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                           selectcolor=GoldenTheme.BG_MEDIUM,
+                                           activebackground=GoldenTheme.BG_CARD,
+                                           activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                           font=("Segoe UI", 9), cursor="hand2")
+        exact_count_check.pack(anchor="w", padx=20, pady=(0, 5))
+        
+        # File info label
+        self.file_info_label = tk.Label(card, text="", bg=GoldenTheme.BG_CARD, 
+                                        fg=GoldenTheme.TEXT_SECONDARY,
+                                        font=("Segoe UI", 9))
+        self.file_info_label.pack(anchor="w", padx=20, pady=(0, 15))
+    
+    def _create_options_card(self, parent):
+        # Card frame
+        card = tk.Frame(parent, bg=GoldenTheme.BG_CARD)
+        card.pack(fill="x", pady=(0, 15))
+        
+        # Card header
+        header = tk.Label(card, text="⚙️ Split Options", 
+                         bg=GoldenTheme.BG_CARD, fg=GoldenTheme.GOLD_PRIMARY,
+                         font=("Segoe UI", 12, "bold"))
+        header.pack(anchor="w", padx=20, pady=(15, 10))
+        
+        # Split method selection
+        method_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        method_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Custom styled radio buttons
+        style = ttk.Style()
+        style.configure("Gold.TRadiobutton", 
+                       background=GoldenTheme.BG_CARD,
+                       foreground=GoldenTheme.TEXT_PRIMARY,
+                       font=("Segoe UI", 10))
+        
+        lines_radio = tk.Radiobutton(method_frame, text="Split by Lines", 
+                                     variable=self.split_method, value="lines",
+                                     bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                     selectcolor=GoldenTheme.BG_MEDIUM,
+                                     activebackground=GoldenTheme.BG_CARD,
+                                     activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                     font=("Segoe UI", 10), cursor="hand2",
+                                     command=self._update_options_visibility)
+        lines_radio.pack(side="left", padx=(0, 30))
+        
+        size_radio = tk.Radiobutton(method_frame, text="Split by Size", 
+                                    variable=self.split_method, value="size",
+                                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                    selectcolor=GoldenTheme.BG_MEDIUM,
+                                    activebackground=GoldenTheme.BG_CARD,
+                                    activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), cursor="hand2",
+                                    command=self._update_options_visibility)
+        size_radio.pack(side="left", padx=(0, 30))
+        
+        key_radio = tk.Radiobutton(method_frame, text="Split by Key", 
+                                   variable=self.split_method, value="key",
+                                   bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                   selectcolor=GoldenTheme.BG_MEDIUM,
+                                   activebackground=GoldenTheme.BG_CARD,
+                                   activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                   font=("Segoe UI", 10), cursor="hand2",
+                                   command=self._update_options_visibility)
+        key_radio.pack(side="left", padx=(0, 30))
+        
+        ratio_radio = tk.Radiobutton(method_frame, text="Split by Ratio", 
+                                     variable=self.split_method, value="ratio",
+                                     bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                     selectcolor=GoldenTheme.BG_MEDIUM,
+                                     activebackground=GoldenTheme.BG_CARD,
+                                     activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                     font=("Segoe UI", 10), cursor="hand2",
+                                     command=self._update_options_visibility)
+        ratio_radio.pack(side="left", padx=(0, 30))
+        
+        time_radio = tk.Radiobutton(method_frame, text="Split by Time", 
+                                    variable=self.split_method, value="time",
+                                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                    selectcolor=GoldenTheme.BG_MEDIUM,
+                                    activebackground=GoldenTheme.BG_CARD,
+                                    activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), cursor="hand2",
+                                    command=self._update_options_visibility)
+        time_radio.pack(side="left", padx=(0, 30))
+        
+        parts_radio = tk.Radiobutton(method_frame, text="Split into N Parts", 
+                                     variable=self.split_method, value="parts",
+                                     bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                     selectcolor=GoldenTheme.BG_MEDIUM,
+                                     activebackground=GoldenTheme.BG_CARD,
+                                     activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                     font=("Segoe UI", 10), cursor="hand2",
+                                     command=self._update_options_visibility)
+        parts_radio.pack(side="left", padx=(0, 30))
+        
+        join_radio = tk.Radiobutton(method_frame, text="Join Parts", 
+                                    variable=self.split_method, value="join",
+                                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                    selectcolor=GoldenTheme.BG_MEDIUM,
+                                    activebackground=GoldenTheme.BG_CARD,
+                                    activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), cursor="hand2",
+                                    command=self._update_options_visibility)
+        join_radio.pack(side="left")
+        
+        # Options container
+        options_container = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        options_container.pack(fill="x", padx=20, pady=(10, 15))
+        
+        # Lines option
+        self.lines_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        self.lines_frame.pack(fill="x")
+        
+        tk.Label(self.lines_frame, text="Lines per file:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        self.lines_entry = tk.Entry(self.lines_frame, textvariable=self.lines_per_file,
+                                    bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                    insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), relief="flat", width=15)
+        self.lines_entry.pack(side="left", padx=(10, 10), ipady=5)
+        
+        tk.Label(self.lines_frame, text="(e.g., 1000000 = 1 million)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Size option
+        self.size_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        tk.Label(self.size_frame, text="Size per file (MB):", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        self.size_entry = tk.Entry(self.size_frame, textvariable=self.size_mb,
+                                   bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                   insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                   font=("Segoe UI", 10), relief="flat", width=15)
+        self.size_entry.pack(side="left", padx=(10, 10), ipady=5)
+        
+        tk.Label(self.size_frame, text="(e.g., 100 = 100 MB)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Part count option
+        self.parts_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        tk.Label(self.parts_frame, text="Number of parts:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        self.parts_entry = tk.Entry(self.parts_frame, textvariable=self.part_count,
+                                    bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                    insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                    font=("Segoe UI", 10), relief="flat", width=15)
+        self.parts_entry.pack(side="left", padx=(10, 10), ipady=5)
+        
+        tk.Label(self.parts_frame, text="(equal sizes, cut at the nearest line end)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Key option: lines with equal keys always land in the same part
+        self.key_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        key_fields = [("Buckets:", self.buckets, 6), ("Column:", self.key_field, 4),
+                      ("Delimiter:", self.key_delimiter, 4), ("or Regex:", self.key_pattern, 18)]
+        for text, variable, width in key_fields:
+            tk.Label(self.key_frame, text=text, 
+                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                    font=("Segoe UI", 10)).pack(side="left")
+            tk.Entry(self.key_frame, textvariable=variable,
+                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                     font=("Segoe UI", 10), relief="flat", width=width).pack(
+                         side="left", padx=(5, 12), ipady=5)
+        
+        tk.Label(self.key_frame, text="(\\t = tab; regex uses its first group)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Ratio option: a seeded hash deals every line to one part per ratio
+        self.ratio_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        ratio_fields = [("Ratios:", self.ratios, 12), ("Seed:", self.ratio_seed, 6)]
+        for text, variable, width in ratio_fields:
+            tk.Label(self.ratio_frame, text=text, 
+                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                    font=("Segoe UI", 10)).pack(side="left")
+            tk.Entry(self.ratio_frame, textvariable=variable,
+                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                     font=("Segoe UI", 10), relief="flat", width=width).pack(
+                         side="left", padx=(5, 12), ipady=5)
+        
+        tk.Checkbutton(self.ratio_frame, text="Hash line numbers, not contents",
+                       variable=self.ratio_by_number,
+                       bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                       selectcolor=GoldenTheme.BG_MEDIUM,
+                       activebackground=GoldenTheme.BG_CARD,
+                       activeforeground=GoldenTheme.GOLD_PRIMARY,
+                       font=("Segoe UI", 10), cursor="hand2").pack(side="left")
+        
+        tk.Label(self.ratio_frame, text="(e.g., 80:10:10; same seed = same parts)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left", padx=(10, 0))
+        
+        # Time option: one part per window of a time-sorted file
+        self.time_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        time_fields = [("Window:", self.time_window, 6), ("Column:", self.time_field, 4),
+                       ("Delimiter:", self.time_delimiter, 4), ("Format:", self.time_format, 18)]
+        for text, variable, width in time_fields:
+            tk.Label(self.time_frame, text=text, 
+                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                    font=("Segoe UI", 10)).pack(side="left")
+            tk.Entry(self.time_frame, textvariable=variable,
+                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                     font=("Segoe UI", 10), relief="flat", width=width).pack(
+                         side="left", padx=(5, 12), ipady=5)
+        
+        tk.Checkbutton(self.time_frame, text="Name parts by window",
+                       variable=self.name_by_window,
+                       bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                       selectcolor=GoldenTheme.BG_MEDIUM,
+                       activebackground=GoldenTheme.BG_CARD,
+                       activeforeground=GoldenTheme.GOLD_PRIMARY,
+                       font=("Segoe UI", 10), cursor="hand2").pack(side="left")
+        
+        tk.Label(self.time_frame, text="(e.g., 15m, 1h, 1d; empty column/format = ISO time)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left", padx=(10, 0))
+        
+        # Join option: the input is any part or the manifest of a split
+        self.join_frame = tk.Frame(options_container, bg=GoldenTheme.BG_CARD)
+        
+        tk.Checkbutton(self.join_frame, text="Verify checksums (if the split left a manifest)",
+                       variable=self.verify_join,
+                       bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                       selectcolor=GoldenTheme.BG_MEDIUM,
+                       activebackground=GoldenTheme.BG_CARD,
+                       activeforeground=GoldenTheme.GOLD_PRIMARY,
+                       font=("Segoe UI", 10), cursor="hand2").pack(side="left")
+        
+        tk.Label(self.join_frame, text="(select any part or the manifest as input file)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left", padx=(10, 0))
+        
+        # CSV/TSV options
+        csv_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        csv_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        tk.Label(csv_frame, text="Header lines to repeat:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        self.header_entry = tk.Entry(csv_frame, textvariable=self.header_lines,
+                                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                     font=("Segoe UI", 10), relief="flat", width=5)
+        self.header_entry.pack(side="left", padx=(10, 20), ipady=5)
+        
+        csv_check = tk.Checkbutton(csv_frame, text="CSV quoting (quoted fields may contain line breaks)",
+                                   variable=self.csv_quoted,
+                                   bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                   selectcolor=GoldenTheme.BG_MEDIUM,
+                                   activebackground=GoldenTheme.BG_CARD,
+                                   activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                   font=("Segoe UI", 10), cursor="hand2")
+        csv_check.pack(side="left")
+        
+        # Line ends and BOM, found on the raw bytes
+        text_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        text_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        tk.Label(text_frame, text="Encoding:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        encoding_menu = tk.OptionMenu(text_frame, self.encoding, *ENCODINGS)
+        encoding_menu.config(bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                             activebackground=GoldenTheme.BG_LIGHT,
+                             activeforeground=GoldenTheme.GOLD_PRIMARY,
+                             font=("Segoe UI", 9), relief="flat", highlightthickness=0)
+        encoding_menu.pack(side="left", padx=(10, 20))
+        
+        text_checks = [("Lone CR ends a line (old Mac files)", self.lone_cr),
+                       ("Repeat BOM in every part", self.repeat_bom)]
+        for text, variable in text_checks:
+            tk.Checkbutton(text_frame, text=text, variable=variable,
+                           bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                           selectcolor=GoldenTheme.BG_MEDIUM,
+                           activebackground=GoldenTheme.BG_CARD,
+                           activeforeground=GoldenTheme.GOLD_PRIMARY,
+                           font=("Segoe UI", 10), cursor="hand2").pack(side="left", padx=(0, 20))
+        
+        # Line filter: split only the matching lines
+        filter_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        filter_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        filter_fields = [("Only lines matching:", self.include_pattern),
+                         ("Leave out:", self.exclude_pattern)]
+        for text, variable in filter_fields:
+            tk.Label(filter_frame, text=text, 
+                    bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                    font=("Segoe UI", 10)).pack(side="left")
+            tk.Entry(filter_frame, textvariable=variable,
+                     bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                     insertbackground=GoldenTheme.GOLD_PRIMARY,
+                     font=("Segoe UI", 10), relief="flat", width=18).pack(
+                         side="left", padx=(10, 20), ipady=5)
+        
+        tk.Checkbutton(filter_frame, text="Ignore case",
+                       variable=self.filter_ignore_case,
+                       bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                       selectcolor=GoldenTheme.BG_MEDIUM,
+                       activebackground=GoldenTheme.BG_CARD,
+                       activeforeground=GoldenTheme.GOLD_PRIMARY,
+                       font=("Segoe UI", 10), cursor="hand2").pack(side="left")
+        
+        tk.Label(filter_frame, text="(regexes; empty = all lines)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left", padx=(10, 0))
+        
+        # Zero-copy toggle
+        zero_copy_check = tk.Checkbutton(card, text="⚡ Zero-copy mode (memory-mapped, copies whole part ranges)",
+                                         variable=self.zero_copy,
+                                         bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                         selectcolor=GoldenTheme.BG_MEDIUM,
+                                         activebackground=GoldenTheme.BG_CARD,
+                                         activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                         font=("Segoe UI", 10), cursor="hand2")
+        zero_copy_check.pack(anchor="w", padx=20, pady=(0, 10))
+        
+        # Resume toggle
+        resume_check = tk.Checkbutton(card, text="Resumable (journal finished parts; a re-run after a crash or cancel continues)",
+                                      variable=self.resume,
+                                      bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                      selectcolor=GoldenTheme.BG_MEDIUM,
+                                      activebackground=GoldenTheme.BG_CARD,
+                                      activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                      font=("Segoe UI", 10), cursor="hand2")
+        resume_check.pack(anchor="w", padx=20, pady=(0, 10))
+        
+        # Page cache toggle
+        drop_cache_check = tk.Checkbutton(card, text="Bypass page cache (sync and drop each part once written; for files larger than RAM)",
+                                          variable=self.drop_cache,
+                                          bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                                          selectcolor=GoldenTheme.BG_MEDIUM,
+                                          activebackground=GoldenTheme.BG_CARD,
+                                          activeforeground=GoldenTheme.GOLD_PRIMARY,
+                                          font=("Segoe UI", 10), cursor="hand2")
+        drop_cache_check.pack(anchor="w", padx=20, pady=(0, 10))
+        
+        # Parallel workers option
+        workers_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        workers_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        tk.Label(workers_frame, text="Parallel workers:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        self.workers_entry = tk.Entry(workers_frame, textvariable=self.workers,
+                                      bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                                      insertbackground=GoldenTheme.GOLD_PRIMARY,
+                                      font=("Segoe UI", 10), relief="flat", width=5)
+        self.workers_entry.pack(side="left", padx=(10, 10), ipady=5)
+        
+        tk.Label(workers_frame, text="(parts written concurrently in zero-copy mode; try 4-8 on SSD/NVMe)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        tk.Label(workers_frame, text="Files at once:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left", padx=(20, 0))
+        
+        tk.Entry(workers_frame, textvariable=self.batch_jobs,
+                 bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                 insertbackground=GoldenTheme.GOLD_PRIMARY,
+                 font=("Segoe UI", 10), relief="flat", width=5).pack(side="left", padx=(10, 0), ipady=5)
+        
+        # Output compression option
+        compress_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        compress_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        tk.Label(compress_frame, text="Compress parts:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        compress_menu = tk.OptionMenu(compress_frame, self.compress, "none", *available_codecs())
+        compress_menu.config(bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                             activebackground=GoldenTheme.BG_LIGHT,
+                             activeforeground=GoldenTheme.GOLD_PRIMARY,
+                             font=("Segoe UI", 9), relief="flat", highlightthickness=0)
+        compress_menu.pack(side="left", padx=(10, 10))
+        
+        tk.Label(compress_frame, text="(compressed inputs like .gz are always read transparently)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Manifest option
+        manifest_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        manifest_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        tk.Label(manifest_frame, text="Checksum manifest:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_PRIMARY,
+                font=("Segoe UI", 10)).pack(side="left")
+        
+        manifest_menu = tk.OptionMenu(manifest_frame, self.manifest, "none", *CHECKSUMS)
+        manifest_menu.config(bg=GoldenTheme.BG_MEDIUM, fg=GoldenTheme.TEXT_PRIMARY,
+                             activebackground=GoldenTheme.BG_LIGHT,
+                             activeforeground=GoldenTheme.GOLD_PRIMARY,
+                             font=("Segoe UI", 9), relief="flat", highlightthickness=0)
+        manifest_menu.pack(side="left", padx=(10, 10))
+        
+        tk.Label(manifest_frame, text="(JSON list of parts with checksums, computed while writing)", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        # Presets
+        presets_frame = tk.Frame(card, bg=GoldenTheme.BG_CARD)
+        presets_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        tk.Label(presets_frame, text="Quick presets:", 
+                bg=GoldenTheme.BG_CARD, fg=GoldenTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 9)).pack(side="left", padx=(0, 10))
+        
+        presets = [("1M lines", "1000000"), ("5M lines", "5000000"), 
+                   ("10M lines", "10000000"), ("50M lines", "50000000")]
+        
+        for text, value in presets:
+            btn = tk.Button(presets_frame, text=text, 
+                           command=lambda v=value: self._set_lines_preset(v),
+                           bg=GoldenTheme.BG_LIGHT, fg=GoldenTheme.GOLD_PRIMARY,
+                           font=("Segoe UI", 8), relief="flat", cursor="hand2",
+                           activebackground=GoldenTheme.GOLD_DARK)
+            btn.pack(side="left", padx=3, ipadx=8, ipady=2)
+    
+    def _create_progress_card(self, parent):
+        # Card frame
+        card = tk.Frame(parent, bg=GoldenTheme.BG_CARD)
+        card.pack(fill="x", pady=(0, 15))
+        
+        # Card header
+        header = tk.Label(card, text="📊 Progress", 
+                         bg=GoldenTheme.BG_CARD, fg=GoldenTheme.GOLD_PRIMARY,
+                         font=("Segoe UI", 12, "bold"))
+        header.pack(anchor="w", padx=20, pady=(15, 5))
+        
+        # Progress component
+        self.progress_card = ProgressCard(card)
+        self.progress_card.pack(fill="x")
+    
+    def _create_action_buttons(self, parent):
+        buttons_frame = tk.Frame(parent, bg=GoldenTheme.BG_DARK)
+        buttons_frame.pack(fill="x", pady=(10, 0))
+        
+        # Center the buttons
+        center_frame = tk.Frame(buttons_frame, bg=GoldenTheme.BG_DARK)
+        center_frame.pack()
+        
+        self.split_button = ModernButton(center_frame, "🚀 Start Splitting", 
+                                         command=self._start_split, width=180)
+        self.split_button.pack(side="left", padx=10)
+        
+        self.cancel_button = ModernButton(center_frame, "❌ Cancel", 
+                                          command=self._cancel_split, width=120)
+        self.cancel_button.pack(side="left", padx=10)
+        self.cancel_button.set_enabled(False)
+    
+    def _create_footer(self, parent):
+        footer_frame = tk.Frame(parent, bg=GoldenTheme.BG_DARK)
+        footer_frame.pack(fill="x", pady=(20, 0))
+        
+        footer_text = tk.Label(footer_frame, 
+                              text="GitHub: github.com/uniqueunique7x7 • Telegram: @username_uNique",
+                              bg=GoldenTheme.BG_DARK, fg=GoldenTheme.TEXT_SECONDARY,
+                              font=("Segoe UI", 9))
+        footer_text.pack()
+    
+    def _update_options_visibility(self):
+        frames = {"lines": self.lines_frame, "size": self.size_frame, "key": self.key_frame,
+                  "ratio": self.ratio_frame, "time": self.time_frame, "parts": self.parts_frame, "join": self.join_frame}
+        for method, frame in frames.items():
+            if method == self.split_method.get():
+                frame.pack(fill="x")
+            else:
+                frame.pack_forget()
+    
+    def _set_lines_preset(self, value):
+        self.split_method.set("lines")
+        self.lines_per_file.set(value)
+        self._update_options_visibility()
+    
+    def _browse_input(self):
+        filenames = filedialog.askopenfilenames(
+            title="Select Text File(s)",
+            filetypes=[("Text files", "*.txt"),
+                       ("CSV/TSV files", "*.csv *.tsv"),
+                       ("Split manifests", "*.manifest.json"),
+                       ("Compressed files", "*.gz *.bz2 *.xz *.zst"),
+                       ("All files", "*.*")],
+            initialdir=Path(__file__).parent  # Start in script directory
+        )
+        if len(filenames) > 1:
+            # Several files are split as a batch, each into its own folder
+            self.batch_files = list(filenames)
+            self.input_file.set("; ".join(filenames))
+            self.line_index = None
+            self.line_index_path = None
+            self._update_batch_info(filenames)
+        elif filenames:
+            filename = filenames[0]
+            self.batch_files = []
+            self.input_file.set(filename)
+            self.line_index = None
+            self.line_index_path = None
+            # Tables almost always start with one header row
+            if split_name(filename)[1].lower() in (".csv", ".tsv"):
+                self.header_lines.set("1")
+                self.csv_quoted.set(True)
+            self._update_file_info(filename, counting=self.exact_count.get())
+            if self.exact_count.get():
+                self._start_line_count(filename)
+    
+    def _selected_inputs(self):
+        """Files to split: the multi-selection, unless the entry was edited since"""
+        if len(self.batch_files) > 1 and self.input_file.get() == "; ".join(self.batch_files):
+            return self.batch_files
+        return [self.input_file.get()]
+    
+    def _update_batch_info(self, filenames):
+        try:
+            total = sum(Path(f).stat().st_size for f in filenames)
+        except OSError:
+            self.file_info_label.config(text=f"⚠️ Error reading file info", 
+                                        fg=GoldenTheme.ERROR)
+            return
+        info = f"📚 {len(filenames)} files, {total / (1024 * 1024 * 1024):.2f} GB in total"
+        out_root = self.output_dir.get() or default_output_dir(filenames[0]).parent
+        info += f"\n💾 Each file goes to its own <name>_split folder in: {out_root}"
+        self.file_info_label.config(text=info, fg=GoldenTheme.GOLD_LIGHT)
+    
+    def _browse_output(self):
+        dirname = filedialog.askdirectory(title="Select Output Directory")
+        if dirname:
+            self.output_dir.set(dirname)
+    
+    def _start_line_count(self, filename):
+        """Count lines and build the line-offset index in the background"""
+        def count_worker():
+            try:
+                index = get_line_index(filename,
+                                       is_cancelled=lambda: self.input_file.get() != filename)
+            except OSError:
+                index = None
+            self.progress_queue.put(("line_index", filename, index))
+        
+        threading.Thread(target=count_worker, daemon=True).start()
+    
+    def _update_file_info(self, filepath, exact_lines=None, counting=False):
+        try:
+            path = Path(filepath)
+            size_bytes = path.stat().st_size
+            size_mb = size_bytes / (1024 * 1024)
+            size_gb = size_bytes / (1024 * 1024 * 1024)
+            
+            if size_gb >= 1:
+                size_str = f"{size_gb:.2f} GB"
+            else:
+                size_str = f"{size_mb:.2f} MB"
+            
+            if exact_lines is not None:
+                lines_str = f"Lines: {exact_lines:,}"
+            else:
+                # Estimate line count (rough estimate: ~50 bytes per line average)
+                est_lines = size_bytes // 50
+                if est_lines >= 1_000_000_000:
+                    lines_str = f"~{est_lines/1_000_000_000:.1f}B lines"
+                elif est_lines >= 1_000_000:
+                    lines_str = f"~{est_lines/1_000_000:.1f}M lines"
+                else:
+                    lines_str = f"~{est_lines:,} lines"
+                lines_str = f"Estimated: {lines_str}"
+                if counting:
+                    lines_str += " (counting exactly...)"
+            
+            info = f"📄 Size: {size_str} | {lines_str}"
+            # Show where output will be saved (in script directory)
+            if not self.output_dir.get():
+                info += f"\n💾 Output will be saved to: {default_output_dir(filepath)}"
+            
+            self.file_info_label.config(text=info, fg=GoldenTheme.GOLD_LIGHT)
+        except Exception as e:
+            self.file_info_label.config(text=f"⚠️ Error reading file info", 
+                                        fg=GoldenTheme.ERROR)
+    
+    def _validate_inputs(self):
+        if not self.input_file.get():
+            messagebox.showerror("Error", "Please select an input file.")
+            return False
+        
+        inputs = self._selected_inputs()
+        missing = [f for f in inputs if not Path(f).exists()]
+        if missing:
+            messagebox.showerror("Error", f"Input file does not exist: {missing[0]}")
+            return False
+        if len(inputs) > 1 and self.split_method.get() == "join":
+            messagebox.showerror("Error", "Select one part or manifest to join.")
+            return False
+        
+        try:
+            if self.split_method.get() == "lines":
+                lines = int(self.lines_per_file.get().replace(',', '').replace('_', ''))
+                if lines <= 0:
+                    raise ValueError()
+            elif self.split_method.get() == "parts":
+                if int(self.part_count.get()) <= 0:
+                    raise ValueError()
+            elif self.split_method.get() == "key":
+                if int(self.buckets.get()) <= 0 or int(self.key_field.get()) <= 0:
+                    raise ValueError()
+            elif self.split_method.get() == "ratio":
+                int(self.ratio_seed.get())
+                ratios = self._ratios()
+                if len(ratios) < 2 or min(ratios) <= 0:
+                    raise ValueError()
+            elif self.split_method.get() == "time":
+                if self.time_field.get() and int(self.time_field.get()) <= 0:
+                    raise ValueError()
+            elif self.split_method.get() == "join":
+                pass
+            else:
+                size = int(self.size_mb.get())
+                if size <= 0:
+                    raise ValueError()
+            if (int(self.workers.get()) <= 0 or int(self.header_lines.get()) < 0
+                    or int(self.batch_jobs.get()) <= 0):
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid positive number.")
+            return False
+        
+        if self.split_method.get() == "key":
+            if not self.key_pattern.get() and not self.key_delimiter.get():
+                messagebox.showerror("Error", "Please enter a delimiter or a regex for the key.")
+                return False
+            try:
+                re.compile(self.key_pattern.get())
+            except re.error as e:
+                messagebox.showerror("Error", f"Invalid key regex: {e}")
+                return False
+        
+        if self.split_method.get() == "time":
+            try:
+                TimeWindow(self.time_window.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return False
+        
+        if self.lone_cr.get() and self.split_method.get() not in ("lines", "size", "join"):
+            messagebox.showerror("Error", "Lone CR line ends apply to splitting by lines or size.")
+            return False
+        
+        if self.include_pattern.get() or self.exclude_pattern.get():
+            if self.split_method.get() in ("parts", "time", "join"):
+                messagebox.showerror("Error", "Line filters apply to splitting by lines, size, key or ratio.")
+                return False
+            if self.resume.get():
+                messagebox.showerror("Error", "Filtered splits can't be resumed.")
+                return False
+            for pattern in (self.include_pattern.get(), self.exclude_pattern.get()):
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    messagebox.showerror("Error", f"Invalid filter regex: {e}")
+                    return False
+        
+        return True
+    
+    def _ratios(self):
+        ratios = [float(part) for part in self.ratios.get().split(":")]
+        return [int(ratio) if ratio.is_integer() else ratio for ratio in ratios]
+    
+    def _text_options(self):
+        """split_file keyword arguments for the encoding and line end fields"""
+        return {"encoding": self.encoding.get(),
+                "lone_cr": self.lone_cr.get(),
+                "repeat_bom": self.repeat_bom.get()}
+    
+    def _filter_options(self):
+        """split_file keyword arguments for the line filter fields"""
+        return {"include": [self.include_pattern.get()] if self.include_pattern.get() else None,
+                "exclude": [self.exclude_pattern.get()] if self.exclude_pattern.get() else None,
+                "ignore_case": self.filter_ignore_case.get()}
+    
+    def _start_split(self):
+        if not self._validate_inputs():
+            return
+        
+        self.is_processing = True
+        self.cancel_requested = False
+        self.split_button.set_enabled(False)
+        self.cancel_button.set_enabled(True)
+        self.progress_card.reset()
+        self.split_progress.reset()
+        self.split_timings.reset()
+        self.timing_split = self.progress_card.details_shown
+        self.batch_progress.reset()
+        self.batch_running = len(self._selected_inputs()) > 1
+        self.output_location = None
+        
+        # Start processing in a separate thread
+        thread = threading.Thread(target=self._split_worker, daemon=True)
+        thread.start()
+    
+    def _cancel_split(self):
+        self.cancel_requested = True
+        self.progress_queue.put(("status", "Cancelling..."))
+    
+    def _engine_options(self):
+        """SplitEngine keyword arguments for the options card"""
+        return {"strategy": "auto" if self.zero_copy.get() else "stream",
+                "workers": int(self.workers.get()),
+                "compress": None if self.compress.get() == "none" else self.compress.get(),
+                "resume": self.resume.get(),
+                "drop_cache": self.drop_cache.get(),
+                "manifest": None if self.manifest.get() == "none" else self.manifest.get()}
+    
+    def _split_options(self):
+        """split_file keyword arguments for the selected method"""
+        if self.split_method.get() == "lines":
+            return {"lines_per_file": int(self.lines_per_file.get().replace(',', '').replace('_', '')),
+                    "header_lines": int(self.header_lines.get()),
+                    "quoted": self.csv_quoted.get(),
+                    **self._filter_options(), **self._text_options()}
+        if self.split_method.get() == "parts":
+            return {"parts": int(self.part_count.get()), **self._text_options()}
+        if self.split_method.get() == "key":
+            return {"buckets": int(self.buckets.get()),
+                    "key_field": int(self.key_field.get()) - 1,
+                    "key_delimiter": self.key_delimiter.get().replace("\\t", "\t"),
+                    "key_pattern": self.key_pattern.get() or None,
+                    **self._filter_options(), **self._text_options()}
+        if self.split_method.get() == "ratio":
+            return {"ratios": self._ratios(),
+                    "seed": int(self.ratio_seed.get()),
+                    "by_number": self.ratio_by_number.get(),
+                    **self._filter_options(), **self._text_options()}
+        if self.split_method.get() == "time":
+            return {"window": self.time_window.get(),
+                    "time_field": int(self.time_field.get()) - 1 if self.time_field.get() else None,
+                    "time_delimiter": self.time_delimiter.get().replace("\\t", "\t"),
+                    "time_format": self.time_format.get() or None,
+                    "name_by_window": self.name_by_window.get(),
+                    **self._text_options()}
+        return {"max_size_bytes": int(self.size_mb.get()) * 1024 * 1024,
+                "header_lines": int(self.header_lines.get()),
+                "quoted": self.csv_quoted.get(),
+                **self._filter_options(), **self._text_options()}
+    
+    def _batch_worker(self, inputs):
+        runner = BatchRunner(jobs=int(self.batch_jobs.get()),
+                             report=self.progress_queue.put,
+                             is_cancelled=lambda: self.cancel_requested,
+                             progress=self.batch_progress,
+                             **self._engine_options())
+        result = runner.run(inputs, self.output_dir.get() or None, **self._split_options())
+        self.output_location = result.jobs[0].output_dir.parent
+        summary = "\n".join(result.summary(limit=15))
+        failed = f", {len(result.failed)} failed" if result.failed else ""
+        if not self.cancel_requested:
+            self.progress_queue.put(("complete", f"Batch completed: {len(inputs)} files{failed}\n\n{summary}"))
+        else:
+            self.progress_queue.put(("cancelled", f"Batch cancelled.\n\n{summary}"))
+    
+    def _split_worker(self):
+        try:
+            inputs = self._selected_inputs()
+            if len(inputs) > 1:
+                self._batch_worker(inputs)
+                return
+            
+            engine = SplitEngine(report=self.progress_queue.put,
+                                 is_cancelled=lambda: self.cancel_requested,
+                                 progress=self.split_progress,
+                                 timings=self.split_timings if self.timing_split else None,
+                                 **self._engine_options())
+            
+            if self.split_method.get() == "join":
+                joiner = JoinEngine(report=self.progress_queue.put,
+                                    is_cancelled=lambda: self.cancel_requested,
+                                    progress=self.split_progress,
+                                    workers=int(self.workers.get()))
+                # Splits don't write a manifest by default, so only verify against one that exists
+                verify = (self.verify_join.get()
+                          and find_parts(self.input_file.get()).manifest is not None)
+                result = joiner.join(self.input_file.get(), self.output_dir.get() or None,
+                                     verify=verify)
+                self.output_location = result.output_file.parent
+                verified = "\n\nChecksums verified." if result.verified else ""
+                if not self.cancel_requested:
+                    self.progress_queue.put(("complete", f"Join completed successfully!\n\nOutput file:\n{result.output_file}{verified}"))
+                else:
+                    self.progress_queue.put(("cancelled", "Operation cancelled."))
+                return
+            
+            line_index = None
+            if (self.split_method.get() == "lines" and self.line_index_path == self.input_file.get()
+                    and self.line_index.matches(self.line_index_path)):
+                line_index = self.line_index
+            result = engine.split_file(self.input_file.get(), self.output_dir.get(),
+                                       line_index=line_index, **self._split_options())
+            
+            self.output_location = result.output_dir
+            filtered = ""
+            if result.matched is not None:
+                filtered = f"\n\nKept {result.matched:,} matching lines, left out {result.dropped:,}."
+            if not self.cancel_requested:
+                self.progress_queue.put(("complete", f"Split completed successfully!{filtered}\n\nOutput location:\n{result.output_dir}"))
+            else:
+                self.progress_queue.put(("cancelled", "Operation cancelled."))
+        
+        except Exception as e:
+            self.progress_queue.put(("error", str(e)))
+    
+    def _start_queue_handler(self):
+        self._process_queue()
+    
+    def _process_queue(self):
+        try:
+            while True:
+                msg = self.progress_queue.get_nowait()
+                
+                if msg[0] == "status":
+                    self.progress_card.set_status(msg[1])
+                
+                elif msg[0] == "line_index":
+                    filename, index = msg[1], msg[2]
+                    if filename == self.input_file.get():
+                        if index is not None:
+                            self.line_index = index
+                            self.line_index_path = filename
+                        self._update_file_info(filename, index.line_count if index else None)
+                
+                elif msg[0] == "complete":
+                    self._finish_processing(True, msg[1])
+                
+                elif msg[0] == "cancelled":
+                    self._finish_processing(False, msg[1])
+                
+                elif msg[0] == "error":
+                    self._finish_processing(False, f"Error: {msg[1]}")
+        
+        except queue.Empty:
+            pass
+        
+        # One sample per tick, however often the engine updated meanwhile
+        if self.is_processing:
+            progress = self._shown_progress()
+            if progress.percent is not None:
+                self.progress_card.update_progress(progress.percent, "", progress.lines,
+                                                   progress.files)
+            self.progress_card.set_details(self._details())
+        
+        # Schedule next check
+        self.root.after(50, self._process_queue)
+    
+    def _shown_progress(self):
+        return self.batch_progress if self.batch_running else self.split_progress
+    
+    def _details(self):
+        """Per-file state of a batch, or where a single split spends its time"""
+        if self.batch_running:
+            return "\n".join(BatchResult(self.batch_progress.jobs).summary(limit=20))
+        if not self.timing_split:
+            return "Open Details before starting a split to time it"
+        return self.split_timings.summary()
+    
+    def _finish_processing(self, success, message):
+        self.is_processing = False
+        self.split_button.set_enabled(True)
+        self.cancel_button.set_enabled(False)
+        self.progress_card.set_details(self._details())
+        
+        if success:
+            progress = self._shown_progress()
+            self.progress_card.update_progress(100, "", progress.lines, progress.files)
+            result = messagebox.showinfo("Success", message + "\n\nWould you like to open the output folder?")
+            if self.output_location is not None:
+                try:
+                    # Open the folder in file explorer
+                    os.startfile(self.output_location)
+                except Exception as e:
+                    pass
+        else:
+            messagebox.showwarning("Stopped", message)
+    
+    def run(self):
+        self.root.mainloop()
+
+
+def main():
+    app = TextSplitterGUI()
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
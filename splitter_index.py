@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Line Index
+Exact line counting and a sparse line-offset index cached beside the input
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from splitter_codecs import InputFile, detect_codec
+from splitter_engine import CHUNK_SIZE, PLAN_WINDOW, find_nth_newline, skip_lines
+
+
+INDEX_STRIDE = 100_000            # Lines between two recorded offsets
+INDEX_SUFFIX = ".lineidx"
+
+# magic, file size, file mtime_ns, stride, line count, number of offsets
+_HEADER = struct.Struct("<8sQqQQQ")
+_MAGIC = b"TSLIDX01"
+
+
+class LineIndex:
+    """Byte offset of every stride-th line of one version of a file"""
+
+    def __init__(self, size, mtime_ns, stride, line_count, offsets):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.stride = stride
+        self.line_count = line_count
+        # offsets[k] is where line k * stride starts (lines are 0-based)
+        self.offsets = offsets
+
+    def matches(self, path):
+        """True if the index still describes the file at path"""
+        st = os.stat(path)
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    def line_offset(self, data, line):
+        """Byte offset where 0-based line starts; data is the mapped file contents"""
+        if line >= self.line_count:
+            return self.size
+        checkpoint = line // self.stride
+        return skip_lines(data, self.offsets[checkpoint], line - checkpoint * self.stride)
+
+
+class LineIndexBuilder:
+    """Builds a LineIndex from consecutive chunks of a file as they go past"""
+
+    def __init__(self, mtime_ns, stride=INDEX_STRIDE):
+        self.mtime_ns = mtime_ns
+        self.stride = stride
+        self.offsets = array("Q", [0])
+        self.next_line = stride      # Next line whose start gets recorded
+        self.lines = 0               # Newlines seen so far
+        self.size = 0
+        self.last_byte = 0x0A
+        self._index = None
+
+    def feed(self, buf, n):
+        """Account for buf[:n], the next n bytes of the file"""
+        if not n:
+            return
+        pos = 0
+        while True:
+            found = buf.count(b"\n", pos, n)
+            if self.lines + found < self.next_line:
+                self.lines += found
+                break
+            pos = find_nth_newline(buf, pos, n, self.next_line - self.lines) + 1
+            self.lines = self.next_line
+            self.offsets.append(self.size + pos)
+            self.next_line += self.stride
+        self.last_byte = buf[n - 1]
+        self.size += n
+
+    def tap(self, chunks):
+        """Pass (buffer, length) chunks through, feeding each one on the way"""
+        for buf, n in chunks:
+            self.feed(buf, n)
+            yield buf, n
+
+    def finish(self):
+        if self._index is None:
+            lines = self.lines
+            # A final line without a trailing newline still counts, and a
+            # checkpoint sitting exactly at end of file names a line that
+            # doesn't exist
+            if self.last_byte != 0x0A:
+                lines += 1
+            while len(self.offsets) > 1 and self.offsets[-1] >= self.size:
+                self.offsets.pop()
+            self._index = LineIndex(self.size, self.mtime_ns, self.stride, lines,
+                                    self.offsets)
+        return self._index
+
+
+def build_line_index(path, stride=INDEX_STRIDE, chunk_size=CHUNK_SIZE,
+                     is_cancelled=None):
+    """Count lines exactly with large binary reads, recording every stride-th line start
+
+    Compressed files are counted through the decompressor; their offsets
+    describe the decompressed data. Returns None if cancelled part way through.
+    """
+    is_cancelled = is_cancelled or (lambda: False)
+    builder = LineIndexBuilder(os.stat(path).st_mtime_ns, stride)
+    buf = bytearray(chunk_size)
+
+    with InputFile(path) as source, memoryview(buf) as view:
+        while True:
+            if is_cancelled():
+                return None
+            n = source.stream.readinto(view)
+            if not n:
+                break
+            builder.feed(buf, n)
+
+    return builder.finish()
+
+
+def index_mapped(data, mtime_ns, stride=INDEX_STRIDE, window_size=PLAN_WINDOW):
+    """Build a LineIndex over an already mapped file"""
+    builder = LineIndexBuilder(mtime_ns, stride)
+    for start in range(0, len(data), window_size):
+        window = data[start:start + window_size]
+        builder.feed(window, len(window))
+    return builder.finish()
+
+
+def _cache_dir():
+    if os.name == "nt":
+        root = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(root) / "TextSplitter" / "index"
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "text-splitter" / "index"
+
+
+def index_locations(path):
+    """Sidecar next to the input first, then the per-user cache directory"""
+    path = Path(path).resolve()
+    digest = hashlib.sha1(str(path).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return [path.with_name(path.name + INDEX_SUFFIX),
+            _cache_dir() / f"{path.stem}-{digest}{INDEX_SUFFIX}"]
+
+
+def save_line_index(index, path):
+    """Write the index to the first writable location; returns where it went, or None"""
+    offsets = index.offsets
+    if sys.byteorder == "big":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    header = _HEADER.pack(_MAGIC, index.size, index.mtime_ns, index.stride,
+                          index.line_count, len(index.offsets))
+
+    for location in index_locations(path):
+        try:
+            location.parent.mkdir(parents=True, exist_ok=True)
+            tmp = location.with_name(location.name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(header)
+                offsets.tofile(f)
+            os.replace(tmp, location)
+            return location
+        except OSError:
+            continue
+    return None
+
+
+def load_line_index(path):
+    """Cached index for path if one exists and the file hasn't changed since"""
+    for location in index_locations(path):
+        try:
+            with open(location, "rb") as f:
+                magic, size, mtime_ns, stride, line_count, count = _HEADER.unpack(
+                    f.read(_HEADER.size))
+                offsets = array("Q")
+                offsets.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            continue
+        if magic != _MAGIC:
+            continue
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        index = LineIndex(size, mtime_ns, stride, line_count, offsets)
+        try:
+            if index.matches(path):
+                return index
+        except OSError:
+            return None
+    return None
+
+
+def line_offset(path, line):
+    """Byte offset where 0-based line of path starts, via the cached index"""
+    if detect_codec(path) is not None:
+        # The index of a compressed file counts decompressed bytes
+        raise ValueError("Line offsets need an uncompressed input file")
+    index = get_line_index(path)
+    if line >= index.line_count:
+        return index.size
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return index.line_offset(mm, line)
+
+
+def get_line_index(path, stride=INDEX_STRIDE, is_cancelled=None, use_cache=True):
+    """Cached index for path, building and caching it on a miss
+
+    Without use_cache the index is always built and never written.
+    """
+    index = load_line_index(path) if use_cache else None
+    if index is None:
+        index = build_line_index(path, stride, is_cancelled=is_cancelled)
+        # Only worth caching if the offsets can be seeked to, i.e. not compressed,
+        # and the file didn't change while it was being counted
+        if (use_cache and index is not None and detect_codec(path) is None
+                and index.matches(path)):
+            save_line_index(index, path)
+    return index
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Join
+Reassembles the numbered parts of a split into one file
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+
+from splitter_codecs import get_codec
+from splitter_engine import COPY_SLICE, RangeCopier, SplitProgress, preallocate
+from splitter_manifest import MANIFEST_SUFFIX, load_manifest
+
+# data_part_0001.txt -> base "data", number "0001", extension ".txt"
+PART_NAME = re.compile(r"^(?P<base>.+)_part_(?P<number>\d{4,})(?P<ext>(\.[^.]*)*)$")
+
+
+class PartSet:
+    """The parts of one split, in order, with the manifest entries if there is one"""
+
+    def __init__(self, directory, base_name, file_ext, paths, manifest=None):
+        self.directory = Path(directory)
+        self.base_name = base_name
+        self.file_ext = file_ext          # As the parts are named, codec suffix included
+        self.paths = paths
+        self.manifest = manifest
+        self.entries = manifest["parts"] if manifest is not None else [None] * len(paths)
+
+    @property
+    def default_name(self):
+        return f"{self.base_name}_joined{self.file_ext}"
+
+
+def _from_manifest(path):
+    manifest = load_manifest(path)
+    directory = Path(path).parent
+    entries = sorted(manifest["parts"], key=lambda entry: entry["part"])
+    if not entries:
+        raise ValueError(f"The manifest lists no parts: {path}")
+    manifest["parts"] = entries
+    file_ext = manifest["file_ext"]
+    if manifest["compress"] is not None:
+        file_ext += get_codec(manifest["compress"]).suffix
+    return PartSet(directory, manifest["base_name"], file_ext,
+                   [directory / entry["name"] for entry in entries], manifest)
+
+
+def _scan(directory):
+    """{(base name, extension): {number: path}} of every part file in directory"""
+    groups = {}
+    for path in directory.iterdir():
+        match = PART_NAME.match(path.name)
+        if match is None or path.name.endswith(".tmp") or not path.is_file():
+            continue
+        numbers = groups.setdefault((match["base"], match["ext"]), {})
+        numbers[int(match["number"])] = path
+    return groups
+
+
+def find_parts(source):
+    """PartSet for source: a manifest, any one part, or the folder holding the parts
+
+    A manifest beside the parts is used when there is one; otherwise parts
+    are found by their _part_NNNN names and must be numbered 1..N without
+    gaps.
+    """
+    source = Path(source)
+    if source.is_dir():
+        directory, name = source, None
+    else:
+        source.stat()  # A missing file fails here rather than as "no parts"
+        directory, name = source.parent, source.name
+    if name is not None and name.endswith(MANIFEST_SUFFIX):
+        return _from_manifest(source)
+
+    manifests = sorted(directory.glob("*" + MANIFEST_SUFFIX))
+    groups = _scan(directory)
+    if name is not None:
+        match = PART_NAME.match(name)
+        if match is None:
+            raise ValueError(f"Not a part file or manifest: {source}")
+        for path in manifests:
+            try:
+                if any(entry["name"] == name for entry in load_manifest(path)["parts"]):
+                    return _from_manifest(path)
+            except (OSError, ValueError, KeyError):
+                continue
+        key = (match["base"], match["ext"])
+    elif len(manifests) == 1:
+        return _from_manifest(manifests[0])
+    elif len(groups) == 1:
+        key, = groups
+    elif not groups:
+        raise ValueError(f"No part files in {directory}")
+    else:
+        names = ", ".join(sorted(f"{base}{ext}" for base, ext in groups))
+        raise ValueError(f"{directory} holds the parts of several splits ({names}); "
+                         f"select one of the parts or a manifest instead")
+
+    numbers = groups.get(key, {})
+    for number in range(1, len(numbers) + 1):
+        if number not in numbers:
+            raise ValueError(f"Part {number} of {key[0]}{key[1]} is missing")
+    return PartSet(directory, key[0], key[1], [numbers[n] for n in sorted(numbers)])
+
+
+class JoinResult:
+    """Summary of a finished or cancelled join"""
+
+    def __init__(self, output_file):
+        self.output_file = Path(output_file)
+        self.files = 0
+        self.lines = None
+        self.bytes = 0
+        self.verified = False
+        self.cancelled = False
+
+    def to_dict(self):
+        return {
+            "output_file": str(self.output_file),
+            "files": self.files,
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "verified": self.verified,
+            "cancelled": self.cancelled,
+        }
+
+
+class JoinEngine:
+    """Concatenates parts into a preallocated output, copying in the kernel where possible
+
+    Each part is copied to its own offset of the output, so with workers > 1
+    parts are copied (and verified) concurrently. Repeated headers recorded
+    in a manifest are kept only in the first part.
+    """
+
+    def __init__(self, report=None, is_cancelled=None, progress=None, workers=1):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.report = report or (lambda msg: None)
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.progress = progress or SplitProgress()
+        self.workers = workers
+
+    def join(self, source, output=None, verify=False):
+        """Join the parts found from source (see find_parts) into output
+
+        output is a file, a folder to put <base>_joined<ext> in, or None for
+        the parts' own folder. verify checks every part against the CRC32
+        and SHA-256 in the manifest while it is copied; a mismatch raises
+        ValueError and leaves no output behind.
+        """
+        parts = find_parts(source)
+        manifest = parts.manifest
+        if verify and manifest is None:
+            raise ValueError("Verifying needs a manifest; split with a checksum manifest first")
+
+        output = Path(output) if output else parts.directory
+        if output.is_dir():
+            output = output / parts.default_name
+        if any(output.resolve() == path.resolve() for path in parts.paths):
+            raise ValueError(f"The output would overwrite one of the parts: {output}")
+
+        # (path, bytes of repeated header to skip, bytes to copy, output offset, entry)
+        plan = []
+        offset = 0
+        for number, (path, entry) in enumerate(zip(parts.paths, parts.entries), 1):
+            size = path.stat().st_size
+            skip = 0
+            if entry is not None:
+                if size != entry["bytes"]:
+                    raise ValueError(f"{path.name} has {size:,} bytes, "
+                                     f"the manifest says {entry['bytes']:,}")
+                if number > 1:
+                    skip = entry.get("header_bytes", 0)
+            if skip and manifest["compress"] is not None:
+                raise ValueError("Compressed parts that repeat a header can't be joined "
+                                 "byte for byte; decompress them first")
+            plan.append((path, skip, size - skip, offset, entry))
+            offset += size - skip
+        total = offset
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        result = JoinResult(output)
+        self.progress.reset(total)
+        self.report(("status", f"Joining {len(plan)} parts into: {output}"))
+        if manifest is not None and manifest.get("method") in ("key", "ratio"):
+            self.report(("status", f"Parts of a split by {manifest['method']} are joined in "
+                                   f"part order; the original line order isn't restored"))
+
+        tmp = output.with_name(output.name + ".tmp")
+        lock = threading.Lock()
+        done = {"bytes": 0, "files": 0}
+        bad = []
+
+        def copied(length, finished=False):
+            with lock:
+                done["bytes"] += length
+                done["files"] += finished
+                self.progress.update(done["bytes"], None, done["files"])
+
+        def join_part(item):
+            path, skip, length, out_offset, entry = item
+            if self.is_cancelled():
+                return
+            crc = 0
+            sha256 = hashlib.sha256() if verify and "sha256" in entry else None
+            with open(path, "rb") as src, open(tmp, "r+b", buffering=0) as dst:
+                if not skip + length:
+                    copied(0, True)
+                    return
+                os.lseek(dst.fileno(), out_offset, os.SEEK_SET)
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    copier = RangeCopier(src.fileno(), view)
+                    if verify and skip:
+                        crc = zlib.crc32(view[:skip])
+                        if sha256 is not None:
+                            sha256.update(view[:skip])
+                    end = skip + length
+                    for start in range(skip, end, COPY_SLICE):
+                        if self.is_cancelled():
+                            return
+                        n = min(COPY_SLICE, end - start)
+                        copier.copy(dst.fileno(), start, n)
+                        if verify:
+                            crc = zlib.crc32(view[start:start + n], crc)
+                            if sha256 is not None:
+                                sha256.update(view[start:start + n])
+                        copied(n, start + n == end)
+                    if not length:
+                        # A part holding nothing but the header it repeats
+                        copied(0, True)
+            if verify and (f"{crc:08x}" != entry["crc32"] or
+                           (sha256 is not None and sha256.hexdigest() != entry["sha256"])):
+                with lock:
+                    bad.append(path.name)
+
+        try:
+            with open(tmp, "wb") as out:
+                # Sized up front so parts can land at their offsets
+                preallocate(out.fileno(), total)
+            if self.workers == 1:
+                for item in plan:
+                    join_part(item)
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    for future in [pool.submit(join_part, item) for item in plan]:
+                        future.result()
+            if bad:
+                raise ValueError(f"Checksum mismatch in {len(bad)} part(s): "
+                                 f"{', '.join(sorted(bad))}")
+            result.cancelled = self.is_cancelled()
+            if not result.cancelled:
+                os.replace(tmp, output)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+        if not result.cancelled:
+            result.files = len(plan)
+            result.bytes = total
+            result.verified = verify
+            if manifest is not None and manifest.get("lines") is not None:
+                result.lines = manifest["lines"] + manifest.get("header_lines", 0)
+            self.progress.finished = True
+            self.report(("status", f"Joined {result.files} parts into {output}"
+                                   + (" (checksums verified)" if verify else "")))
+        return result
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Journal
+Records finished parts of a split so an interrupted run can resume
+"""
+
+import json
+import os
+from pathlib import Path
+
+from splitter_manifest import file_checksums
+
+JOURNAL_VERSION = 1
+
+
+def journal_path(output_dir, base_name, file_ext):
+    """Where the journal of a split into output_dir lives, e.g. .data.txt.journal"""
+    return Path(output_dir) / f".{base_name}{file_ext}.journal"
+
+
+class SplitJournal:
+    """Append-only log of finished parts: one JSON line for the job, then one per part
+
+    Parts are only logged after they were renamed into place, so a logged
+    part is complete unless it was changed afterwards, which resuming
+    checks by size and CRC32. The journal is removed when the split
+    completes, and ignored if it describes a different job.
+    """
+
+    def __init__(self, path, job):
+        self.path = Path(path)
+        self.job = job
+        self.parts = {}           # Part number -> entry of a verified part
+        self._file = None
+
+    @classmethod
+    def open(cls, output_dir, base_name, file_ext, job):
+        """Journal for job in output_dir, keeping the verified parts of an earlier run"""
+        journal = cls(journal_path(output_dir, base_name, file_ext), job)
+        for entry in journal._read():
+            if journal._verify(entry):
+                journal.parts[entry["part"]] = entry
+
+        # Rewrite without entries that failed verification or were cut off
+        tmp = journal.path.with_name(journal.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(job) + "\n")
+            for number in sorted(journal.parts):
+                f.write(json.dumps(journal.parts[number]) + "\n")
+        os.replace(tmp, journal.path)
+        journal._file = open(journal.path, "a", encoding="utf-8")
+        return journal
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return []
+        try:
+            if not lines or json.loads(lines[0]) != self.job:
+                return []
+        except ValueError:
+            return []
+        entries = []
+        for line in lines[1:]:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break             # Torn final write of a killed run
+        return entries
+
+    def _verify(self, entry):
+        path = self.path.parent / entry["name"]
+        try:
+            if path.stat().st_size != entry["bytes"]:
+                return False
+            return int(file_checksums(path, ("crc32",))["crc32"], 16) == entry["crc32"]
+        except OSError:
+            return False
+
+    def resume_point(self):
+        """(parts done, input offset) after the unbroken run of verified parts from part 1"""
+        done = 0
+        offset = None
+        while done + 1 in self.parts:
+            done += 1
+            offset = self.parts[done]["end"]
+        return done, offset
+
+    def record(self, entry):
+        """Log a finished part; flushed to disk before returning"""
+        self.parts[entry["part"]] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """The split completed: the journal isn't needed any more"""
+        self.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Manifest
+JSON record of the parts of a split, with checksums computed while writing
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+CHECKSUMS = ("crc32", "sha256")   # crc32 is always recorded; sha256 on request
+CHECK_BLOCK = 8 * 1024 * 1024     # Read size when checksumming a part file
+
+
+def manifest_path(output_dir, base_name, file_ext):
+    """Where the manifest of a split into output_dir lives, e.g. data.txt.manifest.json"""
+    return Path(output_dir) / f"{base_name}{file_ext}{MANIFEST_SUFFIX}"
+
+
+def part_record(entry):
+    """Manifest form of a part entry: checksums as hex strings"""
+    record = dict(entry)
+    if entry.get("crc32") is not None:
+        record["crc32"] = f"{entry['crc32']:08x}"
+    return record
+
+
+def write_manifest(path, manifest):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load_manifest(path):
+    """Parsed manifest; ValueError if it isn't one this version understands"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            manifest = json.load(f)
+        except ValueError:
+            raise ValueError(f"Not a split manifest: {path}")
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported split manifest: {path}")
+    return manifest
+
+
+def file_checksums(path, names=CHECKSUMS):
+    """Hex checksums of the file at path, one per name in names"""
+    crc = 0 if "crc32" in names else None
+    sha256 = hashlib.sha256() if "sha256" in names else None
+    with open(path, "rb", buffering=0) as f:
+        buf = bytearray(CHECK_BLOCK)
+        with memoryview(buf) as view:
+            while True:
+                n = f.readinto(view)
+                if not n:
+                    break
+                if crc is not None:
+                    crc = zlib.crc32(view[:n], crc)
+                if sha256 is not None:
+                    sha256.update(view[:n])
+    sums = {}
+    if crc is not None:
+        sums["crc32"] = f"{crc:08x}"
+    if sha256 is not None:
+        sums["sha256"] = sha256.hexdigest()
+    return sums
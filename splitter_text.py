@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Line Format
+Finds the line ends of UTF-16 and lone-CR text, and the BOM to repeat, on raw bytes
+"""
+
+from splitter_codecs import InputFile
+
+ENCODINGS = ("auto", "bytes", "utf-16-le", "utf-16-be")
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = (
+    ("utf-32-le", b"\xff\xfe\x00\x00"),
+    ("utf-32-be", b"\x00\x00\xfe\xff"),
+    ("utf-8", b"\xef\xbb\xbf"),
+    ("utf-16-le", b"\xff\xfe"),
+    ("utf-16-be", b"\xfe\xff"),
+)
+
+# Low byte of a UTF-16 code unit -> LF or CR as they are, anything else a space;
+# high byte -> zero as it is, anything else 0x20, which spoils an LF or CR when ORed in
+_LOW_ENDS = bytes(b if b in (0x0A, 0x0D) else 0x20 for b in range(256))
+_HIGH_SET = bytes([0]) + bytes([0x20]) * 255
+_CR_TO_LF = bytes.maketrans(b"\r", b"\n")
+
+
+def read_head(path, size=4):
+    """First size bytes of the file at path (fewer if it is shorter), decompressed if need be"""
+    with InputFile(path) as source:
+        head = b""
+        while len(head) < size:
+            data = source.stream.read(size - len(head))
+            if not data:
+                break
+            head += data
+        return head
+
+
+def detect_bom(head):
+    """(encoding, BOM) of the byte order mark head starts with, or (None, b"")"""
+    for encoding, bom in BOMS:
+        if head.startswith(bom):
+            return encoding, bom
+    return None, b""
+
+
+class LineFormat:
+    """Where the lines of an input end, found on its raw bytes without decoding it
+
+    encoding is "bytes" for UTF-8, ASCII, Latin-1 and the like, whose lines
+    end after the byte 0x0A (so CRLF lines keep their CR), "utf-16-le" or
+    "utf-16-be", whose lines end after a U+000A code unit at an even
+    offset, or "auto": UTF-16 if the input starts with a UTF-16 BOM, bytes
+    otherwise. lone_cr also ends lines at a CR not followed by an LF, as in
+    old Mac files or a mix of them with others. With repeat_bom, a BOM the
+    input starts with becomes part of the header every part starts with,
+    so each part decodes on its own and joining the parts drops it again.
+    """
+
+    def __init__(self, encoding="auto", lone_cr=False, repeat_bom=True):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding} (one of {', '.join(ENCODINGS)})")
+        self.requested = encoding
+        self.encoding = "bytes" if encoding == "auto" else encoding
+        self.lone_cr = lone_cr
+        self.repeat_bom = repeat_bom
+        self.bom = b""
+
+    def detect(self, head):
+        """Settle the encoding and BOM from the first bytes of the input; returns self"""
+        encoding, bom = detect_bom(head)
+        if encoding in ("utf-32-le", "utf-32-be"):
+            raise ValueError("UTF-32 input isn't supported; convert it to UTF-8 or UTF-16 first")
+        if self.requested == "auto" and encoding in ("utf-16-le", "utf-16-be"):
+            self.encoding = encoding
+        # A BOM of another encoding than the input's is just data
+        if encoding == self.encoding or (encoding == "utf-8" and self.encoding == "bytes"):
+            self.bom = bom
+        return self
+
+    @property
+    def unit(self):
+        """Bytes per code unit: chunks of UTF-16 input are cut at even offsets"""
+        return 1 if self.encoding == "bytes" else 2
+
+    @property
+    def plain(self):
+        """True if lines end exactly after each 0x0A byte, so the raw bytes can be scanned"""
+        return self.unit == 1 and not self.lone_cr
+
+    @property
+    def header(self):
+        """The BOM every part starts with; b"" if there is none or it isn't repeated"""
+        return self.bom if self.repeat_bom else b""
+
+    def to_dict(self):
+        return {
+            "encoding": self.encoding,
+            "lone_cr": self.lone_cr,
+            "bom": self.bom.hex() or None,
+            "repeat_bom": self.repeat_bom,
+        }
+
+    def scanner(self):
+        """Scanner for the copiers' boundary scans; None when the raw bytes will do"""
+        return None if self.plain else _LineEndScanner(self)
+
+    def hold_cr(self, chunks):
+        """Pass chunks on so that none ends in a CR whose LF may start the next one"""
+        if not self.lone_cr:
+            yield from chunks
+            return
+        cr = {"bytes": b"\r", "utf-16-le": b"\r\x00", "utf-16-be": b"\x00\r"}[self.encoding]
+        size = len(cr)
+        held = b""
+        for buf, n in chunks:
+            if held:
+                buf = bytearray(held) + buf[:n]
+                n = len(buf)
+            # Chunks start on a code unit, so only an aligned one can be held back
+            held = cr if n >= size and n % size == 0 and buf[n - size:n] == cr else b""
+            n -= len(held)
+            if n:
+                yield buf, n
+        if held:
+            yield bytearray(held), len(held)
+
+
+def _cr_ends(data):
+    """data with b"\\n" at every LF and every CR not followed by one, blanks for the CR of CRLF"""
+    if data.find(b"\r\n") >= 0:
+        data = data.replace(b"\r\n", b" \n")
+    return data.translate(_CR_TO_LF)
+
+
+class _LineEndScanner:
+    """Marks the line ends of UTF-16 or lone-CR text for the copiers' newline scans
+
+    scan() returns the chunk as it is if it holds no byte that could end a
+    line, and otherwise a same-length copy holding b"\\n" at the last byte
+    of every line end and nowhere else. UTF-16 code units are classified
+    all at once: translate() maps the low and high bytes of every unit to
+    one byte each, and an OR of the two as big integers leaves LF or CR
+    only for the units U+000A and U+000D. Chunks have to start on a code
+    unit, and with lone_cr must not end in a CR (see LineFormat.hold_cr).
+    """
+
+    def __init__(self, line_format):
+        self.utf16 = line_format.unit == 2
+        self.big_endian = line_format.encoding == "utf-16-be"
+        self.lone_cr = line_format.lone_cr
+
+    def scan(self, buf, n):
+        has_cr = self.lone_cr and buf.find(b"\r", 0, n) >= 0
+        if not self.utf16:
+            # Bytes only come here for lone_cr
+            if not has_cr:
+                return buf
+            return _cr_ends(buf[:n])
+        if not has_cr and buf.find(b"\n", 0, n) < 0:
+            return buf
+        first, second = buf[0:n:2], buf[1:n:2]
+        low, high = (second, first) if self.big_endian else (first, second)
+        # A trailing odd byte isn't a whole code unit
+        count = len(second)
+        low = low[:count].translate(_LOW_ENDS)
+        high = high[:count].translate(_HIGH_SET)
+        units = (int.from_bytes(low, "big") | int.from_bytes(high, "big")).to_bytes(count, "big")
+        if has_cr:
+            units = _cr_ends(units)
+        scan = bytearray(b" ") * n
+        scan[1::2] = units
+        return scan
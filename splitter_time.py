@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Text File Splitter Time Windows
+Finds where each time window of a time-sorted input starts by binary search
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from splitter_engine import PartRange
+
+# 2024-05-01, 2024-05-01 13:45, 2024-05-01T13:45:10(.123)(Z|+02:00); the zone is ignored
+ISO_STAMP = re.compile(rb"(\d{4})-(\d\d)-(\d\d)(?:[T ](\d\d):(\d\d)(?::(\d\d))?)?")
+EPOCH_STAMP = re.compile(rb"\d+(?:\.\d+)?")
+EPOCH = datetime(1970, 1, 1)
+
+# Unit -> (seconds, file name label of a window start); months are calendar months
+WINDOW_UNITS = {
+    "s": (1, "%Y-%m-%dT%H%M%S"),
+    "m": (60, "%Y-%m-%dT%H%M"),
+    "h": (3600, "%Y-%m-%dT%H"),
+    "d": (86400, "%Y-%m-%d"),
+    "mo": (None, "%Y-%m"),
+}
+
+
+def timestamp_key(field=None, delimiter=",", pattern=None, fmt=None):
+    """Function returning the timestamp of a line (given without its newline), None if it has none
+
+    The text looked at is the 0-based field of a delimiter-separated line,
+    the first capture group of the regex pattern (the whole match if it has
+    none), or the whole line. fmt is a strptime format, "epoch" for Unix
+    seconds, or None for the first ISO 8601 date and time in the text.
+    Timestamps are naive wall-clock datetimes: a zone suffix is ignored.
+    A strptime format without field or pattern parses the start of the
+    line, so it has to have a fixed width (e.g. "%d/%b/%Y:%H:%M:%S").
+    """
+    if pattern is not None:
+        try:
+            regex = re.compile(pattern.encode("utf-8") if isinstance(pattern, str) else pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid time regex: {e}")
+        group = 1 if regex.groups else 0
+
+        def text_of(line):
+            match = regex.search(line)
+            return match.group(group) if match else None
+    elif field is not None:
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode("utf-8")
+        if not delimiter:
+            raise ValueError("The time delimiter can't be empty")
+
+        def text_of(line):
+            fields = line.split(delimiter, field + 1)
+            return fields[field] if field < len(fields) else None
+    else:
+        text_of = None
+
+    if fmt is None:
+        def parse(text):
+            match = ISO_STAMP.search(text)
+            if match is None:
+                return None
+            return datetime(*(int(part or 0) for part in match.groups()))
+    elif fmt == "epoch":
+        def parse(text):
+            match = EPOCH_STAMP.search(text)
+            return EPOCH + timedelta(seconds=float(match.group())) if match else None
+    else:
+        try:
+            width = len(datetime(2000, 11, 22, 13, 44, 55).strftime(fmt))
+        except ValueError as e:
+            raise ValueError(f"Invalid time format {fmt!r}: {e}")
+        if text_of is None:
+            def text_of(line):
+                return line[:width]
+
+        def parse(text):
+            return datetime.strptime(text.decode("utf-8", "replace").strip(), fmt)
+
+    def stamp_of(line):
+        text = line if text_of is None else text_of(line)
+        if text is None:
+            return None
+        try:
+            stamp = parse(text)
+        except (ValueError, OverflowError):
+            return None
+        return stamp.replace(tzinfo=None) if stamp is not None else None
+    return stamp_of
+
+
+class TimeWindow:
+    """Consecutive windows of wall-clock time: "15m", "1h", "1d" or calendar months ("1mo")
+
+    Windows are aligned to the epoch (so "1h" windows start on the hour
+    and "1d" windows at midnight) and numbered; label names the window a
+    number stands for in part file names, e.g. 2024-05-01T13 for an hour.
+    """
+
+    def __init__(self, spec):
+        match = re.fullmatch(r"\s*(\d*)\s*(mo|s|m|h|d)\s*", str(spec))
+        if match is None or (match.group(1) and int(match.group(1)) == 0):
+            raise ValueError(f"Not a time window: {spec} (e.g. 15m, 1h, 1d or 1mo)")
+        self.spec = str(spec).strip()
+        self.count = int(match.group(1) or 1)
+        self.unit = match.group(2)
+        self.seconds, self.label_format = WINDOW_UNITS[self.unit]
+
+    def index(self, stamp):
+        if self.seconds is None:
+            return (stamp.year * 12 + stamp.month - 1) // self.count
+        return int((stamp - EPOCH).total_seconds()) // (self.seconds * self.count)
+
+    def start(self, index):
+        """Wall-clock time the window numbered index starts at"""
+        if self.seconds is None:
+            year, month = divmod(index * self.count, 12)
+            return datetime(year, month + 1, 1)
+        return EPOCH + timedelta(seconds=index * self.seconds * self.count)
+
+    def label(self, index):
+        return self.start(index).strftime(self.label_format)
+
+
+def _first_stamped(data, start, end, window_of):
+    """(line start, next line start, window) of the first line in [start, end) with a timestamp"""
+    while start < end:
+        line_end = data.find(b"\n", start, end)
+        next_start = line_end + 1 if line_end >= 0 else end
+        line = data[start:line_end if line_end >= 0 else end]
+        window = window_of(line.rstrip(b"\r"))
+        if window is not None:
+            return start, next_start, window
+        start = next_start
+    return None
+
+
+def _window_end(data, start, end, window, window_of, guess=4096):
+    """Offset of the first line after start whose window comes after window (end if none)
+
+    data[start:end] is a time-sorted run of lines; lines without a
+    timestamp belong with the line before them. Each probe reads one line
+    at the middle of the range that is left, so finding a boundary takes
+    O(log n) line parses rather than a scan. The range is first narrowed
+    by probing guess bytes on, then twice as far and so on, so a window
+    about guess bytes long costs a few parses however long the data is.
+    """
+    lo, hi = start, end
+    found = end       # The boundary if no line in [lo, hi) starts a later window
+    step = max(guess, 1)
+    while lo + step < hi:
+        probe = data.find(b"\n", lo + step, hi) + 1
+        if not probe or probe >= hi:
+            break
+        stamped = _first_stamped(data, probe, hi, window_of)
+        if stamped is None:
+            break
+        line_start, next_start, line_window = stamped
+        if line_window < window:
+            raise ValueError(f"The input isn't sorted by time: the line at byte {line_start:,} "
+                             f"is earlier than the lines before it")
+        if line_window > window:
+            hi = found = line_start
+            break
+        lo = next_start
+        step *= 2
+
+    while hi - lo > 1:
+        probe = data.find(b"\n", (lo + hi) // 2, hi) + 1
+        if not probe or probe >= hi:
+            break
+        stamped = _first_stamped(data, probe, hi, window_of)
+        if stamped is None:
+            # Only undated lines from probe on: the boundary is before them or at hi
+            hi = probe
+            continue
+        line_start, next_start, line_window = stamped
+        if line_window < window:
+            raise ValueError(f"The input isn't sorted by time: the line at byte {line_start:,} "
+                             f"is earlier than the lines before it")
+        if line_window > window:
+            hi = found = line_start
+        else:
+            lo = next_start
+
+    # A few lines are left between lo and hi; look at them in order
+    while lo < hi:
+        stamped = _first_stamped(data, lo, hi, window_of)
+        if stamped is None:
+            break
+        line_start, next_start, line_window = stamped
+        if line_window > window:
+            return line_start
+        if line_window < window:
+            raise ValueError(f"The input isn't sorted by time: the line at byte {line_start:,} "
+                             f"is earlier than the lines before it")
+        lo = next_start
+    return found
+
+
+def plan_by_time(data, stamp_of, window, labels=False):
+    """One part range per time window holding lines of the time-sorted data
+
+    data is the mapped input; stamp_of is a timestamp_key function and
+    window a TimeWindow. Windows without lines get no part. Lines before
+    the first timestamp go to the first part, and undated lines to the
+    part of the line before them. With labels, each part is labelled with
+    its window (see part_filename) instead of being known by number alone.
+    """
+    def window_of(line):
+        stamp = stamp_of(line)
+        return None if stamp is None else window.index(stamp)
+
+    size = len(data)
+    plan = []
+    first = _first_stamped(data, 0, size, window_of)
+    if first is None:
+        if size:
+            raise ValueError("No line of the input has a timestamp in the expected format")
+        return plan
+    start = 0
+    line, _, current = first
+    guess = 4096
+    while start < size:
+        end = _window_end(data, line, size, current, window_of, guess)
+        guess = end - start
+        plan.append(PartRange(len(plan) + 1, start, end, None,
+                              window.label(current) if labels else None))
+        if end < size:
+            line, _, current = _first_stamped(data, end, size, window_of)
+        start = end
+    return plan